@@ -18,6 +18,16 @@ copy .\scripts\planform_creator_gui.py .\Strakmachine\scripts\
 copy .\scripts\strak_machine.py .\Strakmachine\scripts\
 copy .\scripts\strak_machine_gui.py .\Strakmachine\scripts\
 copy .\scripts\xoptfoil_visualizer-jx.py .\Strakmachine\scripts\
+copy .\scripts\polar_file.py .\Strakmachine\scripts\
+copy .\scripts\polar_cache.py .\Strakmachine\scripts\
+copy .\scripts\polar_sampling.py .\Strakmachine\scripts\
+copy .\scripts\polar_reconstruction.py .\Strakmachine\scripts\
+copy .\scripts\worker_calls.py .\Strakmachine\scripts\
+copy .\scripts\airfoil_geometry.py .\Strakmachine\scripts\
+copy .\scripts\namelist_writer.py .\Strakmachine\scripts\
+copy .\scripts\oppoint_table.py .\Strakmachine\scripts\
+copy .\scripts\file_emitter.py .\Strakmachine\scripts\
+copy .\scripts\job_graph.py .\Strakmachine\scripts\
 copy .\scripts\best_airfoil.py .\Strakmachine\scripts\
 copy .\scripts\change_airfoilname.py .\Strakmachine\scripts\
 copy .\scripts\show_status.py .\Strakmachine\scripts\
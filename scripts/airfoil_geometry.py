@@ -0,0 +1,407 @@
+#!/usr/bin/env python
+
+#  This file is part of "The Strak Machine".
+
+#  "The Strak Machine" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+
+#  "The Strak Machine" is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+#  You should have received a copy of the GNU General Public License
+#  along with "The Strak Machine".  If not, see <http://www.gnu.org/licenses/>.
+
+#  Copyright (C) 2020-2022 Matthias Boese
+
+import argparse
+import hashlib
+import re
+import numpy as np
+
+################################################################################
+#
+# airfoil geometry
+#
+# An airfoil is read from a .dat-file (name in the first line, followed by
+# x/y-coordinates from the trailing edge over the top side to the leading edge
+# and back over the bottom side to the trailing edge). It is split into a
+# thickness line and a camber line, that can be modified independently:
+#
+#   y_top = camber(x) + thickness(x)/2
+#   y_bot = camber(x) - thickness(x)/2
+#
+# All values are relative to the chord, e.g. thickness 0.08 means 8%.
+#
+################################################################################
+
+# only curvature values above this threshold are taken into account for
+# counting reversals of curvature
+curvatureThreshold = 0.1
+
+# results of assess_airfoil(), stored under the hash of the airfoil file
+assessmentCache = {}
+
+
+################################################################################
+# helper functions
+################################################################################
+
+# returns the slopes of a shape-preserving piecewise cubic interpolation
+# (Fritsch-Carlson) at the datapoints. x must be strictly increasing.
+def get_pchipSlopes(x, y):
+    h = np.diff(x)
+    delta = np.diff(y) / h
+    slopes = np.zeros_like(y)
+
+    if len(x) == 2:
+        slopes[:] = delta[0]
+        return slopes
+
+    # inner points: weighted harmonic mean, zero at local extrema
+    w1 = 2.0 * h[1:] + h[:-1]
+    w2 = h[1:] + 2.0 * h[:-1]
+    sameSign = (delta[:-1] * delta[1:]) > 0.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        harmonic = (w1 + w2) / (w1 / delta[:-1] + w2 / delta[1:])
+    slopes[1:-1] = np.where(sameSign, harmonic, 0.0)
+
+    # end points: non-centered three-point formula, shape-preserving
+    for (end, h0, h1, d0, d1) in ((0, h[0], h[1], delta[0], delta[1]),
+                                  (-1, h[-1], h[-2], delta[-1], delta[-2])):
+        slope = ((2.0 * h0 + h1) * d0 - h0 * d1) / (h0 + h1)
+        if np.sign(slope) != np.sign(d0):
+            slope = 0.0
+        elif (np.sign(d0) != np.sign(d1)) and (abs(slope) > abs(3.0 * d0)):
+            slope = 3.0 * d0
+        slopes[end] = slope
+
+    return slopes
+
+
+# evaluates a shape-preserving piecewise cubic interpolation of y(x) at xNew.
+# x must be strictly increasing, values outside are extrapolated linearly
+# from the first / last interval.
+def interpolate(x, y, xNew):
+    xNew = np.asarray(xNew, dtype=np.float64)
+    if len(x) < 2:
+        return np.full(xNew.shape, y[0])
+
+    slopes = get_pchipSlopes(x, y)
+    idx = np.clip(np.searchsorted(x, xNew) - 1, 0, len(x) - 2)
+
+    h = x[idx+1] - x[idx]
+    t = (xNew - x[idx]) / h
+    inside = (t >= 0.0) & (t <= 1.0)
+
+    # cubic hermite basis functions
+    h00 = (1.0 + 2.0*t) * (1.0 - t)**2
+    h10 = t * (1.0 - t)**2
+    h01 = t**2 * (3.0 - 2.0*t)
+    h11 = t**2 * (t - 1.0)
+
+    cubic = (h00 * y[idx] + h10 * h * slopes[idx] +
+             h01 * y[idx+1] + h11 * h * slopes[idx+1])
+    linear = y[idx] + (y[idx+1] - y[idx]) * t
+    return np.where(inside, cubic, linear)
+
+
+# returns position and value of the maximum of y(x). The position is refined
+# by a parabola through the maximum datapoint and its neighbours.
+def get_maximum(x, y):
+    idx = int(np.argmax(y))
+    if (idx == 0) or (idx == (len(y) - 1)):
+        return (x[idx], y[idx])
+
+    (x0, x1, x2) = x[idx-1:idx+2]
+    (y0, y1, y2) = y[idx-1:idx+2]
+    denominator = (x0 - x1) * (x0 - x2) * (x1 - x2)
+    a = (x2 * (y1 - y0) + x1 * (y0 - y2) + x0 * (y2 - y1)) / denominator
+    b = (x2**2 * (y0 - y1) + x1**2 * (y2 - y0) + x0**2 * (y1 - y2)) / denominator
+
+    if a >= 0.0:
+        return (x[idx], y[idx])
+
+    xMax = -b / (2.0 * a)
+    yMax = y1 + a * (xMax - x1)**2 + (2.0 * a * x1 + b) * (xMax - x1)
+    return (xMax, yMax)
+
+
+# returns a smooth and strictly monotonic mapping of x in [0..1] onto
+# [0..1], that moves 'oldPosition' to 'newPosition' and keeps the leading
+# and the trailing edge in place
+def map_position(x, oldPosition, newPosition):
+    a = (oldPosition * (1.0 - newPosition)) / (newPosition * (1.0 - oldPosition))
+    return x / (x + a * (1.0 - x))
+
+
+################################################################################
+#
+# airfoil class
+#
+################################################################################
+class airfoil:
+    def __init__(self, name, x, y):
+        self.name = name
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+
+
+    # index of the leading edge, the datapoint with minimum x
+    def get_leadingEdgeIdx(self):
+        return int(np.argmin(self.x))
+
+
+    # returns the top and bottom side, each with ascending x from the leading
+    # edge to the trailing edge
+    def get_sides(self):
+        le = self.get_leadingEdgeIdx()
+        top = (self.x[le::-1], self.y[le::-1])
+        bot = (self.x[le:], self.y[le:])
+        return (top, bot)
+
+
+    # returns x, thickness and camber at all x-positions of the airfoil
+    def get_thicknessAndCamber(self):
+        ((x_top, y_top), (x_bot, y_bot)) = self.get_sides()
+
+        # common x-positions of both sides, strictly increasing
+        x = np.unique(np.concatenate((x_top, x_bot)))
+        (x_top, y_top) = get_strictlyIncreasing(x_top, y_top)
+        (x_bot, y_bot) = get_strictlyIncreasing(x_bot, y_bot)
+
+        top = interpolate(x_top, y_top, x)
+        bot = interpolate(x_bot, y_bot, x)
+        return (x, top - bot, 0.5 * (top + bot))
+
+
+    # returns (thickness, thicknessPosition, camber, camberPosition)
+    def get_geometry(self):
+        (x, thickness, camber) = self.get_thicknessAndCamber()
+        (thickPos, thick) = get_maximum(x, thickness)
+        (cambPos, camb) = get_maximum(x, camber)
+        return (thick, thickPos, camb, cambPos)
+
+
+    # returns the curvature of the top and the bottom side, from the leading
+    # edge to the trailing edge. Derivatives are taken with respect to the
+    # arc length.
+    def get_curvature(self):
+        results = []
+
+        for (x, y) in self.get_sides():
+            s = np.concatenate(([0.0], np.cumsum(np.hypot(np.diff(x), np.diff(y)))))
+            (s, keep) = np.unique(s, return_index=True)
+            (x, y) = (x[keep], y[keep])
+
+            dx = np.gradient(x, s)
+            dy = np.gradient(y, s)
+            ddx = np.gradient(dx, s)
+            ddy = np.gradient(dy, s)
+
+            results.append((dx * ddy - dy * ddx) / (dx**2 + dy**2)**1.5)
+
+        return results
+
+
+    # returns a new airfoil with modified thickness and camber and their
+    # positions. All values are relative to the chord. 'None' keeps the value
+    # of this airfoil.
+    def get_modifiedAirfoil(self, name, thickness=None, thicknessPosition=None,
+                            camber=None, camberPosition=None):
+        (x, thick, camb) = self.get_thicknessAndCamber()
+        (thickPos_old, thick_old) = get_maximum(x, thick)
+        (cambPos_old, camb_old) = get_maximum(x, camb)
+
+        # move the maximum of thickness and camber by remapping x
+        x_thick = x
+        if (thicknessPosition != None) and (0.0 < thickPos_old < 1.0) and\
+           (0.0 < thicknessPosition < 1.0):
+            x_thick = map_position(x, thickPos_old, thicknessPosition)
+
+        x_camb = x
+        if (camberPosition != None) and (0.0 < cambPos_old < 1.0) and\
+           (0.0 < camberPosition < 1.0) and (camb_old > 0.0):
+            x_camb = map_position(x, cambPos_old, camberPosition)
+
+        # scale thickness and camber
+        if (thickness != None) and (thick_old > 0.0):
+            thick = thick * (thickness / thick_old)
+
+        if (camber != None) and (camb_old > 0.0):
+            camb = camb * (camber / camb_old)
+
+        # evaluate new thickness and camber at the x-positions of both sides
+        le = self.get_leadingEdgeIdx()
+        x_new = self.x
+        newThick = interpolate(x_thick, thick, x_new)
+        newCamb = interpolate(x_camb, camb, x_new)
+        sign = np.where(np.arange(len(x_new)) <= le, 1.0, -1.0)
+        y_new = newCamb + sign * 0.5 * newThick
+
+        return airfoil(name, x_new.copy(), y_new)
+
+
+    def write_ToFile(self, fileName):
+        with open(fileName, 'w') as fileHandle:
+            fileHandle.write("%s\n" % self.name)
+            np.savetxt(fileHandle, np.column_stack((self.x, self.y)),
+                       fmt="%12.7f", delimiter='')
+
+
+# removes datapoints with an x-value that is not greater than the x-value of
+# the previous datapoint
+def get_strictlyIncreasing(x, y):
+    keep = np.concatenate(([True], np.diff(x) > 0.0))
+    return (x[keep], y[keep])
+
+
+# reads an airfoil from a .dat-file
+def read_airfoil(fileName):
+    with open(fileName) as fileHandle:
+        lines = fileHandle.readlines()
+
+    name = lines[0].strip()
+    coordinates = []
+    for line in lines[1:]:
+        values = line.split()
+        if len(values) >= 2:
+            coordinates.append((float(values[0]), float(values[1])))
+
+    if len(coordinates) < 3:
+        raise ValueError("no coordinates found in airfoil file %s" % fileName)
+
+    (x, y) = np.array(coordinates).T
+    return airfoil(name, x, y)
+
+
+# returns the name of an airfoil from its filename, without path and suffix
+def get_airfoilName(fileName):
+    name = re.split(r'[\\/]', fileName)[-1]
+    return re.sub(r'\.dat$', '', name)
+
+
+# generates a new airfoil from an existing airfoil with the given thickness
+# and camber and their positions, all values in % of chord, and writes it
+# to file
+def generate_modifiedAirfoil(fileName, newFileName, thickness, thicknessPosition,
+                             camber, camberPosition):
+    newAirfoil = read_airfoil(fileName).get_modifiedAirfoil(
+                    get_airfoilName(newFileName), thickness/100.0,
+                    thicknessPosition/100.0, camber/100.0, camberPosition/100.0)
+    newAirfoil.write_ToFile(newFileName)
+    return newAirfoil
+
+
+# generates several airfoils from the same airfoil in one step. 'airfoils'
+# is a list of (newFileName, (thickness, thicknessPosition, camber,
+# camberPosition)), all values in % of chord
+def generate_modifiedAirfoils(fileName, airfoils):
+    baseAirfoil = read_airfoil(fileName)
+
+    for (newFileName, geoParams) in airfoils:
+        (thick, thickPos, camb, cambPos) = [value/100.0 for value in geoParams]
+        newAirfoil = baseAirfoil.get_modifiedAirfoil(
+                          get_airfoilName(newFileName), thick, thickPos,
+                          camb, cambPos)
+        newAirfoil.write_ToFile(newFileName)
+
+
+# counts the changes of sign of 'values'. Only values with an absolute value
+# above 'threshold' are taken into account.
+def count_reversals(values, threshold):
+    signs = np.sign(values[np.abs(values) >= threshold])
+    return int(np.count_nonzero(signs[1:] != signs[:-1]))
+
+
+# assesses the geometry of an airfoil. Returns a dictionary with thickness,
+# camber and their positions in % of chord, the maximum curvature and the
+# number of curvature reversals on top and bottom side. Leading and trailing
+# edge are not taken into account. Smoothing is regarded as necessary if
+# there is any reversal, unlike 'xfoil_worker -w check', which also checks
+# for spikes.
+# The results are stored under the hash of the file content, so an airfoil
+# file is only assessed again if it was changed.
+def assess_airfoil(fileName):
+    with open(fileName, 'rb') as fileHandle:
+        fileHash = hashlib.sha1(fileHandle.read()).hexdigest()
+
+    if fileHash in assessmentCache:
+        return dict(assessmentCache[fileHash])
+
+    assessedAirfoil = read_airfoil(fileName)
+    (thick, thickPos, camb, cambPos) = assessedAirfoil.get_geometry()
+    (curvature_top, curvature_bot) = assessedAirfoil.get_curvature()
+
+    assessment = {"thickness": float(thick * 100.0),
+                  "thicknessPosition": float(thickPos * 100.0),
+                  "camber": float(camb * 100.0),
+                  "camberPosition": float(cambPos * 100.0),
+                  "maxCurvature_top": float(np.max(np.abs(curvature_top[1:-1]))),
+                  "maxCurvature_bot": float(np.max(np.abs(curvature_bot[1:-1]))),
+                  "reversals_top": count_reversals(curvature_top[1:-1], curvatureThreshold),
+                  "reversals_bot": count_reversals(curvature_bot[1:-1], curvatureThreshold)}
+    assessment["smoothingNecessary"] = ((assessment["reversals_top"] +
+                                         assessment["reversals_bot"]) > 0)
+
+    assessmentCache[fileHash] = assessment
+    return dict(assessment)
+
+
+# returns the maximum deviation of the y-coordinates of two airfoils, e.g. to
+# compare with the output of the XFOIL-worker. The y-coordinates of the
+# reference airfoil are interpolated at the x-coordinates of the airfoil.
+def get_maxDeviation(airfoil, referenceAirfoil):
+    ((x_top, y_top), (x_bot, y_bot)) = airfoil.get_sides()
+    ((xr_top, yr_top), (xr_bot, yr_bot)) = referenceAirfoil.get_sides()
+
+    (xr_top, yr_top) = get_strictlyIncreasing(xr_top, yr_top)
+    (xr_bot, yr_bot) = get_strictlyIncreasing(xr_bot, yr_bot)
+
+    deviation_top = np.abs(interpolate(xr_top, yr_top, x_top) - y_top)
+    deviation_bot = np.abs(interpolate(xr_bot, yr_bot, x_bot) - y_bot)
+    return max(np.max(deviation_top), np.max(deviation_bot))
+
+
+################################################################################
+# Main program
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser('')
+    parser.add_argument("-airfoil", "-a", required = True, help = "airfoil-filename")
+    parser.add_argument("-output", "-o", help = "filename of the modified airfoil")
+    parser.add_argument("-t", type = float, help = "thickness in %% of chord")
+    parser.add_argument("-xt", type = float, help = "thickness position in %% of chord")
+    parser.add_argument("-c", type = float, help = "camber in %% of chord")
+    parser.add_argument("-xc", type = float, help = "camber position in %% of chord")
+    parser.add_argument("-reference", "-r",
+                        help = "airfoil to compare with, e.g. output of the XFOIL-worker")
+    args = parser.parse_args()
+
+    baseAirfoil = read_airfoil(args.airfoil)
+    values = [(None if (value == None) else value/100.0)
+              for value in (args.t, args.xt, args.c, args.xc)]
+
+    if args.output != None:
+        newAirfoil = baseAirfoil.get_modifiedAirfoil(
+                          get_airfoilName(args.output), *values)
+        newAirfoil.write_ToFile(args.output)
+    else:
+        newAirfoil = baseAirfoil
+
+    print("thickness %.2f%% at %.2f%%, camber %.2f%% at %.2f%%" %\
+          tuple(value * 100.0 for value in newAirfoil.get_geometry()))
+
+    if args.output != None:
+        assessment = assess_airfoil(args.output)
+    else:
+        assessment = assess_airfoil(args.airfoil)
+
+    print("curvature reversals top %d, bottom %d" %\
+          (assessment["reversals_top"], assessment["reversals_bot"]))
+
+    if args.reference != None:
+        deviation = get_maxDeviation(newAirfoil, read_airfoil(args.reference))
+        print("maximum deviation from %s: %.7f" % (args.reference, deviation))
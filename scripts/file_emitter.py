@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+
+#  This file is part of "The Strak Machine".
+
+#  "The Strak Machine" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+
+#  "The Strak Machine" is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+#  You should have received a copy of the GNU General Public License
+#  along with "The Strak Machine".  If not, see <http://www.gnu.org/licenses/>.
+
+#  Copyright (C) 2020-2022 Matthias Boese
+
+import hashlib
+import locale
+import threading
+from os import stat, replace, remove, linesep, cpu_count
+from os.path import exists
+from concurrent.futures import ThreadPoolExecutor
+
+################################################################################
+#
+# fileEmitter class
+#
+# Collects the contents of generated files, e.g. Xoptfoil input files and
+# target polars, and writes them all at once. Files whose content did not
+# change are not written again. All other files are written on a thread pool,
+# each one to a temporary file first that replaces the file afterwards, so
+# there will never be an incomplete file.
+#
+# The hash of the content of each file is kept in memory, together with size
+# and modification time of the file. If the file was changed by someone else,
+# the content of the file is hashed again.
+#
+################################################################################
+
+# suffix of the temporary files
+tempFileSuffix = '.tmp'
+
+
+# returns the bytes of a text as it is written to a file in text mode, with
+# the encoding of the locale
+def get_fileBytes(text):
+    if linesep != '\n':
+        text = text.replace('\n', linesep)
+    return text.encode(locale.getpreferredencoding(False))
+
+
+# returns size and modification time of a file
+def get_fileStamp(fileName):
+    fileStat = stat(fileName)
+    return (fileStat.st_size, fileStat.st_mtime_ns)
+
+
+class fileEmitter:
+    def __init__(self, maxWorkers=None):
+        # default is one worker for each CPU
+        if (maxWorkers == None) or (maxWorkers < 1):
+            maxWorkers = cpu_count() or 1
+
+        self.maxWorkers = maxWorkers
+        self.pendingFiles = {}
+        self.knownFiles = {}
+        self.writtenFiles = set()
+        self.lock = threading.Lock()
+
+
+    # adds a file that shall be written with the next call of emit(). If a
+    # file is added several times, only the last content will be written.
+    def add(self, fileName, text):
+        self.pendingFiles[fileName] = get_fileBytes(text)
+
+
+    # checks if a file already has the given content
+    def is_unchanged(self, fileName, content):
+        if not exists(fileName):
+            return False
+
+        stamp = get_fileStamp(fileName)
+        contentHash = hashlib.sha1(content).hexdigest()
+
+        with self.lock:
+            known = self.knownFiles.get(fileName)
+
+        if (known != None) and (known[0] == stamp):
+            return (known[1] == contentHash)
+
+        # unknown or changed file, hash the content of the file
+        with open(fileName, 'rb') as fileHandle:
+            fileHash = hashlib.sha1(fileHandle.read()).hexdigest()
+
+        with self.lock:
+            self.knownFiles[fileName] = (stamp, fileHash)
+
+        return (fileHash == contentHash)
+
+
+    # writes a file to a temporary file, that replaces the file afterwards
+    def write_file(self, fileName, content):
+        tempFileName = fileName + tempFileSuffix
+
+        try:
+            with open(tempFileName, 'wb') as fileHandle:
+                fileHandle.write(content)
+            replace(tempFileName, fileName)
+        except:
+            if exists(tempFileName):
+                remove(tempFileName)
+            raise
+
+        with self.lock:
+            self.knownFiles[fileName] = (get_fileStamp(fileName),
+                                         hashlib.sha1(content).hexdigest())
+            self.writtenFiles.add(fileName)
+
+
+    # writes the file, if the content has changed. Returns True if the file
+    # was written.
+    def emit_file(self, fileName, content):
+        if self.is_unchanged(fileName, content):
+            return False
+
+        self.write_file(fileName, content)
+        return True
+
+
+    # writes all added files, that have changed. Returns the lists of written
+    # files, unchanged files and a dictionary of failed files and their
+    # error messages.
+    def emit(self):
+        pendingFiles = self.pendingFiles
+        self.pendingFiles = {}
+
+        with ThreadPoolExecutor(max_workers=self.maxWorkers) as executor:
+            futures = [(fileName, executor.submit(self.emit_file, fileName, content))
+                       for (fileName, content) in pendingFiles.items()]
+
+        written = []
+        unchanged = []
+        failed = {}
+
+        for (fileName, future) in futures:
+            exception = future.exception()
+            if exception != None:
+                failed[fileName] = "%s: %s" % (type(exception).__name__, exception)
+            elif future.result():
+                written.append(fileName)
+            else:
+                unchanged.append(fileName)
+
+        return (written, unchanged, failed)
+
+
+    # returns the names of all files that were written since the last call
+    # and clears them
+    def pop_writtenFiles(self):
+        with self.lock:
+            writtenFiles = self.writtenFiles
+            self.writtenFiles = set()
+        return writtenFiles
@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+
+#  This file is part of "The Strak Machine".
+
+#  "The Strak Machine" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+
+#  "The Strak Machine" is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+#  You should have received a copy of the GNU General Public License
+#  along with "The Strak Machine".  If not, see <http://www.gnu.org/licenses/>.
+
+#  Copyright (C) 2020-2022 Matthias Boese
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from os import listdir, makedirs, replace
+from os.path import abspath, basename, exists, isdir, join, normcase
+from shutil import copyfile, rmtree
+
+
+# moves a result of a job to its target. The files of a folder are moved
+# into the target folder, files that already exist there are replaced.
+def move_result(source, target):
+    if not isdir(source):
+        replace(source, target)
+        return
+
+    makedirs(target, exist_ok=True)
+    for fileName in listdir(source):
+        move_result(join(source, fileName), join(target, fileName))
+
+
+################################################################################
+#
+# job class
+#
+# A single step of the strak, e.g. one run of Xoptfoil. A job either calls an
+# external program via a commandline or calls a python function. A job can
+# only start after all jobs it depends on have finished successfully.
+#
+# External programs write files with fixed names into the current working
+# directory, e.g. the run_control file of Xoptfoil. So a command can run in
+# its own working directory 'workingDir': the 'copyFiles' are copied into it
+# before the command runs, the 'resultFiles' (files or folders, relative to
+# the working directory) are moved back afterwards and the working directory
+# is removed.
+#
+# 'inputFiles' are generated files the job reads, e.g. the Xoptfoil input
+# file and the target polar, 'outputFile' is the file the job creates, if
+# any. They are used to find out if the job has to run again, see
+# jobGraph.run().
+#
+################################################################################
+class job:
+    def __init__(self, name, commandLine=None, function=None, args=(),
+                 dependencies=(), group='', inputFiles=(), outputFile=None,
+                 workingDir=None, copyFiles=(), resultFiles=()):
+        self.name = name
+        self.commandLine = commandLine
+        self.function = function
+        self.args = args
+        self.dependencies = list(dependencies)
+        self.inputFiles = list(inputFiles)
+        self.outputFile = outputFile
+        self.workingDir = workingDir
+        self.copyFiles = list(copyFiles)
+        self.resultFiles = list(resultFiles)
+
+        # failures are reported under the name of the group, e.g. the name
+        # of the airfoil the job belongs to
+        self.group = group
+
+
+################################################################################
+#
+# jobEvent class
+#
+# progress event of a job graph. 'kind' is one of 'started', 'finished',
+# 'failed', 'skipped' or 'upToDate'. Skipped jobs depend on a job that failed,
+# jobs that are up to date do not need to run again.
+#
+################################################################################
+class jobEvent:
+    def __init__(self, kind, job, numDone, numJobs):
+        self.kind = kind
+        self.job = job
+        self.numDone = numDone
+        self.numJobs = numJobs
+
+
+    # returns the progress of the whole graph in percent
+    def get_progress(self):
+        if self.numJobs == 0:
+            return 100.0
+        return (self.numDone * 100.0) / self.numJobs
+
+
+################################################################################
+#
+# jobGraph class
+#
+# Directed acyclic graph of jobs. Jobs can only depend on jobs that were
+# added before, so the order in which the jobs were added is always a valid
+# sequential order. When the graph is run, all jobs whose dependencies have
+# finished run concurrently on a workerPool, earlier added jobs first.
+#
+################################################################################
+class jobGraph:
+    def __init__(self):
+        self.jobs = {}
+
+
+    def get_numJobs(self):
+        return len(self.jobs)
+
+
+    # adds a job and returns its name
+    def add(self, newJob):
+        if newJob.name in self.jobs:
+            raise ValueError("job %s was already added" % newJob.name)
+
+        for name in newJob.dependencies:
+            if name not in self.jobs:
+                raise ValueError("job %s depends on unknown job %s" %
+                                 (newJob.name, name))
+
+        self.jobs[newJob.name] = newJob
+        return newJob.name
+
+
+    # adds a job that calls an external program
+    def add_command(self, name, commandLine, dependencies=(), group='',
+                    inputFiles=(), outputFile=None, workingDir=None,
+                    copyFiles=(), resultFiles=()):
+        return self.add(job(name, commandLine=commandLine,
+                            dependencies=dependencies, group=group,
+                            inputFiles=inputFiles, outputFile=outputFile,
+                            workingDir=workingDir, copyFiles=copyFiles,
+                            resultFiles=resultFiles))
+
+
+    # adds a job that calls a python function
+    def add_function(self, name, function, args, dependencies=(), group='',
+                     inputFiles=(), outputFile=None):
+        return self.add(job(name, function=function, args=args,
+                            dependencies=dependencies, group=group,
+                            inputFiles=inputFiles, outputFile=outputFile))
+
+
+    # checks if a job does not need to run again: its output file exists,
+    # none of its input files was changed and all jobs it depends on are up
+    # to date, too. A job without output file is up to date, if it has
+    # dependencies that are all up to date.
+    def is_upToDate(self, job, changedFiles, states):
+        if any(normcase(abspath(fileName)) in changedFiles
+               for fileName in job.inputFiles):
+            return False
+
+        if job.outputFile != None:
+            if not exists(job.outputFile):
+                return False
+        elif len(job.dependencies) == 0:
+            return False
+
+        return all(states.get(name) == 'upToDate' for name in job.dependencies)
+
+
+    # runs a single job. Returns True if the job was successful, failures
+    # are recorded by the pool under the group of the job
+    def run_job(self, pool, job):
+        if (job.commandLine != None) and (job.workingDir != None):
+            return self.run_commandInWorkingDir(pool, job)
+
+        if job.commandLine != None:
+            return pool.call(job.group, job.commandLine).is_ok()
+
+        try:
+            job.function(*job.args)
+        except Exception as exception:
+            pool.add_failure(job.group, "%s: %s: %s" % (job.name,
+                             type(exception).__name__, exception))
+            return False
+        return True
+
+
+    # runs the command of a job in its own working directory, see job class
+    def run_commandInWorkingDir(self, pool, job):
+        rmtree(job.workingDir, ignore_errors=True)
+        makedirs(job.workingDir)
+
+        try:
+            for fileName in job.copyFiles:
+                copyfile(fileName, join(job.workingDir, basename(fileName)))
+
+            result = pool.call(job.group, job.commandLine, job.workingDir)
+
+            for fileName in job.resultFiles:
+                if exists(join(job.workingDir, fileName)):
+                    move_result(join(job.workingDir, fileName), fileName)
+        finally:
+            rmtree(job.workingDir, ignore_errors=True)
+
+        return result.is_ok()
+
+
+    # runs all jobs on the given workerPool and waits until all of them have
+    # finished. 'progressHandler' is called with a jobEvent for each job
+    # that starts or ends, always from the calling thread. If 'changedFiles'
+    # is given, the names of all files that were changed since the last
+    # successful run, only jobs that are not up to date are run. Returns a
+    # dictionary of job names and their final state ('finished', 'failed',
+    # 'skipped' or 'upToDate').
+    def run(self, pool, progressHandler=None, changedFiles=None):
+        if changedFiles != None:
+            changedFiles = set(normcase(abspath(fileName))
+                               for fileName in changedFiles)
+
+        order = {name: idx for (idx, name) in enumerate(self.jobs)}
+        missing = {name: set(job.dependencies) for (name, job) in self.jobs.items()}
+        dependents = {name: [] for name in self.jobs}
+        for (name, job) in self.jobs.items():
+            for dependency in job.dependencies:
+                dependents[dependency].append(name)
+
+        states = {}
+        ready = [name for name in self.jobs if len(missing[name]) == 0]
+        running = {}
+
+        def report(kind, name):
+            if kind != 'started':
+                states[name] = kind
+            if progressHandler != None:
+                progressHandler(jobEvent(kind, self.jobs[name], len(states),
+                                         len(self.jobs)))
+
+        # marks all jobs that depend on a failed job as skipped
+        def skip_dependents(name):
+            for dependent in dependents[name]:
+                if dependent not in states:
+                    report('skipped', dependent)
+                    skip_dependents(dependent)
+
+        # releases all jobs that depend on a finished or up to date job
+        def release_dependents(name):
+            for dependent in dependents[name]:
+                missing[dependent].discard(name)
+                if (len(missing[dependent]) == 0) and (dependent not in states):
+                    ready.append(dependent)
+
+        with ThreadPoolExecutor(max_workers=pool.maxWorkers) as executor:
+            while (len(ready) > 0) or (len(running) > 0):
+                while len(ready) > 0:
+                    name = min(ready, key=order.get)
+                    ready.remove(name)
+
+                    if ((changedFiles != None) and
+                        self.is_upToDate(self.jobs[name], changedFiles, states)):
+                        report('upToDate', name)
+                        release_dependents(name)
+                        continue
+
+                    future = executor.submit(self.run_job, pool, self.jobs[name])
+                    running[future] = name
+                    report('started', name)
+
+                if len(running) == 0:
+                    break
+
+                (done, notDone) = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in sorted(done, key=lambda future: order[running[future]]):
+                    name = running.pop(future)
+
+                    if (future.exception() == None) and future.result():
+                        report('finished', name)
+                        release_dependents(name)
+                    else:
+                        if future.exception() != None:
+                            exception = future.exception()
+                            pool.add_failure(self.jobs[name].group, "%s: %s: %s" %
+                                 (name, type(exception).__name__, exception))
+                        report('failed', name)
+                        skip_dependents(name)
+
+        return states
@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+
+#  This file is part of "The Strak Machine".
+
+#  "The Strak Machine" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+
+#  "The Strak Machine" is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+#  You should have received a copy of the GNU General Public License
+#  along with "The Strak Machine".  If not, see <http://www.gnu.org/licenses/>.
+
+#  Copyright (C) 2020-2022 Matthias Boese
+
+import argparse
+import numbers
+import numpy as np
+import f90nml
+from copy import deepcopy
+
+################################################################################
+#
+# writer for the namelists of generated Xoptfoil / xfoil_worker input files
+#
+# The namelists that are generated from the templates only contain scalars,
+# one-dimensional lists and derived types, e.g. 'pso_options%max_retries'.
+# These are written in one pass, in the same format as f90nml writes them.
+# Anything else, e.g. multi-dimensional arrays, is written by f90nml.
+#
+################################################################################
+
+# layout of the written namelist, as written by f90nml
+indent = '    '
+columnWidth = 72
+
+
+# raised if a namelist contains values that are not supported by the writer
+class UnsupportedValueError(TypeError):
+    pass
+
+
+# formats a string in Fortran notation
+def format_string(value):
+    if ("'" in value) and not ('"' in value):
+        return '"%s"' % value
+    return "'%s'" % value.replace("'", "''")
+
+
+# formats a logical value in Fortran notation
+def format_logical(value):
+    return '.true.' if value else '.false.'
+
+
+# formatting functions of the python types that are found in namelists
+formatters = {float: float.__repr__,
+              int: int.__repr__,
+              bool: format_logical,
+              str: format_string,
+              type(None): lambda value: ''}
+
+
+# formats a single value in Fortran notation
+def format_value(value):
+    formatter = formatters.get(type(value))
+    if formatter != None:
+        return formatter(value)
+
+    # other types, e.g. numpy scalars
+    if isinstance(value, (bool, np.bool_)):
+        return format_logical(value)
+    elif isinstance(value, numbers.Integral):
+        return repr(int(value))
+    elif isinstance(value, numbers.Real):
+        return repr(float(value))
+    elif isinstance(value, str):
+        return format_string(value)
+
+    raise UnsupportedValueError("unsupported value %r" % (value,))
+
+
+# returns the lines of one variable, continuation lines are aligned with the
+# first value
+def get_variableLines(name, values):
+    if len(values) == 0:
+        values = [None]
+
+    # lists of values of the same type are formatted in one step
+    valueType = type(values[0])
+    if (valueType in formatters) and all(type(value) is valueType for value in values):
+        tokens = list(map(formatters[valueType], values))
+    else:
+        tokens = [format_value(value) for value in values]
+
+    # a trailing null value needs a trailing comma
+    if values[-1] is None:
+        tokens[-1] = tokens[-1] + ','
+
+    prefix = indent + name + ' = '
+    text = ', '.join(tokens)
+
+    # the column width is increased for long names, like f90nml does
+    width = max(columnWidth, len(prefix) + 1)
+
+    if len(prefix) + len(text) < width:
+        return [(prefix + text).rstrip()]
+
+    # wrap lines like f90nml: a line is ended as soon as it reaches the
+    # column width, so at least one value is put on each line
+    lines = []
+    line = prefix
+
+    for (idx, token) in enumerate(tokens):
+        line += token
+        if idx < (len(tokens) - 1):
+            line += ', '
+
+        if len(line) >= width:
+            lines.append(line.rstrip())
+            line = ' ' * len(prefix)
+
+    if line.strip() != '':
+        lines.append(line.rstrip())
+
+    return lines
+
+
+# returns the name of a group. Repeated groups are stored by f90nml under
+# internal keys, e.g. '_grp_name_0'
+def get_groupName(key):
+    if key.startswith('_grp_'):
+        return key[5:].rsplit('_', 1)[0]
+    return key
+
+
+# returns the lines of all variables of a group or a derived type. The items
+# are taken directly from the underlying dictionary, which is much faster than
+# the items-view of f90nml.
+def get_groupLines(group, excludedKeys=(), parentName=''):
+    lines = []
+
+    for (key, value) in dict.items(group):
+        if key in excludedKeys:
+            continue
+
+        name = parentName + key
+        formatter = formatters.get(type(value))
+
+        if (formatter != None) and (value is not None):
+            # scalar
+            lines.append(indent + name + ' = ' + formatter(value))
+            continue
+
+        if isinstance(value, f90nml.Namelist):
+            # derived type
+            lines.extend(get_groupLines(value, (), name + '%'))
+            continue
+
+        if isinstance(value, (list, tuple)):
+            # lists that do not start with the default index
+            startIndex = group.start_index.get(key)
+            if (startIndex != None) and (len(value) > 0):
+                if len(startIndex) != 1 or startIndex[0] is None:
+                    raise UnsupportedValueError("unsupported indices of %s" % name)
+
+                name = "%s(%d:%d)" % (name, startIndex[0],
+                                      startIndex[0] + len(value) - 1)
+
+            lines.extend(get_variableLines(name, value))
+        elif isinstance(value, dict):
+            raise UnsupportedValueError("unsupported value of %s" % name)
+        else:
+            lines.extend(get_variableLines(name, [value]))
+
+    return lines
+
+
+# returns the text of a whole namelist. 'excludedKeys' is a dictionary of
+# group names and the keys of the group that shall not be written.
+def get_namelistText(namelist, excludedKeys={}):
+    groupTexts = []
+
+    for (key, group) in dict.items(namelist):
+        groupName = get_groupName(key)
+
+        if not isinstance(group, f90nml.Namelist):
+            raise UnsupportedValueError("unsupported group %s" % groupName)
+
+        lines = ['&' + groupName]
+        lines.extend(get_groupLines(group, excludedKeys.get(groupName, ())))
+        lines.append('/')
+        groupTexts.append('\n'.join(lines) + '\n')
+
+    return '\n'.join(groupTexts)
+
+
+# returns the text of a namelist file. 'excludedKeys' is a dictionary of
+# group names and the keys of the group that shall not be written, e.g.
+# {'operating_conditions': ('name',)}
+def get_namelistFileText(namelist, excludedKeys={}):
+    try:
+        return get_namelistText(namelist, excludedKeys)
+    except UnsupportedValueError:
+        # let f90nml do the job
+        namelist = deepcopy(namelist)
+        for (groupName, keys) in excludedKeys.items():
+            for key in keys:
+                namelist.get(groupName, {}).pop(key, None)
+
+        return str(namelist) + '\n'
+
+
+# writes a namelist to file, see get_namelistFileText()
+def write_namelistFile(namelist, fileName, excludedKeys={}):
+    text = get_namelistFileText(namelist, excludedKeys)
+
+    with open(fileName, 'w') as fileHandle:
+        fileHandle.write(text)
+
+
+# writes a namelist file again and checks if the result is read back by
+# f90nml with the same content
+def check_roundTrip(fileName, newFileName):
+    namelist = f90nml.read(fileName)
+    write_namelistFile(namelist, newFileName)
+
+    if f90nml.read(newFileName) == namelist:
+        print("%s was written to %s without changes" % (fileName, newFileName))
+        return True
+    else:
+        print("%s differs from %s" % (newFileName, fileName))
+        return False
+
+
+################################################################################
+# Main program
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser('')
+
+    helptext = "filename of the namelist file to read"
+    parser.add_argument("-input", "-i", required = True, help = helptext)
+
+    helptext = "filename of the namelist file to write"
+    parser.add_argument("-output", "-o", required = True, help = helptext)
+
+    args = parser.parse_args()
+    check_roundTrip(args.input, args.output)
@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+
+#  This file is part of "The Strak Machine".
+
+#  "The Strak Machine" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+
+#  "The Strak Machine" is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+#  You should have received a copy of the GNU General Public License
+#  along with "The Strak Machine".  If not, see <http://www.gnu.org/licenses/>.
+
+#  Copyright (C) 2020-2022 Matthias Boese
+
+import numpy as np
+
+################################################################################
+#
+# table of the op-points of an Xoptfoil input file
+#
+# The op-points are stored column by column, one array per key of the
+# namelist group 'operating_conditions'. Numerical columns are float-arrays,
+# missing values (None in the namelist) are stored as NaN. The index of an
+# op-point can be looked up by its name.
+#
+# The table is converted from and to the namelist only when an input file is
+# loaded or saved.
+#
+################################################################################
+
+# columns of the table, as named in the namelist
+textColumns = ('name', 'op_mode', 'optimization_type')
+numericColumns = ('op_point', 'target_value', 'weighting', 'reynolds')
+columns = ('name', 'op_mode', 'op_point', 'optimization_type', 'target_value',
+           'weighting', 'reynolds')
+
+
+# converts a value of a numerical column, None or an empty value is stored
+# as NaN
+def to_float(value):
+    if (value is None) or (value == ''):
+        return np.nan
+    return float(value)
+
+
+# converts a value of a numerical column back, NaN is returned as None
+def from_float(value):
+    if np.isnan(value):
+        return None
+    return float(value)
+
+
+# converts a value of the 'reynolds'-column back, NaN is returned as None
+def from_reynolds(value):
+    if np.isnan(value):
+        return None
+    return int(value)
+
+
+# returns the values of a key of a namelist group as a list. A single value is
+# read by f90nml as a scalar.
+def get_list(group, key):
+    values = group.get(key)
+
+    if values is None:
+        return []
+    elif isinstance(values, list):
+        return values
+    return [values]
+
+
+class opPointTable:
+    def __init__(self):
+        self.clear()
+
+
+    # removes all op-points
+    def clear(self):
+        self.data = {}
+        for column in textColumns:
+            self.data[column] = np.zeros(0, dtype=object)
+        for column in numericColumns:
+            self.data[column] = np.zeros(0, dtype=np.float64)
+
+        self.nameIndex = {}
+
+
+    def get_numOpPoints(self):
+        return len(self.data['op_point'])
+
+
+    # returns a column of the table as an array. The array must not be
+    # resized by the caller
+    def get_column(self, column):
+        return self.data[column]
+
+
+    # returns a single value, missing values are returned as None
+    def get_value(self, column, idx):
+        value = self.data[column][idx]
+
+        if column == 'reynolds':
+            return from_reynolds(value)
+        elif column in numericColumns:
+            return from_float(value)
+        return value
+
+
+    # sets a single value, None is stored as missing value
+    def set_value(self, column, idx, value):
+        if column in numericColumns:
+            value = to_float(value)
+
+        self.data[column][idx] = value
+
+        if column == 'name':
+            self.update_nameIndex()
+
+
+    # sets whole columns at once. 'columnValues' is a dictionary of column
+    # names and lists of values, one value for each op-point
+    def set_columns(self, columnValues):
+        for (column, values) in columnValues.items():
+            if column in numericColumns:
+                self.data[column][:] = [to_float(value) for value in values]
+            else:
+                self.data[column][:] = values
+
+        if 'name' in columnValues:
+            self.update_nameIndex()
+
+
+    # returns the index of the op-point with the given name or None. If
+    # there are several op-points with the same name, the first one is found
+    def get_index(self, name):
+        return self.nameIndex.get(name)
+
+
+    def update_nameIndex(self):
+        names = self.data['name']
+        self.nameIndex = {}
+        for idx in range(len(names) - 1, -1, -1):
+            if names[idx] != None:
+                self.nameIndex[names[idx]] = idx
+
+
+    # returns the CL-values of all op-points. For 'spec-cl' op-points this is
+    # the op-point, for all others the target-value.
+    def get_CL(self):
+        return np.where(self.data['op_mode'] == 'spec-cl',
+                        self.data['op_point'], self.data['target_value'])
+
+
+    # inserts a new op-point before the op-point 'idx'
+    def insert(self, idx, name, op_mode, op_point, optimization_type,
+               target_value, weighting, reynolds):
+        values = {'name': name, 'op_mode': op_mode, 'op_point': op_point,
+                  'optimization_type': optimization_type,
+                  'target_value': target_value, 'weighting': weighting,
+                  'reynolds': reynolds}
+
+        for column in textColumns:
+            self.data[column] = np.insert(self.data[column], idx, None)
+            self.data[column][idx] = values[column]
+
+        for column in numericColumns:
+            self.data[column] = np.insert(self.data[column], idx,
+                                          to_float(values[column]))
+
+        self.update_nameIndex()
+        return idx
+
+
+    # appends a new op-point at the end of the table
+    def append(self, name, op_mode, op_point, optimization_type,
+               target_value, weighting, reynolds):
+        return self.insert(self.get_numOpPoints(), name, op_mode, op_point,
+                           optimization_type, target_value, weighting, reynolds)
+
+
+    # returns the index of the first op-point with a CL that is greater or
+    # equal to the given CL, or None if there is no such op-point. The running
+    # maximum of CL is sorted, even if there are 'spec-al' op-points at the
+    # end of the table, so the index is found by bisection.
+    def find_insertIdx(self, CL):
+        runningMax = np.fmax.accumulate(self.get_CL())
+        idx = int(np.searchsorted(runningMax, CL, side='left'))
+
+        if idx >= len(runningMax):
+            return None
+        return idx
+
+
+    # returns the index of the op-point that is closest to the given CL. Only
+    # op-points that enclose CL are taken into account, the first pair of
+    # op-points that encloses CL wins. Returns -1 if CL is not enclosed.
+    def find_closestIdx(self, CL):
+        opPoints = self.data['op_point']
+        enclosing = np.flatnonzero((CL >= opPoints[:-1]) & (CL <= opPoints[1:]))
+
+        if len(enclosing) == 0:
+            return -1
+
+        idx = int(enclosing[0])
+        if (CL - opPoints[idx]) < (opPoints[idx+1] - CL):
+            return idx
+        return idx + 1
+
+
+    # distributes all op-points between the fixed op-points, given by their
+    # indices. Between two fixed op-points, the difference of the op-point
+    # values is constant. The fixed op-points are not changed.
+    def distribute_betweenFixed(self, fixedIndices, decimals):
+        fixedIndices = np.unique(fixedIndices)
+        if len(fixedIndices) < 2:
+            return
+
+        opPoints = self.data['op_point']
+        indices = np.arange(fixedIndices[0], fixedIndices[-1] + 1)
+        intermediate = indices[~np.isin(indices, fixedIndices)]
+
+        opPoints[intermediate] = np.round(np.interp(intermediate, fixedIndices,
+                                          opPoints[fixedIndices]), decimals)
+
+
+    # reads the op-points from the namelist group 'operating_conditions'. All
+    # columns are cut or filled up to the number of op-points.
+    def read_FromNamelist(self, operatingConditions):
+        num = len(get_list(operatingConditions, 'op_point'))
+
+        for column in columns:
+            values = get_list(operatingConditions, column)
+            values = (values + [None] * num)[:num]
+
+            if column in numericColumns:
+                self.data[column] = np.array([to_float(value) for value in values],
+                                             dtype=np.float64)
+            else:
+                self.data[column] = np.empty(num, dtype=object)
+                self.data[column][:] = values
+
+        self.update_nameIndex()
+
+
+    # writes the op-points to the namelist group 'operating_conditions'
+    def write_ToNamelist(self, operatingConditions):
+        for column in textColumns:
+            operatingConditions[column] = list(self.data[column])
+
+        for column in numericColumns:
+            if column == 'reynolds':
+                convert = from_reynolds
+            else:
+                convert = from_float
+
+            operatingConditions[column] = [convert(value)
+                                           for value in self.data[column]]
+
+        operatingConditions['noppoint'] = self.get_numOpPoints()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+
+#  This file is part of "The Strak Machine".
+
+#  "The Strak Machine" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+
+#  "The Strak Machine" is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+#  You should have received a copy of the GNU General Public License
+#  along with "The Strak Machine".  If not, see <http://www.gnu.org/licenses/>.
+
+#  Copyright (C) 2020-2022 Matthias Boese
+
+import hashlib
+import json
+import threading
+import time
+from os import makedirs, remove, replace
+from os.path import exists, expanduser, getsize, join
+from shutil import copyfile
+
+import polar_file
+
+# default directory of the polar cache, shared by all projects of the user
+defaultCacheDir = join(expanduser('~'), '.strak_machine', 'polar_cache')
+
+# default maximum size of the polar cache in MB
+defaultCacheSize = 200
+
+# name of the index file inside the cache directory
+indexFileName = 'index.json'
+
+# number of decimals of the airfoil coordinates that are used for the hash
+coordinateDecimals = 7
+
+
+################################################################################
+#
+# helper functions to build the key of a polar
+#
+################################################################################
+
+# reads the coordinates of an airfoil (.dat file) and returns them as a
+# normalized string. The airfoil name is not part of it, so the same geometry
+# under a different name results in the same string
+def get_normalizedCoordinates(airfoilFileName):
+    coordinates = []
+
+    with open(airfoilFileName) as fileHandle:
+        for line in fileHandle:
+            try:
+                (x, y) = line.split()[0:2]
+                coordinates.append("%.*f %.*f" % (coordinateDecimals, float(x),
+                                                  coordinateDecimals, float(y)))
+            except ValueError:
+                # name of the airfoil or empty line
+                continue
+
+    return "\n".join(coordinates)
+
+
+# returns the hash of the airfoil geometry
+def get_geometryHash(airfoilFileName):
+    coordinates = get_normalizedCoordinates(airfoilFileName)
+    return hashlib.sha1(coordinates.encode()).hexdigest()
+
+
+# returns the key of a single polar: hash of the airfoil geometry and of the
+# namelist for polar generation. The namelist must only contain the
+# Re-number of this polar.
+def get_polarKey(airfoilFileName, namelist):
+    namelistString = json.dumps(namelist, sort_keys=True, default=str)
+    content = get_geometryHash(airfoilFileName) + "\n" + namelistString
+    return hashlib.sha1(content.encode()).hexdigest()
+
+
+################################################################################
+#
+# polarCache class
+#
+# Polar files are stored under their key in the cache directory. The index
+# file holds size and time of last use of each entry. If the size of all
+# entries exceeds the maximum size, the least recently used entries are
+# removed. Polars may be fetched and stored by several threads at the same
+# time, the index is protected by a lock.
+#
+################################################################################
+class polarCache:
+    def __init__(self, cacheDir, maxSizeMB):
+        self.cacheDir = cacheDir
+        self.maxSize = int(maxSizeMB * 1024 * 1024)
+        self.indexFileName = join(cacheDir, indexFileName)
+        self.lock = threading.Lock()
+
+
+    def get_entryFileName(self, key):
+        return join(self.cacheDir, key + '.txt')
+
+
+    # reads the index file, returns an empty index if there is none
+    def read_index(self):
+        try:
+            with open(self.indexFileName) as fileHandle:
+                return json.load(fileHandle)
+        except (IOError, ValueError):
+            return {}
+
+
+    # writes the index file, using a temporary file, so there will never be
+    # an incomplete index file
+    def write_index(self, index):
+        tempFileName = self.indexFileName + '.tmp'
+        with open(tempFileName, 'w') as fileHandle:
+            json.dump(index, fileHandle)
+        replace(tempFileName, self.indexFileName)
+
+
+    # copies the polar with the given key to 'polarFileName'. The polar may
+    # have been calculated for another airfoil of the same geometry, so
+    # 'airfoilName' is written into the header of the copy, if given.
+    # Returns True if the polar was found in the cache
+    def fetch(self, key, polarFileName, airfoilName=None):
+        entryFileName = self.get_entryFileName(key)
+
+        with self.lock:
+            index = self.read_index()
+
+            if (key not in index) or (not exists(entryFileName)):
+                return False
+
+            try:
+                if airfoilName != None:
+                    polar_file.write_renamedPolarFile(entryFileName,
+                                                      polarFileName, airfoilName)
+                else:
+                    copyfile(entryFileName, polarFileName)
+                index[key]["lastUsed"] = time.time()
+                self.write_index(index)
+            except (IOError, OSError):
+                return False
+
+        return True
+
+
+    # stores a polar file under the given key and removes least recently used
+    # entries, if the maximum size of the cache is exceeded
+    def store(self, key, polarFileName):
+        with self.lock:
+            try:
+                makedirs(self.cacheDir, exist_ok=True)
+                copyfile(polarFileName, self.get_entryFileName(key))
+                index = self.read_index()
+                index[key] = {"size": getsize(polarFileName), "lastUsed": time.time()}
+                self.evict(index)
+                self.write_index(index)
+            except (IOError, OSError):
+                return False
+
+        return True
+
+
+    # removes least recently used entries from the index and the cache
+    # directory until the size of all entries fits the maximum size
+    def evict(self, index):
+        totalSize = sum(entry["size"] for entry in index.values())
+        keys = sorted(index, key=lambda key: index[key]["lastUsed"])
+
+        for key in keys:
+            if totalSize <= self.maxSize:
+                break
+
+            totalSize -= index[key]["size"]
+            del index[key]
+            try:
+                remove(self.get_entryFileName(key))
+            except OSError:
+                pass
@@ -0,0 +1,368 @@
+#!/usr/bin/env python
+
+#  This file is part of "The Strak Machine".
+
+#  "The Strak Machine" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+
+#  "The Strak Machine" is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+#  You should have received a copy of the GNU General Public License
+#  along with "The Strak Machine".  If not, see <http://www.gnu.org/licenses/>.
+
+#  Copyright (C) 2020-2022 Matthias Boese
+
+import numpy as np
+import hashlib
+import json
+import zipfile
+from os import stat, replace
+from os.path import exists
+
+# tags that are searched for in the header of a polar file
+BeginOfDataSectionTag = "-------"
+airfoilNameTag = "Calculated polar for:"
+polarTypeTag = "Reynolds number"
+MachTag = "Mach ="
+ReTag = "Re ="
+NCritTag = "Ncrit ="
+
+# columns of the data section of a polar file, in the order they are written
+# by XFOIL / Xoptfoil / xfoil_worker
+fileColumns = ('alpha', 'CL', 'CD', 'CDp', 'Cm', 'Top_Xtr', 'Bot_Xtr')
+
+# binary cache files are stored next to the polar file, using this suffix
+cacheFileSuffix = '.npz'
+
+# version of the cache file format, increment if the content changes
+cacheVersion = 2
+
+# the recorded alpha range is stored next to the polar file, using this suffix
+rangeFileSuffix = '.range'
+
+
+################################################################################
+#
+# reader for XFOIL / Xoptfoil polar files. Example of the format:
+#
+#Xoptfoil-JX Design 123
+#
+# Calculated polar for: JX-GT-15
+#
+# 1 1 Reynolds number fixed          Mach number fixed
+#
+# xtrf =   1.000 (top)        1.000 (bottom)
+# Mach =   0.000     Re =     0.600 e 6     Ncrit =   7.000
+#
+#  alpha     CL        CD       CDp       Cm    Top Xtr Bot Xtr
+# ------- -------- --------- --------- -------- ------- -------
+#  -2.000  -0.0160   0.00680   0.00000  -0.0430  0.9282  0.2707
+#
+################################################################################
+
+# gets the float value that follows 'tag' in a header line
+def get_headerValue(line, tag):
+    valueString = line.split(tag)[1].split()[0]
+    return float(valueString)
+
+
+# parses the header lines of a polar file, returns a dictionary
+def parse_header(headerLines):
+    header = {"title": "", "airfoilname": "", "polarType": 0, "Re": 0.0,
+              "Mach": 0.0, "NCrit": 0.0}
+
+    if len(headerLines) > 0:
+        header["title"] = headerLines[0].strip()
+
+    for line in headerLines:
+        if line.find(airfoilNameTag) >= 0:
+            header["airfoilname"] = line.split(airfoilNameTag)[1].strip()
+
+        elif line.find(polarTypeTag) >= 0:
+            try:
+                header["polarType"] = int(line.split()[0])
+            except ValueError:
+                pass
+
+        elif line.find(ReTag) >= 0:
+            # Re is written as mantissa and exponent, e.g. '0.600 e 6'
+            ReString = line.split(ReTag)[1].split("Ncrit")[0]
+            splitstring = ReString.split("e")
+            mantissa = float(splitstring[0].strip())
+            exponent = float(splitstring[1].strip())
+            header["Re"] = mantissa * (10**exponent)
+
+            if line.find(MachTag) >= 0:
+                header["Mach"] = get_headerValue(line, MachTag)
+
+            if line.find(NCritTag) >= 0:
+                header["NCrit"] = get_headerValue(line, NCritTag)
+
+    return header
+
+
+# parses the data section of a polar file in one step. Returns a 2D-array with
+# one row per datapoint, sorted by ascending alpha. The order of datapoints
+# with equal alpha is kept as in the file.
+def parse_dataSection(dataLines):
+    # skip empty lines and determine number of columns from the first line
+    dataLines = [line for line in dataLines if line.strip() != '']
+
+    if len(dataLines) == 0:
+        return np.zeros((0, len(fileColumns)))
+
+    numColumns = len(dataLines[0].split())
+    values = np.array(" ".join(dataLines).split(), dtype=np.float64)
+
+    if (values.size % numColumns) != 0:
+        raise ValueError("inconsistent number of columns in data section")
+
+    data = values.reshape(-1, numColumns)
+
+    # op-points may be mixed up in order, sort once by alpha
+    order = np.argsort(data[:, 0], kind='stable')
+    return data[order]
+
+
+# reads a polar file, returns the header as a dictionary and the datapoints
+# as a 2D-array, columns according to 'fileColumns'.
+# Raises IOError if the file could not be read and ValueError if the file
+# does not contain a data section.
+def read_polarFile(fileName):
+    with open(fileName) as fileHandle:
+        lines = fileHandle.readlines()
+
+    # find the start of the data-section
+    for idx in range(len(lines)):
+        if lines[idx].find(BeginOfDataSectionTag) >= 0:
+            break
+    else:
+        raise ValueError("no data section found in polar file %s" % fileName)
+
+    header = parse_header(lines[:idx])
+    data = parse_dataSection(lines[idx+1:])
+    return (header, data)
+
+
+# replaces the airfoil name in the header lines of a polar file
+def set_airfoilName(lines, airfoilName):
+    for (idx, line) in enumerate(lines):
+        if line.find(BeginOfDataSectionTag) >= 0:
+            break
+        if line.find(airfoilNameTag) >= 0:
+            lines[idx] = "%s%s %s\n" % (line.split(airfoilNameTag)[0],
+                                        airfoilNameTag, airfoilName)
+
+
+# writes a copy of a polar file with a new airfoil name in the header, e.g.
+# for a polar that was calculated for an airfoil of the same geometry
+def write_renamedPolarFile(fileName, renamedFileName, airfoilName):
+    with open(fileName) as fileHandle:
+        lines = fileHandle.readlines()
+
+    set_airfoilName(lines, airfoilName)
+
+    with open(renamedFileName, 'w') as fileHandle:
+        fileHandle.writelines(lines)
+
+
+# writes a copy of a polar file, that only contains the datapoints with
+# alphaMin <= alpha <= alphaMax. The header is copied unchanged, except for
+# the airfoil name, if 'airfoilName' is given.
+def write_clippedPolarFile(fileName, clippedFileName, alphaMin, alphaMax,
+                           airfoilName=None):
+    with open(fileName) as fileHandle:
+        lines = fileHandle.readlines()
+
+    if airfoilName != None:
+        set_airfoilName(lines, airfoilName)
+
+    # tolerance for alpha-values that were written with 3 decimals
+    tolerance = 0.0005
+    clippedLines = []
+    dataSection = False
+
+    for line in lines:
+        if dataSection and (line.strip() != ''):
+            alpha = float(line.split()[0])
+            if (alpha < (alphaMin - tolerance)) or (alpha > (alphaMax + tolerance)):
+                continue
+        elif line.find(BeginOfDataSectionTag) >= 0:
+            dataSection = True
+
+        clippedLines.append(line)
+
+    if not dataSection:
+        raise ValueError("no data section found in polar file %s" % fileName)
+
+    with open(clippedFileName, 'w') as fileHandle:
+        fileHandle.writelines(clippedLines)
+
+
+# splices several polar files of the same airfoil and Re-number into one
+# polar file. The header is taken from the first file, the datapoints of all
+# files are sorted by alpha. If several files contain the same alpha, the
+# datapoint of the last of these files is kept.
+def write_splicedPolarFile(fileNames, splicedFileName):
+    headerLines = None
+    dataLines = {}
+
+    for fileName in fileNames:
+        with open(fileName) as fileHandle:
+            lines = fileHandle.readlines()
+
+        for idx in range(len(lines)):
+            if lines[idx].find(BeginOfDataSectionTag) >= 0:
+                break
+        else:
+            raise ValueError("no data section found in polar file %s" % fileName)
+
+        if headerLines == None:
+            headerLines = lines[:idx+1]
+
+        for line in lines[idx+1:]:
+            if line.strip() != '':
+                # alpha-values are written with 3 decimals
+                alpha = round(float(line.split()[0]), 3)
+                dataLines[alpha] = line
+
+    with open(splicedFileName, 'w') as fileHandle:
+        fileHandle.writelines(headerLines)
+        fileHandle.writelines([dataLines[alpha] for alpha in sorted(dataLines)])
+
+
+################################################################################
+#
+# alpha range of polar files
+#
+# The alpha range that was requested for a polar file is recorded in a small
+# file next to the polar file, together with a key of all other settings of
+# polar generation. The datapoints do not tell the alpha range, as XFOIL may
+# fail to converge at the ends of the range.
+#
+################################################################################
+
+def get_rangeFileName(fileName):
+    return fileName + rangeFileSuffix
+
+
+# records the alpha range and the settings key of a polar file
+def write_rangeFile(fileName, alphaMin, alphaMax, settingsKey):
+    alphaRange = {"alphaMin": alphaMin, "alphaMax": alphaMax,
+                  "settings": settingsKey}
+
+    with open(get_rangeFileName(fileName), 'w') as fileHandle:
+        json.dump(alphaRange, fileHandle)
+
+
+# reads the recorded alpha range of a polar file. Returns None if there is
+# no record or if the polar file is newer than the record
+def read_rangeFile(fileName):
+    rangeFileName = get_rangeFileName(fileName)
+
+    if not (exists(rangeFileName) and exists(fileName)):
+        return None
+
+    if stat(fileName).st_mtime_ns > stat(rangeFileName).st_mtime_ns:
+        return None
+
+    try:
+        with open(rangeFileName) as fileHandle:
+            alphaRange = json.load(fileHandle)
+        return {"alphaMin": float(alphaRange["alphaMin"]),
+                "alphaMax": float(alphaRange["alphaMax"]),
+                "settings": alphaRange["settings"]}
+    except (IOError, ValueError, KeyError, TypeError):
+        return None
+
+
+################################################################################
+#
+# binary sidecar cache for polar files
+#
+# The cache file holds arbitrary arrays that were derived from a polar file.
+# It is keyed by size, modification time and content hash of the polar file
+# and by a dictionary of settings that were used to derive the arrays.
+#
+################################################################################
+
+def get_cacheFileName(fileName):
+    return fileName + cacheFileSuffix
+
+
+# returns the SHA1-hash of the content of a file
+def get_contentHash(fileName):
+    with open(fileName, 'rb') as fileHandle:
+        return hashlib.sha1(fileHandle.read()).hexdigest()
+
+
+# returns size and modification time of a file
+def get_fileStamp(fileName):
+    fileStat = stat(fileName)
+    return (fileStat.st_size, fileStat.st_mtime_ns)
+
+
+# normalizes a settings-dictionary, so it can be compared to the settings
+# read back from a cache file
+def normalize_settings(settings):
+    return json.loads(json.dumps(settings, sort_keys=True))
+
+
+# writes arrays to the cache file of a polar file. 'arrays' is a dictionary
+# of names and values, 'settings' a dictionary of all parameters the arrays
+# depend on
+def write_cacheFile(fileName, settings, arrays):
+    (size, mtime) = get_fileStamp(fileName)
+    key = {"version": cacheVersion, "size": size, "mtime": mtime,
+           "hash": get_contentHash(fileName),
+           "settings": normalize_settings(settings)}
+
+    # write to a temporary file first, so there will never be an incomplete
+    # cache file
+    cacheFileName = get_cacheFileName(fileName)
+    tempFileName = cacheFileName + '.tmp'
+
+    with open(tempFileName, 'wb') as fileHandle:
+        np.savez(fileHandle, key=np.array(json.dumps(key)), **arrays)
+
+    replace(tempFileName, cacheFileName)
+
+
+# reads arrays from the cache file of a polar file. Returns None, if there is
+# no cache file or if the cache file does not match the polar file or the
+# given settings
+def read_cacheFile(fileName, settings):
+    cacheFileName = get_cacheFileName(fileName)
+
+    if not (exists(cacheFileName) and exists(fileName)):
+        return None
+
+    try:
+        with np.load(cacheFileName, allow_pickle=False) as cache:
+            key = json.loads(str(cache['key']))
+            arrays = {}
+            for name in cache.files:
+                if name != 'key':
+                    arrays[name] = cache[name]
+    except (IOError, ValueError, KeyError, zipfile.BadZipFile):
+        return None
+
+    if ((key.get("version") != cacheVersion) or
+        (key.get("settings") != normalize_settings(settings))):
+        return None
+
+    # check if polar file has changed
+    (size, mtime) = get_fileStamp(fileName)
+    if key.get("size") != size:
+        return None
+
+    if ((key.get("mtime") != mtime) and
+        (key.get("hash") != get_contentHash(fileName))):
+        return None
+
+    return arrays
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+
+#  This file is part of "The Strak Machine".
+
+#  "The Strak Machine" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+
+#  "The Strak Machine" is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+#  You should have received a copy of the GNU General Public License
+#  along with "The Strak Machine".  If not, see <http://www.gnu.org/licenses/>.
+
+#  Copyright (C) 2020-2022 Matthias Boese
+
+import argparse
+import numpy as np
+import polar_file
+
+################################################################################
+#
+# reconstruction of dense polars from polars with a coarse alpha step
+#
+# All columns of a polar are interpolated over alpha by shape-preserving
+# piecewise cubic (PCHIP) interpolation. Between two datapoints the
+# interpolated values stay within the values of the datapoints, so there is
+# no overshoot near CLmax or at the edges of the laminar bucket. The pre-stall
+# branch (up to CLmax) and the post-stall branch (from CLmax) are interpolated
+# separately, so the kink at CLmax is kept.
+#
+# The polar data is a 2D-array with one row per column of the polar. Row 0
+# must be alpha, row 'CL_idx' must be CL.
+#
+################################################################################
+
+# default alpha step of the coarse polars that are reconstructed, i.e. the
+# alpha step of the XFOIL-worker if polars are reconstructed
+defaultCoarseStep = 0.25
+
+
+# removes datapoints with an alpha that is equal to the alpha of the previous
+# datapoint. The data must be sorted by alpha.
+def get_uniqueDatapoints(data):
+    if data.shape[1] < 2:
+        return data
+
+    unique = np.concatenate(([True], np.diff(data[0]) > 0.0))
+    return data[:, unique]
+
+
+# returns the pre-stall and the post-stall branch of a polar as slices. Both
+# branches contain the datapoint of CLmax.
+def get_branches(data, CL_idx=1):
+    num = data.shape[1]
+    maxLift_idx = int(np.argmax(data[CL_idx]))
+    return [slice(0, maxLift_idx + 1), slice(maxLift_idx, num)]
+
+
+# evaluates the interpolated polar at the given alpha-values. Returns a
+# 2D-array with one row per column of the polar. Values outside the alpha
+# range of the polar are NaN.
+def evaluate_polar(data, newAlpha, CL_idx=1):
+    # import only if needed, scipy takes some time to import
+    from scipy.interpolate import PchipInterpolator
+
+    data = get_uniqueDatapoints(data)
+    newAlpha = np.asarray(newAlpha, dtype=np.float64)
+    newData = np.full((data.shape[0], len(newAlpha)), np.nan)
+
+    if data.shape[1] == 0:
+        return newData
+
+    (preStall, postStall) = get_branches(data, CL_idx)
+    alpha_maxLift = data[0, preStall.stop - 1]
+    branchMasks = ((newAlpha <= alpha_maxLift), (newAlpha > alpha_maxLift))
+
+    for (branch, mask) in zip((preStall, postStall), branchMasks):
+        branchData = data[:, branch]
+
+        if branchData.shape[1] < 2:
+            # a single datapoint can only be taken as it is
+            mask = mask & (newAlpha == branchData[0, 0])
+            newData[:, mask] = branchData[:, :1]
+            continue
+
+        interpolator = PchipInterpolator(branchData[0], branchData[1:],
+                                         axis=1, extrapolate=False)
+        newData[1:, mask] = interpolator(newAlpha[mask])
+
+    newData[0] = np.where(np.isnan(newData[1]), np.nan, newAlpha)
+    return newData
+
+
+# reconstructs a dense polar with the given alpha step. The alpha of CLmax is
+# always part of the new alpha-grid.
+def reconstruct_polar(data, alphaStep, CL_idx=1):
+    data = get_uniqueDatapoints(data)
+
+    if data.shape[1] < 2:
+        return data.copy()
+
+    alphaStart = data[0, 0]
+    alphaEnd = data[0, -1]
+    alpha_maxLift = data[0, np.argmax(data[CL_idx])]
+
+    # new alpha-grid, rounded to get rid of floating point noise
+    num = int(np.floor((alphaEnd - alphaStart) / alphaStep + 1.0e-6)) + 1
+    newAlpha = np.round(alphaStart + np.arange(num) * alphaStep, 6)
+    newAlpha = np.unique(np.concatenate((newAlpha, [alpha_maxLift, alphaEnd])))
+
+    return evaluate_polar(data, newAlpha, CL_idx)
+
+
+# estimates the error of reconstructing a polar from 'data' by comparing it to
+# a reference polar, e.g. a polar that was calculated with a fine alpha step.
+# Only datapoints of the reference polar within the alpha range of 'data'
+# are compared. Returns the maximum and the RMS error for each column.
+def get_reconstructionError(data, referenceData, CL_idx=1):
+    reconstructed = evaluate_polar(data, referenceData[0], CL_idx)
+    valid = ~np.isnan(reconstructed[0])
+
+    errors = reconstructed[:, valid] - referenceData[:, valid]
+    if errors.shape[1] == 0:
+        return (np.full(data.shape[0], np.nan), np.full(data.shape[0], np.nan))
+
+    maxError = np.max(np.abs(errors), axis=1)
+    rmsError = np.sqrt(np.mean(errors**2, axis=1))
+    return (maxError, rmsError)
+
+
+# prints the estimated reconstruction error of a coarse polar file against a
+# reference polar file
+def print_reconstructionError(fileName, referenceFileName):
+    (header, data) = polar_file.read_polarFile(fileName)
+    (referenceHeader, referenceData) = polar_file.read_polarFile(referenceFileName)
+    (maxError, rmsError) = get_reconstructionError(data.T, referenceData.T)
+
+    print("reconstruction error of %s against %s:" % (fileName, referenceFileName))
+    print("%-8s %12s %12s" % ("column", "max. error", "RMS error"))
+    for idx in range(1, len(polar_file.fileColumns)):
+        print("%-8s %12.6f %12.6f" % (polar_file.fileColumns[idx],
+                                      maxError[idx], rmsError[idx]))
+
+
+################################################################################
+# Main program
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser('')
+
+    helptext = "filename of the coarse polar"
+    parser.add_argument("-polar", "-p", required = True, help = helptext)
+
+    helptext = "filename of the reference polar"
+    parser.add_argument("-reference", "-r", required = True, help = helptext)
+
+    args = parser.parse_args()
+    print_reconstructionError(args.polar, args.reference)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+
+#  This file is part of "The Strak Machine".
+
+#  "The Strak Machine" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+
+#  "The Strak Machine" is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+#  You should have received a copy of the GNU General Public License
+#  along with "The Strak Machine".  If not, see <http://www.gnu.org/licenses/>.
+
+#  Copyright (C) 2020-2022 Matthias Boese
+
+import numpy as np
+
+################################################################################
+#
+# adaptive alpha sampling for polar generation
+#
+# A polar is first calculated with a coarse alpha step. Regions of high
+# curvature of CL(alpha) and CD(CL), e.g. near CLmax and at the edges of the
+# laminar bucket, are then calculated again with the fine alpha step. All
+# parts are spliced into one polar file.
+#
+################################################################################
+
+# ratio of coarse alpha step to fine alpha step
+coarseStepFactor = 5
+
+# default number of datapoints of a polar in adaptive mode
+defaultPointBudget = 100
+
+
+# returns the coarse alpha step for a given fine alpha step
+def get_coarseStep(fineStep):
+    return round(fineStep * coarseStepFactor, 3)
+
+
+# returns the curvature of y(x) at the inner datapoints, using the slopes of
+# the neighbouring intervals. Intervals of zero width result in a curvature
+# of 0.0
+def get_curvature(x, y):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slopes = np.diff(y) / np.diff(x)
+        curvature = np.abs(np.diff(slopes)) / (0.5 * (x[2:] - x[:-2]))
+
+    curvature[~np.isfinite(curvature)] = 0.0
+    return curvature
+
+
+# normalizes values to a maximum of 1.0
+def normalize(values):
+    maximum = np.max(values) if len(values) > 0 else 0.0
+    if maximum > 0.0:
+        return values / maximum
+    return values
+
+
+# determines the alpha regions of a coarse polar that shall be calculated
+# with the fine alpha step. Returns a list of (alphaStart, alphaEnd).
+# The number of additional datapoints is limited, so that the coarse and
+# the fine datapoints together do not exceed 'pointBudget'.
+def find_denseRegions(alpha, CL, CD, fineStep, pointBudget):
+    if len(alpha) < 3:
+        return []
+
+    # score of each inner datapoint: curvature of CL(alpha) or CD(CL),
+    # whatever is higher
+    score = np.maximum(normalize(get_curvature(alpha, CL)),
+                       normalize(get_curvature(CL, CD)))
+
+    # each region reaches from the left to the right neighbour of a
+    # datapoint and adds the datapoints in between
+    budget = pointBudget - len(alpha)
+    regions = []
+
+    for idx in np.argsort(-score, kind='stable') + 1:
+        if (score[idx-1] <= 0.0):
+            break
+
+        alphaStart = alpha[idx-1]
+        alphaEnd = alpha[idx+1]
+        newPoints = int(round((alphaEnd - alphaStart) / fineStep)) - 2
+
+        # a smaller region of lower score may still fit
+        if newPoints > budget:
+            continue
+
+        budget -= newPoints
+        regions.append((float(alphaStart), float(alphaEnd)))
+
+    return merge_regions(regions)
+
+
+# merges overlapping regions, returns a sorted list of regions
+def merge_regions(regions):
+    merged = []
+
+    for (alphaStart, alphaEnd) in sorted(regions):
+        if (len(merged) > 0) and (alphaStart <= merged[-1][1]):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], alphaEnd))
+        else:
+            merged.append((alphaStart, alphaEnd))
+
+    return merged
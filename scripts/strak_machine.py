@@ -18,24 +18,33 @@
 #  Copyright (C) 2020-2022 Matthias Boese
 
 # imports
-import xml.etree.ElementTree as ET
 import argparse
 import sys
 import json
-from os import listdir, path, system, makedirs, chdir, getcwd, remove
+from os import listdir, path, system, makedirs, chdir, getcwd, remove, replace, stat
 from os.path import exists
-from matplotlib import pyplot as plt
-from matplotlib import image as mpimg
 from math import pi, sin
 import numpy as np
 import f90nml
 from copy import deepcopy
+from shutil import copyfile, rmtree
+from datetime import datetime
+from io import StringIO
 from colorama import init
 from termcolor import colored
 import change_airfoilname
+import airfoil_geometry
+import file_emitter
+import job_graph
+import namelist_writer
+import oppoint_table
+import polar_file
+import polar_cache
+import polar_reconstruction
+import polar_sampling
+import worker_calls
 import re
 import importlib
-visualizer = importlib.import_module("xoptfoil_visualizer-jx")
 
 # paths and separators
 bs = "\\"
@@ -115,6 +124,41 @@ print_disabled = False
 # default values
 NCrit_Default = 9.0
 
+# returns the xoptfoil-visualizer module. It imports matplotlib, so it is
+# only imported when it is needed and not by worker calls like -w merge
+def get_visualizer():
+    return importlib.import_module(xoptfoilVisualizerName)
+
+
+# parses the output of 'xfoil_worker -w check'. Returns the number of
+# curvature reversals on top and bottom side, None if they could not be
+# determined, and if smoothing of the airfoil is necessary
+def parse_assessmentResults(lines):
+    reversals = []
+    smoothingNecessary = True
+
+    for line in lines:
+        if line.find('perfect surface quality')>=0:
+            smoothingNecessary = False
+        elif line.find('Reversals')>=0:
+            splitlines = line.split('Reversals')
+            reversalString = splitlines[1]
+            splitlines = reversalString.split('Curvature ')
+            reversalString = splitlines[0].strip()
+            value = int(reversalString)
+            reversals.append(value)
+
+    # check how many reversal values were found (with or withou smoothing)
+    if (len(reversals) == 2):
+        # airfoil not smoothed
+        return (reversals[0], reversals[1], smoothingNecessary)
+    elif (len(reversals) == 4):
+        # airfoil smoothed
+        return (reversals[1], reversals[3], smoothingNecessary)
+    else:
+        return (None, None, smoothingNecessary)
+
+
 def my_print(message):
     if print_disabled:
         return
@@ -164,11 +208,12 @@ def get_ReString(Re):
 
 # helper-function to perform a linear-interpolation
 def interpolate(x1, x2, y1, y2, x):
-    try:
-        y = ((y2-y1)/(x2-x1)) * (x-x1) + y1
-    except:
+    # check explicitly, numpy-scalars will not raise an exception
+    if (x2 == x1):
         ErrorMsg("Division by zero, x1:%f, x2:%f" % (x1, x2))
-        y = 0.0
+        return 0.0
+
+    y = ((y2-y1)/(x2-x1)) * (x-x1) + y1
     return y
 
 
@@ -210,6 +255,27 @@ def get_PresetInputFileName(xoptfoilTemplate):
     sys.exit(-1)
 
 
+# parsed template files, stored under the filename together with size and
+# modification time of the file
+templateCache = {}
+
+# reads a template file as a Fortran namelist. Each template file is only
+# parsed once, as long as it is not changed. Returns a copy of the namelist
+# that may be changed by the caller.
+def read_TemplateFile(fileName):
+    fileStat = stat(fileName)
+    fileStat = (fileStat.st_size, fileStat.st_mtime_ns)
+
+    if fileName in templateCache:
+        (cachedStat, namelist) = templateCache[fileName]
+        if cachedStat == fileStat:
+            return deepcopy(namelist)
+
+    namelist = f90nml.read(fileName)
+    templateCache[fileName] = (fileStat, namelist)
+    return deepcopy(namelist)
+
+
 
 ################################################################################
 #
@@ -230,16 +296,21 @@ class inputFile:
         self.presetInputFileName = get_PresetInputFileName(params.xoptfoilTemplate)
 
         # read input-file as a Fortan namelist
-        self.values = f90nml.read(self.presetInputFileName)
+        self.values = read_TemplateFile(self.presetInputFileName)
+
+        # table of op-points, the namelist will be updated when writing to file
+        self.opPoints = oppoint_table.opPointTable()
+        self.opPoints.read_FromNamelist(self.values["operating_conditions"])
 
 
     def __del__(self):
         class_name = self.__class__.__name__
 
 
+    # checks the op-points of the namelist, as read from file
     def validate(self):
         valid = True
-        operatingConditions = self.get_OperatingConditions()
+        operatingConditions = self.values["operating_conditions"]
         num = len(operatingConditions['op_point'])
 
         num_op_mode = len(operatingConditions['op_mode'])
@@ -265,24 +336,19 @@ class inputFile:
         return valid
 
 
-    # writes contents to file, using f90nnml-parser
-    def write_ToFile(self, fileName):
-        # delete 'name'
-        operatingConditions = self.values["operating_conditions"]
-        operatingConditionsBackup = operatingConditions.copy()
-        try:
-            del(operatingConditions['name'])
-        except:
-            pass
+    # returns the contents of the input-file, without the names of the
+    # op-points
+    def get_FileText(self):
+        self.opPoints.write_ToNamelist(self.values["operating_conditions"])
+        return namelist_writer.get_namelistFileText(self.values,
+                                           {"operating_conditions": ("name",)})
 
-        self.values["operating_conditions"] = operatingConditions
 
-        # write to file
+    # writes contents to file, without the names of the op-points
+    def write_ToFile(self, fileName):
         InfoMsg("writing input-file %s..." % fileName)
-        f90nml.write(self.values, fileName, True)
-
-        # restore 'name'
-        self.values["operating_conditions"] = operatingConditionsBackup.copy()
+        with open(fileName, 'w') as fileHandle:
+            fileHandle.write(self.get_FileText())
         DoneMsg()
 
 
@@ -291,88 +357,65 @@ class inputFile:
         InfoMsg("reading input-file %s..." % fileName)
         currentDir = getcwd()#FIXME Debug
         self.values = f90nml.read(fileName)
+        self.opPoints.read_FromNamelist(self.values["operating_conditions"])
 
 
-    # deletes all existing op-points in operating-conditions, but keeps
-    # the keys of the dictionary (empty lists)
-    def delete_AllOpPoints(self, operatingConditions):
-        # clear operating conditions
-        operatingConditions["name"] = []
-        operatingConditions["op_mode"] = []
-        operatingConditions["op_point"] = []
-        operatingConditions["optimization_type"] = []
-        operatingConditions["target_value"] = []
-        operatingConditions["weighting"] = []
-        operatingConditions["reynolds"] = []
-        operatingConditions['noppoint'] = 0
+    # deletes all existing op-points
+    def delete_AllOpPoints(self):
+        self.opPoints.clear()
 
 
     def change_TargetValue(self, keyName, targetValue):
-        # get operating-conditions from dictionary
-        operatingConditions = self.values["operating_conditions"]
-        # get OpPoint-names
-        opPointNames = operatingConditions["name"]
-        idx = 0
-        for key in opPointNames:
-            if key == keyName:
-                # get type of op-point
-                opPointType = operatingConditions['op_mode'][idx]
-
-                # limit the number of decimals
-                if (opPointType == 'spec-cl'):
-                    # target-value is drag-value
-                    targetValue = round(targetValue, CD_decimals)
-                elif (opPointType == 'spec-al'):
-                    # target-value is lift-value
-                    targetValue = round(targetValue, CL_decimals)
-
-                # change target value
-                operatingConditions['target_value'][idx] = targetValue
-
-                # write-back operatingConditions
-                self.values["operating_conditions"] = operatingConditions
-                return
-            idx = idx + 1
+        idx = self.opPoints.get_index(keyName)
+        if idx == None:
+            return
+
+        # get type of op-point
+        opPointType = self.opPoints.get_value('op_mode', idx)
+
+        # limit the number of decimals
+        if (opPointType == 'spec-cl'):
+            # target-value is drag-value
+            targetValue = round(targetValue, CD_decimals)
+        elif (opPointType == 'spec-al'):
+            # target-value is lift-value
+            targetValue = round(targetValue, CL_decimals)
+
+        # change target value
+        self.opPoints.set_value('target_value', idx, targetValue)
 
 
     def change_OpPoint(self, keyName, op_point):
-        # get operating-conditions from dictionary
-        operatingConditions = self.values["operating_conditions"]
-        # get OpPoint-names
-        opPointNames = operatingConditions["name"]
-        idx = 0
-        for key in opPointNames:
-            if key == keyName:
-                # get type of op-point
-                opPointType = operatingConditions['op_mode'][idx]
-
-                # limit the number of decimals
-                if (opPointType == 'spec-cl'):
-                    # opPoint-value is lift-value
-                    op_point = round(op_point, CL_decimals)
-                elif (opPointType == 'spec-al'):
-                    # opPoint-value is alpha-value
-                    op_point = round(op_point, AL_decimals)
-
-                # change op_point
-                operatingConditions['op_point'][idx] = op_point
-                # write-back operatingConditions
-                self.values["operating_conditions"] = operatingConditions
-                return
-            idx = idx + 1
+        idx = self.opPoints.get_index(keyName)
+        if idx == None:
+            return
 
+        # get type of op-point
+        opPointType = self.opPoints.get_value('op_mode', idx)
 
-    def change_Weighting(self, idx, new_weighting):
-        # get operating-conditions from dictionary
-        operatingConditions = self.values["operating_conditions"]
+        # limit the number of decimals
+        if (opPointType == 'spec-cl'):
+            # opPoint-value is lift-value
+            op_point = round(op_point, CL_decimals)
+        elif (opPointType == 'spec-al'):
+            # opPoint-value is alpha-value
+            op_point = round(op_point, AL_decimals)
+
+        # change op_point
+        self.opPoints.set_value('op_point', idx, op_point)
 
-         # set new weighting
-        operatingConditions['weighting'][idx] = new_weighting
+
+    def change_Weighting(self, idx, new_weighting):
+        # set new weighting
+        self.opPoints.set_value('weighting', idx, new_weighting)
 
 
+    # returns the namelist-group of the op-points, updated with the current
+    # op-points
     def get_OperatingConditions(self):
          # get operating-conditions from dictionary
         operatingConditions = self.values["operating_conditions"]
+        self.opPoints.write_ToNamelist(operatingConditions)
         return operatingConditions
 
     def get_oppointValues(self, idx):
@@ -382,16 +425,14 @@ class inputFile:
             ErrorMsg("idx %d exceeds num oppoint: %d" % (idx, num))
             return None
 
-        operatingConditions = self.get_OperatingConditions()
-
         # type of op-point
-        mode = operatingConditions['op_mode'][idx]
+        mode = self.opPoints.get_value('op_mode', idx)
         # x-value of op-point
-        oppoint = operatingConditions['op_point'][idx]
+        oppoint = self.opPoints.get_value('op_point', idx)
         # target value of op-point
-        target = operatingConditions['target_value'][idx]
+        target = self.opPoints.get_value('target_value', idx)
         # weighting of op-point
-        weighting = operatingConditions['weighting'][idx]
+        weighting = self.opPoints.get_value('weighting', idx)
 
         return (mode, oppoint, target, weighting)
 
@@ -424,144 +465,94 @@ class inputFile:
         # unpack tuple
         (mode, oppoint, target, weighting) = values
 
-        # get operating conditions
-        operatingConditions = self.get_OperatingConditions()
-
         # type of op-point
-        operatingConditions['op_mode'][idx] = mode
+        self.opPoints.set_value('op_mode', idx, mode)
         # x-value of op-point
-        operatingConditions['op_point'][idx] = oppoint
+        self.opPoints.set_value('op_point', idx, oppoint)
         # target value of op-point
-        operatingConditions['target_value'][idx] = target
+        self.opPoints.set_value('target_value', idx, target)
         # weighting of op-point
-        operatingConditions['weighting'][idx] = weighting
+        self.opPoints.set_value('weighting', idx, weighting)
 
 
+    # sets the values of all op-points at once, one list per value
+    def set_allOppointValues(self, modes, oppoints, targets, weightings):
+        self.opPoints.set_columns({'op_mode': modes, 'op_point': oppoints,
+                                   'target_value': targets,
+                                   'weighting': weightings})
+
 
     def get_numOpPoints(self):
-        operatingConditions = self.get_OperatingConditions()
-        return len(operatingConditions['op_point'])
+        return self.opPoints.get_numOpPoints()
 
 
     def set_OperatingConditions(self, operatingConditions):
          # put operating-conditions into dictionary
         self.values["operating_conditions"] = operatingConditions
+        self.opPoints.read_FromNamelist(operatingConditions)
 
 
     def get_OpPoint(self, keyName):
-        # get operating-conditions from dictionary
-        operatingConditions = self.values["operating_conditions"]
-        # get OpPoint-names
-        opPointNames = operatingConditions["name"]
-        idx = 0
-        for key in opPointNames:
-            if key == keyName:
-                # return op_point
-                return operatingConditions['op_point'][idx]
-            idx = idx + 1
+        idx = self.opPoints.get_index(keyName)
+        if idx != None:
+            # return op_point
+            return self.opPoints.get_value('op_point', idx)
 
 
     # get all targets, filtered by 'op_mode'
     def get_xyTargets(self, op_mode):
-        x = []
-        y = []
-
-        # get operating-conditions from inputfile
-        operatingConditions = self.get_OperatingConditions()
-        target_values = operatingConditions["target_value"]
-        op_points = operatingConditions["op_point"]
-        op_modes =  operatingConditions["op_mode"]
-        opt_type = operatingConditions["optimization_type"]
-
-        # get the number of op-points
-        numOpPoints = len(op_points)
-
-        for i in range(numOpPoints):
-            # check if the oppoint has the requested op-mode
-            if (op_modes[i] == op_mode):
-                if (op_mode == 'spec-cl'):
-                    if opt_type == 'target-glide':
-                        value = op_points[i] / target_values[i]
-                    else:
-                        value = target_values[i]
-
-                    # get CL, CD
-                    x.append(value) # CD
-                    y.append(op_points[i])     # CL
-                # check if the op-mode is 'spec-al'
-                elif (op_modes[i] == 'spec-al'):
-                    x.append(op_points[i])     # alpha
-                    y.append(target_values[i]) # CL
-
-        return (x, y)
+        op_modes = self.opPoints.get_column('op_mode')
+        opt_types = self.opPoints.get_column('optimization_type')
+        op_points = self.opPoints.get_column('op_point')
+        target_values = self.opPoints.get_column('target_value')
 
+        # select the oppoints with the requested op-mode
+        selected = (op_modes == op_mode)
 
-    # get all weightings, filtered by 'op_mode'
-    def get_weightings(self, op_mode):
-        weightings = []
+        if (op_mode == 'spec-cl'):
+            with np.errstate(divide='ignore', invalid='ignore'):
+                x = np.where(opt_types == 'target-glide',
+                             op_points / target_values, target_values) # CD
+            y = op_points     # CL
+        elif (op_mode == 'spec-al'):
+            x = op_points     # alpha
+            y = target_values # CL
+        else:
+            return ([], [])
 
-        # get operating-conditions from inputfile
-        operatingConditions = self.get_OperatingConditions()
-        op_modes =  operatingConditions["op_mode"]
-        try:
-            weightingList = operatingConditions["weighting"]
-        except:
-            # no weightings found
-            pass
+        return (x[selected].tolist(), y[selected].tolist())
 
-        # get the number of op-points
-        numOpPoints = len(op_modes)
 
-        for i in range(numOpPoints):
-            # check if the oppoint has the requested op-mode
-            if (op_modes[i] == op_mode):
-                try:
-                    weightings.append(weightingList[i])
-                except:
-                    # found no weighting for this oppoint
-                    weightings.append(None)
-                    pass
+    # get all weightings, filtered by 'op_mode'
+    def get_weightings(self, op_mode):
+        op_modes = self.opPoints.get_column('op_mode')
+        weightings = self.opPoints.get_column('weighting')
 
-        return (weightings)
+        # found no weighting for an oppoint: None
+        return [oppoint_table.from_float(weighting)
+                for weighting in weightings[op_modes == op_mode]]
 
 
     # returns name and index of the last op-point of operating-conditions
     def get_LastOpPoint(self):
-        # get operating-conditions
-        operatingConditions = self.values["operating_conditions"]
-        numOpPoints = len(operatingConditions["op_point"])
-
-        # return last opPoint
-        name = operatingConditions["name"][numOpPoints-1]
-        idx = numOpPoints-1
+        idx = self.get_numOpPoints() - 1
+        name = self.opPoints.get_value('name', idx)
         return (name, idx)
 
 
     def get_TargetValue(self, keyName):
-        # get operating-conditions from dictionary
-        operatingConditions = self.values["operating_conditions"]
-        # get OpPoint-names
-        opPointNames = operatingConditions["name"]
-        idx = 0
-        for key in opPointNames:
-            if key == keyName:
-                # return op_point
-                return operatingConditions['target_value'][idx]
-            idx = idx + 1
+        idx = self.opPoints.get_index(keyName)
+        if idx != None:
+            # return target value
+            return self.opPoints.get_value('target_value', idx)
 
 
     # gets the type of an opPoint ('spec-cl' or 'spec-al')
     def get_OpPointType(self, keyName):
-        # get operating-conditions from dictionary
-        operatingConditions = self.values["operating_conditions"]
-        # get OpPoint-names
-        opPointNames = operatingConditions["name"]
-        idx = 0
-        for key in opPointNames:
-            if key == keyName:
-                # return op_point-type (="op-mode")
-                return operatingConditions['op_mode'][idx]
-            idx = idx + 1
+        idx = self.opPoints.get_index(keyName)
+        if idx != None:
+            # return op_point-type (="op-mode")
+            return self.opPoints.get_value('op_mode', idx)
 
 
     def get_InitialPerturb(self):
@@ -661,23 +652,23 @@ class inputFile:
 
 
     def init_TargetValues(self, params, strakPolar):
-        # get operating-conditions from dictionary
-        operatingConditions = self.values["operating_conditions"]
-        opPoints = operatingConditions["op_point"]
-        targetValues = operatingConditions["target_value"]
-        opModes = operatingConditions["op_mode"]
-        optTypes = operatingConditions["optimization_type"]
-
-        # init all target values with current value of strak polar
-        for idx in range(len(opPoints)):
-            if opModes[idx] == 'spec-cl':
-                # opPoint is Cl value
-                targetValues[idx] = strakPolar.find_CD_From_CL(opPoints[idx])
-            elif opModes[idx] == 'spec-al':
-                # opPoint is alpha value
-                targetValues[idx] = strakPolar.find_CL_from_alpha(opPoints[idx])
-            else:
-                ErrMsg("unknown op_mode %s" % opModes[idx])
+        opPoints = self.opPoints.get_column('op_point')
+        targetValues = self.opPoints.get_column('target_value')
+        opModes = self.opPoints.get_column('op_mode')
+
+        # init all target values with current value of strak polar, look up
+        # all op-points of the same op-mode with one call. Values that could
+        # not be found are stored as missing values.
+        for idx in np.flatnonzero((opModes != 'spec-cl') & (opModes != 'spec-al')):
+            ErrorMsg("unknown op_mode %s" % opModes[idx])
+
+        # opPoint is Cl value
+        selected = (opModes == 'spec-cl')
+        targetValues[selected] = strakPolar.find_CD_From_CL(opPoints[selected])
+
+        # opPoint is alpha value
+        selected = (opModes == 'spec-al')
+        targetValues[selected] = strakPolar.find_CL_From_alpha(opPoints[selected])
 
 
     # adapts 'reynolds'-value of all op-points, that are below a certain
@@ -687,80 +678,46 @@ class inputFile:
     # "type2" op-points will have no 'reynolds' value, as the default-reSqrt(CL)
     # value for all "type2" op-points will be passed to xoptfoil via commandline
     def adapt_ReNumbers(self, polarData):
-        # get operating-conditions
-        operatingConditions = self.values["operating_conditions"]
-        reynolds = operatingConditions["reynolds"]
-        op_points = operatingConditions["op_point"]
-        op_modes = operatingConditions["op_mode"]
+        reynolds = self.opPoints.get_column('reynolds')
+        op_points = self.opPoints.get_column('op_point')
+        op_modes = self.opPoints.get_column('op_mode')
 
-        # get number of op-points
-        num = len(op_points)
+        # is the CL below the CL-switchpoint T1/T2-polar ?
+        selected = (op_modes == 'spec-cl') & (op_points <= polarData.CL_merge)
 
-       # walk through the opPoints
-        for idx in range(num):
-            if(op_modes[idx] == 'spec-cl'):
-                # check the op-point-value
-                CL = op_points[idx]
-                # is the CL below the CL-switchpoint T1/T2-polar ?
-                if (CL <= polarData.CL_merge):
-                    # yes, adapt maxRe --> Type 1 oppoint
-                    reynolds[idx] = int(polarData.maxRe)
-                    InfoMsg("adapted oppoint @ Cl = %0.3f, Type 1, Re = %d\n" % \
-                          (CL, int(polarData.maxRe)))
+        # op-points that were adapted for a higher CL-switchpoint are "type2"
+        # op-points again
+        reset = ((op_modes == 'spec-cl') & (op_points > polarData.CL_merge) &
+                 (reynolds == int(polarData.maxRe)))
+        reynolds[reset] = np.nan
+
+        # yes, adapt maxRe --> Type 1 oppoint
+        reynolds[selected] = int(polarData.maxRe)
+
+        for CL in op_points[selected]:
+            InfoMsg("adapted oppoint @ Cl = %0.3f, Type 1, Re = %d\n" % \
+                  (CL, int(polarData.maxRe)))
 
 
     def find_ClosestClOpPoint(self, Cl):
-        # get operating-conditions
-        operatingConditions = self.values["operating_conditions"]
-        numOpPoints = len(operatingConditions["op_point"])
-        name = None
-        idx = -1
-
-        for i in range(1, numOpPoints):
-            value_left = operatingConditions["op_point"][i-1]
-            value_right = operatingConditions["op_point"][i]
-            name_left = operatingConditions["name"][i-1]
-            name_right = operatingConditions["name"][i]
-
-            if (Cl >= value_left) & (Cl <= value_right):
-                # we found the correct interval. Which one is closer ?
-                diff_To_left = Cl - value_left
-                diff_To_right = value_right - Cl
-
-                if (diff_To_left < diff_To_right):
-                    return (name_left, i-1)
-                else:
-                    return (name_right, i)
+        idx = self.opPoints.find_closestIdx(Cl)
 
-        return (name, idx)
+        if idx < 0:
+            return (None, -1)
+
+        return (self.opPoints.get_value('name', idx), idx)
 
 
     # insert a new oppoint at the end of the list
     def add_Oppoint(self, name, op_mode, op_point, optimization_type,
                                             target_value, weighting, reynolds):
-         # get operating-conditions from dictionary
-        operatingConditions = self.values["operating_conditions"]
-
-        # append new oppoint
-        operatingConditions["name"].append(name)
-        operatingConditions["op_mode"].append(op_mode)
-        operatingConditions["op_point"].append(op_point)
-        operatingConditions["optimization_type"].append(optimization_type)
-        operatingConditions["target_value"].append(target_value)
-        operatingConditions["weighting"].append(weighting)
-        operatingConditions["reynolds"].append(reynolds)
-        operatingConditions['noppoint'] = operatingConditions['noppoint'] + 1
+        return self.opPoints.append(name, op_mode, op_point, optimization_type,
+                                    target_value, weighting, reynolds)
 
     # TODO insert 'spec-al' op-point
-    # insert a new oppoint in the list
+    # insert a new oppoint in the list, sorted by CL
     def insert_OpPoint(self, name, op_mode, op_point, optimization_type,
                                             target_value, weighting, reynolds):
-         # get operating-conditions from dictionary
-        operatingConditions = self.values["operating_conditions"]
-
-        # find index
-        num_opPoints = len(operatingConditions["op_point"])
-
         # determine the kind of op-point to be inserted
         if (op_mode == 'spec-cl'):
             CL = op_point
@@ -768,40 +725,18 @@ class inputFile:
             CL = target_value
 
         # search the list of op-points for CL
-        for idx in range(num_opPoints):
-            op_mode_list = operatingConditions["op_mode"][idx]
-            op_point_list = operatingConditions["op_point"][idx]
-            target_value_List = operatingConditions["target_value"][idx]
-
-            if (op_mode_list== 'spec-cl'):
-                CL_List = op_point_list
-            else:
-                CL_List = target_value_List
-
-            # found the right place for insertion
-            if (CL_List >= CL):
-                # insert new oppoint now
-                operatingConditions["name"].insert(idx, name)
-                operatingConditions["op_mode"].insert(idx, op_mode)
-                operatingConditions["op_point"].insert(idx, op_point)
-                operatingConditions["optimization_type"].insert(idx, optimization_type)
-                operatingConditions["target_value"].insert(idx, target_value)
-                operatingConditions["weighting"].insert(idx, weighting)
-                operatingConditions["reynolds"].insert(idx, reynolds)
-                operatingConditions['noppoint'] = operatingConditions['noppoint'] + 1
-
-                return idx
-
+        idx = self.opPoints.find_insertIdx(CL)
+        if idx == None:
+            return None
 
-        return None
+        # insert new oppoint now
+        return self.opPoints.insert(idx, name, op_mode, op_point,
+                          optimization_type, target_value, weighting, reynolds)
 
 
     def generate_OpPoints(self, numOpPoints, CL_min, CL_max):
-        # get operating-conditions
-        operatingConditions = self.values["operating_conditions"]
-
         # clear operating conditions
-        self.delete_AllOpPoints(operatingConditions)
+        self.delete_AllOpPoints()
 
         # last oppoint will be spec-al-oppoint and will be inserted afterwards,
         # using another function (alpha_CL0)
@@ -836,16 +771,31 @@ class inputFile:
             op_point = op_point + diff
 
 
+    # gets the indices of the main op-points and of the additional op-points
+    # from their names
+    def update_FixedOpPointIndices(self):
+        self.idx_CL0 = self.opPoints.get_index('CL0')
+        self.idx_maxSpeed = self.opPoints.get_index('maxSpeed')
+        self.idx_preMaxSpeed = self.opPoints.get_index('preMaxSpeed')
+        self.idx_maxGlide = self.opPoints.get_index('maxGlide')
+        self.idx_preClmax = self.opPoints.get_index('preClmax')
+
+        self.idx_additionalOpPoints = []
+        num = 0
+        while self.opPoints.get_index("add_op_%s" % num) != None:
+            self.idx_additionalOpPoints.append(self.opPoints.get_index("add_op_%s" % num))
+            num = num + 1
+
+
     # Inserts additional op-points, that are passed by a list, into
     # operating-conditions.
-    # The idx-values of fixed op-points will be corrected, if necessary
+    # The idx-values of fixed op-points will be updated afterwards
     def insert_AdditionalOpPoints(self, opPoints):
         if len(opPoints) == 0:
             # nothing to do
             return
 
         num = 0
-        #self.my_print_OpPoints()#Debug
 
         for opPoint in opPoints:
 
@@ -854,31 +804,13 @@ class inputFile:
             # get weighting
             weighting = self.get_weighting(opPoint)
 
-            # insert new op-Point, get index
-            idx = self.insert_OpPoint(name, 'spec-cl', opPoint, 'target-drag',
+            # insert new op-Point
+            self.insert_OpPoint(name, 'spec-cl', opPoint, 'target-drag',
                                      0.0, weighting, None)
-
-            # correct idx of main op-points
-            if (idx <= self.idx_CL0):
-                self.idx_CL0 = self.idx_CL0 + 1
-
-            if (idx <= self.idx_maxSpeed):
-                self.idx_maxSpeed = self.idx_maxSpeed + 1
-
-            if (idx <= self.idx_preMaxSpeed):
-                self.idx_preMaxSpeed = self.idx_preMaxSpeed + 1
-
-            if (idx <= self.idx_maxGlide):
-                self.idx_maxGlide = self.idx_maxGlide + 1
-
-            if (idx <= self.idx_preClmax):
-                self.idx_preClmax = self.idx_preClmax + 1
-
-            # append idx to list of additional op-points
-            self.idx_additionalOpPoints.append(idx)
             num = num + 1
 
-        #self.my_print_OpPoints()#Debug
+        # get idx of main op-points and additional op-points
+        self.update_FixedOpPointIndices()
 
     def append_alpha0_oppoint(self, params, strakPolar, i):
         # get maxRe
@@ -923,28 +855,7 @@ class inputFile:
     # Equally means: the difference in CL will be constant
     # "start" and "end" are both fixed op-points.
     def distribute_OpPointsEqually(self, start, end):
-        # get operating-conditions
-        operatingConditions = self.values["operating_conditions"]
-
-        # get Cl-values of start and end
-        Cl_start = operatingConditions["op_point"][start]
-        Cl_end = operatingConditions["op_point"][end]
-
-        # calculate the interval
-        num_intervals = end - start
-
-        if (num_intervals <= 1):
-            # nothing to do, both points are fixed
-            return
-
-        Cl_interval = (Cl_end - Cl_start) / num_intervals
-        #my_print(Cl_start, Cl_end, Cl_interval, num_intervals) Debug
-
-        num = 1
-        for idx in range(start+1, end):
-            newValue = round(Cl_start + (num*Cl_interval), CL_decimals)
-            operatingConditions["op_point"][idx] = newValue
-            num = num + 1
+        self.opPoints.distribute_betweenFixed([start, end], CL_decimals)
 
 
     # distributes main-oppoints
@@ -963,10 +874,7 @@ class inputFile:
         CL_pre_maxLift = targets["CL_pre_maxLift"][i]
         CD_pre_maxLift = targets["CD_pre_maxLift"][i]
 
-        # get operating-conditions
-        operatingConditions = self.values["operating_conditions"]
-        opPointNames = operatingConditions["name"]
-        opPoints = operatingConditions["op_point"]
+        opPointNames = self.opPoints.get_column('name')
 
         # get opPoint
         (opPoint_maxLift, self.idx_preClmax) = self.get_LastOpPoint()
@@ -1008,29 +916,27 @@ class inputFile:
 
         # set remaining target-values of main-op-points
         # target-value of CL_pre_maxLift will be set later
-        self.change_TargetValue(operatingConditions["name"][0], CD_min)
+        self.change_TargetValue(opPointNames[0], CD_min)
         self.change_TargetValue(opPoint_maxGlide, CD_maxGlide)
         self.change_TargetValue(opPoint_preMaxSpeed, CD_preMaxSpeed)
         self.change_TargetValue(opPoint_maxSpeed, CD_maxSpeed)
 
         # change names
-        opPointNames[self.idx_preClmax] = 'preClmax'
-        opPointNames[self.idx_maxGlide] = 'maxGlide'
-        opPointNames[self.idx_preMaxSpeed] = 'preMaxSpeed'
-        opPointNames[self.idx_maxSpeed] = 'maxSpeed'
+        self.opPoints.set_value('name', self.idx_preClmax, 'preClmax')
+        self.opPoints.set_value('name', self.idx_maxGlide, 'maxGlide')
+        self.opPoints.set_value('name', self.idx_preMaxSpeed, 'preMaxSpeed')
+        self.opPoints.set_value('name', self.idx_maxSpeed, 'maxSpeed')
 
         # always insert CL0 as new oppoint
         weighting = self.get_weighting(CL0)
-        self.idx_CL0 = self.insert_OpPoint('CL0', 'spec-cl', CL0, 'target-drag',
-                                           CD0, weighting, None)
-        # correct idx of main op-points
-        if (self.idx_CL0 <= self.idx_maxSpeed):
-            self.idx_maxSpeed = self.idx_maxSpeed + 1
-            self.idx_preMaxSpeed = self.idx_preMaxSpeed + 1
-            self.idx_maxGlide = self.idx_maxGlide + 1
-            self.idx_preClmax = self.idx_preClmax + 1
-        else:
-            # check order of idx-values. idx of CL0 must not be > idx maxSpeed !
+        idx = self.insert_OpPoint('CL0', 'spec-cl', CL0, 'target-drag',
+                                  CD0, weighting, None)
+
+        # get idx of main op-points
+        self.update_FixedOpPointIndices()
+
+        # check order of idx-values. idx of CL0 must not be > idx maxSpeed !
+        if (idx == None) or (self.idx_CL0 > self.idx_maxSpeed):
             ErrorMsg("idx_CL0 > idx_maxSpeed")
             Exit(-1)
 
@@ -1042,9 +948,6 @@ class inputFile:
 
     # Distribute all intermediate-oppoints
     def distribute_IntermediateOpPoints(self):
-        # get operating-conditions
-        operatingConditions = self.values["operating_conditions"]
-
         # first generate a index (!) list of all fixed op-points
         fixed_opPoints = []
         fixed_opPoints.append(self.idx_CL0)
@@ -1054,24 +957,49 @@ class inputFile:
         fixed_opPoints.append(self.idx_preClmax)
 
         # append the index-values of additional op-points (defined by the user)
-        # to the list of fixed op-points. After this the list of indices may be
-        # unsorted.
-        for idx in self.idx_additionalOpPoints:
-            fixed_opPoints.append(idx)
-
-        # now sort the list again
-        fixed_opPoints.sort()
-        #my_print (fixed_opPoints) Debug
+        # to the list of fixed op-points.
+        fixed_opPoints.extend(self.idx_additionalOpPoints)
 
         # now distribute the intermediate opPoints between the fixed opPoints
-        # equally. Therefore set up an interval from one fixed op-point to the
-        # next one. Every intermediate op-point between "start" and "end"
+        # equally. Every intermediate op-point between two fixed op-points
         # will get the same distance to the op-point before and the op-point
         # afterwards.
-        for idx in range(len(fixed_opPoints)-1):
-            start = fixed_opPoints[idx]
-            end = fixed_opPoints[idx+1]
-            self.distribute_OpPointsEqually(start, end)
+        self.opPoints.distribute_betweenFixed(fixed_opPoints, CL_decimals)
+
+################################################################################
+#
+# targetTable class
+#
+################################################################################
+# names of all main target values, in the order they are stored in memory
+targetColumns = ('CL_min', 'CD_min', 'alpha_min', 'CL_maxSpeed', 'CD_maxSpeed',
+                 'alpha_maxSpeed', 'CL_preMaxSpeed', 'CD_preMaxSpeed',
+                 'alpha_preMaxSpeed', 'CL_maxGlide', 'CL_CD_maxGlide',
+                 'CD_maxGlide', 'alpha_maxGlide', 'CL_pre_maxLift',
+                 'CD_pre_maxLift', 'alpha_pre_maxLift', 'CL0', 'CD0', 'alpha0')
+
+
+# main target values of all airfoils, stored in one 2D-array with one row for
+# each airfoil and one column for each entry of targetColumns. A column is
+# accessed by its name, e.g. targets["CD_min"][airfoilIdx]. Missing values are
+# stored as NaN.
+class targetTable:
+    def __init__(self, numAirfoils=0):
+        self.data = np.full((numAirfoils, len(targetColumns)), np.nan)
+
+
+    def get_numAirfoils(self):
+        return self.data.shape[0]
+
+
+    # returns a column as a view, no copy is made
+    def __getitem__(self, name):
+        return self.data[:, targetColumns.index(name)]
+
+
+    def __setitem__(self, name, values):
+        self.data[:, targetColumns.index(name)] = values
+
 
 ################################################################################
 #
@@ -1095,9 +1023,17 @@ class strak_machineParams:
         self.CL_min = -0.1
         self.CL_preMaxSpeed = 0.2
         self.CL_merge = 0.05
+        self.CL_mergeFromFile = None
+        self.CL_mergeChanged = False
         self.maxReFactor = 15.0
         self.maxLiftDistance = 0.03
-        self.alpha_Resolution = 0.001
+        self.polarCacheDir = polar_cache.defaultCacheDir
+        self.polarCacheSize = polar_cache.defaultCacheSize
+        self.adaptiveSampling = False
+        self.polarPointBudget = polar_sampling.defaultPointBudget
+        self.polarReconstruction = False
+        self.reconstructionStep = polar_reconstruction.defaultCoarseStep
+        self.maxParallelWorkers = None
         self.optimizationPasses = 2
         self.activeTargetPolarIdx = 1
         self.scaleFactor = 1.0
@@ -1106,10 +1042,13 @@ class strak_machineParams:
         self.showTargetPolars = True
         self.adaptInitialPerturb = True
         self.smoothSeedfoil = True
+        self.inProcessSeedfoils = False
+        self.inProcessAssessment = False
         self.smoothStrakFoils = True
         self.showReferencePolars = True
         self.geoParams = None
         self.rootGeoParams = None
+        self.assessments = {}       # assessment results of this session
         self.additionalOpPoints = [0.014, 0.042]
         self.ReNumbers = []         # T2 Re numbers (ReSqrt(Cl)
         self.maxReNumbers = []      # T1 Re numbers
@@ -1123,27 +1062,7 @@ class strak_machineParams:
         self.inputFiles = []
         self.airfoilNames = []
         self.visibleFlags = [True, True, True, True, True, True, True, True, True, True, True, True]
-        self.targets ={
-                        "CL_min": [],
-                        "CD_min": [],
-                        "alpha_min": [],
-                        "CL_maxSpeed": [],
-                        "CD_maxSpeed": [],
-                        "alpha_maxSpeed": [],
-                        "CL_preMaxSpeed": [],
-                        "CD_preMaxSpeed": [],
-                        "alpha_preMaxSpeed": [],
-                        "CL_maxGlide": [],
-                        "CL_CD_maxGlide": [],
-                        "CD_maxGlide": [],
-                        "alpha_maxGlide": [],
-                        "CL_pre_maxLift": [],
-                        "CD_pre_maxLift": [],
-                        "alpha_pre_maxLift": [],
-                        "CL0": [],
-                        "CD0": [],
-                        "alpha0": [],
-                       }
+        self.targets = targetTable()
 
 
         # read json-dictionary from file containing necessary parameters
@@ -1251,6 +1170,20 @@ class strak_machineParams:
         return result
 
 
+    def write_CL_mergeToFile(self):
+        fileName = '..' + bs + self.fileName
+
+        # read actual fileContent of parameter file
+        fileContent = self.read_paramsFromFile(fileName)
+
+        # writeback CL_merge to file content
+        fileContent["CL_merge"] = self.CL_merge
+
+        # writeback parameter file
+        result = self.write_paramsToFile(fileName, fileContent)
+        return result
+
+
     def write_paramsToFile(self, fileName, fileContent):
         cwd = getcwd()# FIXME Debug
         try:
@@ -1421,9 +1354,43 @@ class strak_machineParams:
 
         self.NCrit = self.get_ParameterFromDict(fileContent, "NCrit", self.NCrit)
 
+        self.polarCacheDir = self.get_ParameterFromDict(fileContent, "polarCacheDir",
+                                                   self.polarCacheDir)
+
+        self.polarCacheSize = self.get_ParameterFromDict(fileContent, "polarCacheSizeMB",
+                                                   self.polarCacheSize)
+
+        self.adaptiveSampling = self.get_booleanParameterFromDict(fileContent,
+                                 "adaptiveSampling", self.adaptiveSampling)
+
+        self.polarPointBudget = self.get_ParameterFromDict(fileContent, "polarPointBudget",
+                                                   self.polarPointBudget)
+
+        self.polarReconstruction = self.get_booleanParameterFromDict(fileContent,
+                                 "polarReconstruction", self.polarReconstruction)
+
+        self.reconstructionStep = self.get_ParameterFromDict(fileContent, "reconstructionStep",
+                                                   self.reconstructionStep)
+
+        self.maxParallelWorkers = self.get_ParameterFromDict(fileContent, "maxParallelWorkers",
+                                                   self.maxParallelWorkers)
+
         self.smoothSeedfoil = self.get_booleanParameterFromDict(fileContent,
                                  "smoothSeedfoil", self.smoothSeedfoil)
 
+        self.inProcessSeedfoils = self.get_booleanParameterFromDict(fileContent,
+                                 "inProcessSeedfoils", self.inProcessSeedfoils)
+
+        # assess airfoils in-process instead of 'xfoil_worker -w check'. The
+        # in-process assessment regards smoothing as necessary if there is any
+        # curvature reversal, it does not check for spikes like the worker.
+        self.inProcessAssessment = self.get_booleanParameterFromDict(fileContent,
+                                 "inProcessAssessment", self.inProcessAssessment)
+
+        # CL_merge that was tuned in the GUI and saved, if any
+        self.CL_mergeFromFile = self.get_ParameterFromDict(fileContent,
+                                 "CL_merge", self.CL_mergeFromFile)
+
         self.smoothStrakFoils = self.get_booleanParameterFromDict(fileContent,
                                  "smoothStrakFoils", self.smoothStrakFoils)
 
@@ -1513,6 +1480,30 @@ class strak_machineParams:
         return self.rootGeoParams
 
 
+    # returns the assessment of the geometry of an airfoil. The result is kept
+    # for the whole session under the name of the airfoil and the modification
+    # time of the airfoil file, so the file is only read again if it was
+    # changed. Note that 'smoothingNecessary' of the in-process assessment
+    # only depends on the number of reversals, see
+    # airfoil_geometry.assess_airfoil().
+    def get_assessment(self, airfoilName):
+        fileName = airfoilName + '.dat'
+        mtime = path.getmtime(fileName)
+
+        if airfoilName in self.assessments:
+            (assessedMtime, assessment) = self.assessments[airfoilName]
+            if assessedMtime == mtime:
+                return assessment
+
+        if self.inProcessAssessment:
+            assessment = airfoil_geometry.assess_airfoil(fileName)
+        else:
+            assessment = self.assess_airfoilWithWorker(airfoilName)
+
+        self.assessments[airfoilName] = (mtime, assessment)
+        return assessment
+
+
     def generate_CoordsAndAssessFile(self, airfoilName):
         filepath = airfoilName +'_temp' + bs
         coordfilename = filepath + DesignCoordinatesName
@@ -1537,20 +1528,44 @@ class strak_machineParams:
         system(systemString)
 
 
-    def read_rootGeoParameters(self):
-        coordfilename = self.airfoilNames[0]+'_temp' + bs + DesignCoordinatesName
+    # assesses an airfoil with 'xfoil_worker -w check'. Returns the same
+    # values as airfoil_geometry.assess_airfoil(), the reversals are None if
+    # they could not be determined.
+    def assess_airfoilWithWorker(self, airfoilName):
+        filepath = airfoilName +'_temp' + bs
+        coordfilename = filepath + DesignCoordinatesName
+        assessfilename = filepath + AssessmentResultsName
 
         # generate the necessary files now
-        self.generate_CoordsAndAssessFile(self.airfoilNames[0])
+        self.generate_CoordsAndAssessFile(airfoilName)
 
-        # read design coordinates of root airfoil using the visualizer
+        # read design coordinates of the airfoil using the visualizer
         (x, y, maxt, xmaxt, maxc, xmaxc, ioerror, deriv2, deriv3, name) =\
-            visualizer.read_airfoil_coordinates(coordfilename, 'zone t="Seed airfoil', 0)
+            get_visualizer().read_airfoil_coordinates(coordfilename, 'zone t="Seed airfoil', 0)
+
+        with open(assessfilename) as file:
+            lines = file.readlines()
+
+        (reversals_top, reversals_bot, smoothingNecessary) =\
+                                         parse_assessmentResults(lines)
+
+        return {"thickness": maxt*100,
+                "thicknessPosition": xmaxt*100,
+                "camber": maxc*100,
+                "camberPosition": xmaxc*100,
+                "reversals_top": reversals_top,
+                "reversals_bot": reversals_bot,
+                "smoothingNecessary": smoothingNecessary}
+
 
-        thick_ref    = round( maxt*100, thick_decimals)
-        thickPos_ref = round(xmaxt*100, thick_decimals)
-        camb_ref     = round( maxc*100, camb_decimals)
-        cambPos_ref  = round(xmaxc*100, camb_decimals)
+    def read_rootGeoParameters(self):
+        # assess geometry of the root airfoil
+        assessment = self.get_assessment(self.airfoilNames[0])
+
+        thick_ref    = round(assessment["thickness"], thick_decimals)
+        thickPos_ref = round(assessment["thicknessPosition"], thick_decimals)
+        camb_ref     = round(assessment["camber"], camb_decimals)
+        cambPos_ref  = round(assessment["camberPosition"], camb_decimals)
 
         self.rootGeoParams = (thick_ref, thickPos_ref, camb_ref, cambPos_ref)
 
@@ -1610,40 +1625,18 @@ class strak_machineParams:
 
     def read_AssessmentData(self, airfoilName):
         NoteMsg ("reading assessment data of airfoil %s" % airfoilName)
-        reversals = []
-        smoothingNecessary = True
-        filepath = airfoilName+'_temp' + bs
-        assessfilename = filepath + AssessmentResultsName
 
-        if exists(assessfilename):
-            file = open(assessfilename)
-            lines = file.readlines()
-            file.close()
-        else:
+        try:
+            assessment = self.get_assessment(airfoilName)
+        except (IOError, ValueError):
             ErrorMsg("unable to read assessment data of airfoil %s"  % airfoilName)
-            return (0, 0, smoothingNecessary)
+            return (0, 0, True)
 
-        for line in lines:
-            if line.find('perfect surface quality')>=0:
-                smoothingNecessary = False
-            elif line.find('Reversals')>=0:
-                splitlines = line.split('Reversals')
-                reversalString = splitlines[1]
-                splitlines = reversalString.split('Curvature ')
-                reversalString = splitlines[0].strip()
-                value = int(reversalString)
-                reversals.append(value)
-
-        # check how many reversal values were found (with or withou smoothing)
-        if (len(reversals) == 2):
-            # airfoil not smoothed
-            reversals_top = reversals[0]
-            reversals_bot = reversals[1]
-        elif (len(reversals) == 4):
-            # airfoil smoothed
-            reversals_top = reversals[1]
-            reversals_bot = reversals[3]
-        else:
+        reversals_top = assessment["reversals_top"]
+        reversals_bot = assessment["reversals_bot"]
+        smoothingNecessary = assessment["smoothingNecessary"]
+
+        if (reversals_top == None) or (reversals_bot == None):
             ErrorMsg("number of reversals could not be determined")
             return (0, 0, smoothingNecessary)
 
@@ -1664,15 +1657,17 @@ class strak_machineParams:
         fileNameAndPath = ressourcesPath + bs + filename
 
         # read namelist form file
-        dictData = f90nml.read(fileNameAndPath)
+        dictData = read_TemplateFile(fileNameAndPath)
 
         # change ncrit in namelist / dictionary
         xfoil_run_options = dictData["xfoil_run_options"]
         xfoil_run_options['ncrit'] = NCrit
 
-        # delete file and writeback namelist
+        # delete file and writeback namelist, the template has to be parsed
+        # again
         remove(fileNameAndPath)
         f90nml.write(dictData, fileNameAndPath)
+        templateCache.pop(fileNameAndPath, None)
 
 
     ############################################################################
@@ -1692,6 +1687,13 @@ class strak_machineParams:
         pythonCallString = pythonInterpreterName + ' ..' + bs + scriptPath + bs
 
         self.xfoilWorkerCall = exeCallString + xfoilWorkerName + '.exe'
+
+        # the polar worker and the job graph run each XFOIL-worker and
+        # Xoptfoil in its own directory inside the build folder, one level
+        # deeper
+        jobExeCallString = "echo y | .." + bs + ".." + bs + exePath + bs
+        self.xfoilWorkerJobCall = jobExeCallString + xfoilWorkerName + '.exe'
+        self.xoptfoilJobCall = jobExeCallString + xoptfoilName + '.exe'
         self.firstXoptfoilCall = firstExeCallString + xoptfoilName + '.exe'
         self.xoptfoilCall = exeCallString + xoptfoilName + '.exe'
         self.strakMachineCall = pythonCallString + strakMachineName + '.py'
@@ -1708,8 +1710,12 @@ class strak_machineParams:
             ReMax = int(round(Re * self.maxReFactor, 0))
             self.maxReNumbers.append(ReMax)
 
-        # calculate Cl where T1 and T2 polars will be merged
-        self.CL_merge =\
+        # calculate Cl where T1 and T2 polars will be merged, if it was not
+        # tuned in the GUI
+        if self.CL_mergeFromFile != None:
+            self.CL_merge = self.CL_mergeFromFile
+        else:
+            self.CL_merge =\
                    ((self.ReNumbers[0] * self.ReNumbers[0]))/\
                    ((self.maxReNumbers[0])*(self.maxReNumbers[0]))
 
@@ -1722,95 +1728,21 @@ class strak_machineParams:
 
     def clear_MainTargetValues(self):
         # clear all the targets
-        self.targets["CL_min"].clear()
-        self.targets["CD_min"].clear()
-        self.targets["alpha_min"].clear()
-        self.targets["CL_maxSpeed"].clear()
-        self.targets["CD_maxSpeed"].clear()
-        self.targets["alpha_maxSpeed"].clear()
-        self.targets["CL_preMaxSpeed"].clear()
-        self.targets["CD_preMaxSpeed"].clear()
-        self.targets["alpha_preMaxSpeed"].clear()
-        self.targets["CL_maxGlide"].clear()
-        self.targets["CD_maxGlide"].clear()
-        self.targets["CL_CD_maxGlide"].clear()
-        self.targets["alpha_maxGlide"].clear()
-        self.targets["CL_pre_maxLift"].clear()
-        self.targets["CD_pre_maxLift"].clear()
-        self.targets["alpha_pre_maxLift"].clear()
-        self.targets["CL0"].clear()
-        self.targets["CD0"].clear()
-        self.targets["alpha0"].clear()
+        self.targets = targetTable()
 
 
+    # calculates the target values of the main op-points for all airfoils in
+    # one step, from the polar of the root airfoil and the polars of the
+    # seedfoils
     def calculate_MainTargetValues(self):
         # get root-polar
         rootPolar = self.merged_polars[0]
         num = len(self.ReNumbers)
 
-        # clear all targets
-        self.clear_MainTargetValues()
-
-        for idx in range(num):
-            if (idx == 0):
-                polar = self.merged_polars[idx]
-            else:
-                polar = self.seedfoil_polars[idx-1]
-
-            #---------------------- CL_min-targets ----------------------------
-            target_alpha_min = rootPolar.alpha[rootPolar.min_idx]
-            polar_CD_min = polar.find_CD_From_alpha(target_alpha_min)
-
-            # append the targets
-            self.targets["CL_min"].append(rootPolar.CL_min)
-            self.targets["CD_min"].append(polar_CD_min)
-            self.targets["alpha_min"].append(target_alpha_min)
-
-            #---------------------- maxSpeed-targets --------------------------
-            target_CL_maxSpeed = rootPolar.CL_maxSpeed
-            maxSpeedIdx = polar.find_index_From_CL(target_CL_maxSpeed)
-
-            # append the targets
-            self.targets["CL_maxSpeed"].append(target_CL_maxSpeed)
-            self.targets["CD_maxSpeed"].append(polar.CD[maxSpeedIdx])
-            self.targets["alpha_maxSpeed"].append(polar.alpha[maxSpeedIdx])
-
-           #---------------------- preMaxSpeed-targets --------------------------
-            # append the targets
-            self.targets["CL_preMaxSpeed"].append(rootPolar.CL_preMaxSpeed)
-            self.targets["CD_preMaxSpeed"].append(polar.CD_preMaxSpeed)
-            self.targets["alpha_preMaxSpeed"].append(rootPolar.alpha[rootPolar.preMaxSpeed_idx])
-
-            #---------------------- maxGlide-targets --------------------------
-            target_CL_maxGlide = rootPolar.CL_maxGlide
-            target_alpha_maxGlide = rootPolar.alpha[rootPolar.maxGlide_idx]
-            polar_CD_maxGlide = polar.find_CD_From_alpha(target_alpha_maxGlide)
-
-            # append the targets
-            self.targets["CL_maxGlide"].append(target_CL_maxGlide)
-            self.targets["CD_maxGlide"].append(polar_CD_maxGlide)
-            self.targets["CL_CD_maxGlide"].append(target_CL_maxGlide/polar_CD_maxGlide)
-            self.targets["alpha_maxGlide"].append(target_alpha_maxGlide)
-
-            #---------------------- maxLift-targets --------------------------
-            target_alpha_pre_maxLift = rootPolar.alpha[polar.pre_maxLift_idx]
-            rootPolar_CD_pre_maxLift = rootPolar.find_CD_From_alpha(target_alpha_pre_maxLift)
-
-            # append the targets
-            self.targets["CL_pre_maxLift"].append(polar.CL_pre_maxLift)
-            self.targets["CD_pre_maxLift"].append(polar.CD_pre_maxLift)
-            self.targets["alpha_pre_maxLift"].append(target_alpha_pre_maxLift)
-
-            #---------------------- CL0-targets ----------------------------
-            target_CL0 = 0.0001
-            polar_CD0 = polar.find_CD_From_alpha(rootPolar.alpha_CL0)
-
-            # append the targets
-            self.targets["CL0"].append(target_CL0)
-            self.targets["CD0"].append(polar_CD0)
-            self.targets["alpha0"].append(rootPolar.alpha_CL0)
-
-            idx = idx + 1
+        # polar of the root airfoil for the first airfoil, polars of the
+        # seedfoils for all others
+        polars = [rootPolar] + self.seedfoil_polars[0:(num-1)]
+        self.targets = calculate_targetValues(rootPolar, polars, self)
 
 
     def correctOpPoint_left(self, opPoint, CL_maxSpeed_root,
@@ -2453,7 +2385,66 @@ class polarGraph:
 # polarData class
 #
 ################################################################################
+# names of all columns of a polar, in the order they are stored in memory
+polarColumns = ('alpha', 'CL', 'CD', 'CL_CD', 'CDp', 'Cm', 'Top_Xtr', 'Bot_Xtr')
+
+
+# returns the datapoints of 'data' that are selected by 'indices'. If the
+# indices are contiguous, a view is returned and no copy is made
+def get_dataView(data, indices):
+    if (len(indices) > 0) and ((indices[-1] - indices[0] + 1) == len(indices)):
+        return data[:, indices[0]:(indices[-1]+1)]
+    return data[:, indices]
+
+
+# returns the switching-idx between T1 / T2-part of a merged polar: the first
+# datapoint with CL >= CL_merge. The T1-part is plotted up to and the T2-part
+# from this datapoint. If CL_merge is not reached, it is the last datapoint.
+def get_switchIdx(CL, CL_merge):
+    indices = np.flatnonzero(CL >= CL_merge)
+    if len(indices) > 0:
+        return int(indices[0])
+    return max(len(CL) - 1, 0)
+
+
+# returns a property that gives access to one column of a polar. The
+# property is a view on the respective row of polarData.data, no copy is made
+def polarColumn(columnIdx):
+    def get_column(self):
+        return self.data[columnIdx]
+
+    def set_column(self, values):
+        # number of values must match the number of datapoints of the polar
+        self.data[columnIdx] = values
+        self.lookupIndex = {}
+
+    return property(get_column, set_column)
+
+
 class polarData:
+    # all columns are views on one contiguous float64-array
+    alpha = polarColumn(0)
+    CL = polarColumn(1)
+    CD = polarColumn(2)
+    CL_CD = polarColumn(3)
+    CDp = polarColumn(4)
+    Cm = polarColumn(5)
+    Top_Xtr = polarColumn(6)
+    Bot_Xtr = polarColumn(7)
+
+    # names of all values that are determined by analyze(). The values at
+    # CL_min, preMaxSpeed and pre_maxLift are interpolated between the
+    # datapoints, their indices ('min_idx', 'preMaxSpeed_idx',
+    # 'pre_maxLift_idx') are the first datapoint with a CL >= the CL of the
+    # op-point, so the datapoint may lie slightly above the interpolated value.
+    analysisValues = ('CD_min', 'CL_min', 'alpha_min', 'min_idx',
+      'CD_maxSpeed', 'CL_maxSpeed', 'alpha_maxSpeed', 'CL_CD_maxSpeed',
+      'maxSpeed_idx', 'CD_preMaxSpeed', 'CL_preMaxSpeed', 'alpha_preMaxSpeed',
+      'CL_CD_preMaxSpeed', 'preMaxSpeed_idx', 'CL_CD_maxGlide', 'maxGlide_idx',
+      'alpha_maxGlide', 'CL_maxGlide', 'CD_maxGlide', 'CL_maxLift', 'CD_maxLift',
+      'alpha_maxLift', 'alpha_CL0', 'CD_CL0', 'maxLift_idx', 'CL_pre_maxLift',
+      'CD_pre_maxLift', 'pre_maxLift_idx', 'alpha_pre_maxLift')
+
     def __init__(self):
         self.polarName = ''
         self.airfoilname = "airfoil"
@@ -2462,14 +2453,10 @@ class polarData:
         self.maxRe = 0
         self.NCrit = NCrit_Default
         self.Mach = 0.0
-        self.alpha = []
-        self.CL = []
-        self.CD = []
-        self.CL_CD = []
-        self.CDp = []
-        self.Cm = []
-        self.Top_Xtr = []
-        self.Bot_Xtr= []
+        self.columnData = np.zeros((len(polarColumns), 0))
+        self.lookupIndex = {}
+        self.mergeSources = None
+        self.mergeParts = None
         self.CD_min = 0.0
         self.CL_min = 0.0
         self.alpha_min = 0.0
@@ -2513,80 +2500,71 @@ class polarData:
         return (self.alpha[self.T2_T1_switchIdx])
 
 
+    # returns all columns of the polar as one 2D-array. A polar that was
+    # merged without copying keeps views on the data of the two source polars
+    # until the data is accessed for the first time
+    def get_data(self):
+        if self.mergeParts != None:
+            self.set_data(np.concatenate(self.mergeParts, axis=1))
+        return self.columnData
+
+    data = property(get_data)
+
+
+    # returns the data of the polar in parts, without copying. A merged polar
+    # that was not accessed yet consists of a T1- and a T2-part, all other
+    # polars consist of one part.
+    def get_dataParts(self):
+        if self.mergeParts != None:
+            return self.mergeParts
+        return (self.columnData,)
+
+
+    # returns the number of datapoints of the polar
+    def get_numDataPoints(self):
+        return sum(part.shape[1] for part in self.get_dataParts())
+
+
+    # sets all columns of the polar at once. 'data' is a 2D-array with one row
+    # for each entry of polarColumns
+    def set_data(self, data):
+        data = np.ascontiguousarray(data, dtype=np.float64)
+
+        if (data.ndim != 2) or (data.shape[0] != len(polarColumns)):
+            ErrorMsg("set_data: expected %d columns of polar data" % len(polarColumns))
+            return
+
+        self.columnData = data
+        self.mergeParts = None
+        self.lookupIndex = {}
+
+
+    # sets all columns of the polar from a list of rows, each row containing
+    # one value for each entry of polarColumns
+    def set_dataFromRows(self, rows):
+        if len(rows) == 0:
+            self.set_data(np.zeros((len(polarColumns), 0)))
+        else:
+            self.set_data(np.array(rows, dtype=np.float64).T)
+
+
     def import_FromFile(self, fileName):
-        BeginOfDataSectionTag = "-------"
-        airfoilNameTag = "Calculated polar for:"
-        ReTag = "Re ="
-        parseInDataPoints = 0
         InfoMsg("importing polar %s..." %fileName)
 
-        # open file
-        fileHandle = open(fileName)
-
-        # parse all lines
-        for line in fileHandle:
-
-            # scan for airfoil-name
-            if  line.find(airfoilNameTag) >= 0:
-                splitline = line.split(airfoilNameTag)
-                self.airfoilname = splitline[1]
-                self.airfoilname = self.airfoilname.strip()
-
-           # scan for Re-Number
-            if  line.find(ReTag) >= 0:
-                splitline = line.split(ReTag)
-                splitline = splitline[1].split("Ncrit")
-                Re_string = splitline[0].strip()
-                splitstring = Re_string.split("e")
-                faktor = float(splitstring[0].strip())
-                Exponent = float(splitstring[1].strip())
-                self.Re = faktor * (10**Exponent)
-                self.airfoilname = self.airfoilname.strip()
-
-            # scan for start of data-section
-            if line.find(BeginOfDataSectionTag) >= 0:
-                parseInDataPoints = 1
-            else:
-                # get all Data-points from this line
-                if parseInDataPoints == 1:
-                    # split up line detecting white-spaces
-                    splittedLine = line.split(" ")
-                    # remove white-space-elements, build up list of data-points
-                    dataPoints = []
-                    for element in splittedLine:
-                        if element != '':
-                            dataPoints.append(element)
-                    # get data points
-                    alpha = (float(dataPoints[0]))
-                    CL = float(dataPoints[1])
-                    CD = float(dataPoints[2])
-                    CDp = float(dataPoints[3])
-                    Cm = float(dataPoints[4])
-                    Top_Xtr = float(dataPoints[5])
-                    Bot_Xtr = float(dataPoints[6])
-
-                    # determine index where to insert new data points
-                    idx = 0
-                    for element in self.alpha:
-                        if alpha < element:
-                            break
-                        else:
-                            idx = idx + 1
-
-                    self.alpha.insert(idx, alpha)
-                    self.CL.insert(idx, CL)
-                    self.CD.insert(idx, CD)
-                    self.CL_CD.insert(idx, CL/CD)
-                    self.CDp.insert(idx, CDp)
-                    self.Cm.insert(idx, Cm)
-                    self.Top_Xtr.insert(idx, Top_Xtr)
-                    self.Bot_Xtr.insert(idx, Bot_Xtr)
-
-        fileHandle.close()
+        # read header and all datapoints, sorted by alpha
+        (header, fileData) = polar_file.read_polarFile(fileName)
 
+        if header["airfoilname"] != "":
+            self.airfoilname = header["airfoilname"]
+        self.Re = header["Re"]
 
-    # write polar to file with a given filename (and -path)
-    def write_ToFile(self, fileName):
+        # build up the columns of the polar, CL_CD is not part of the file
+        (alpha, CL, CD, CDp, Cm, Top_Xtr, Bot_Xtr) = fileData[:, 0:7].T
+        self.set_data((alpha, CL, CD, CL/CD, CDp, Cm, Top_Xtr, Bot_Xtr))
+
+
+    # returns the contents of a polar file
+    def get_FileText(self):
         # get some local variables
         polarType = self.polarType
         airfoilname = self.airfoilname
@@ -2604,10 +2582,7 @@ class polarData:
             ReString = 'fixed / ~ 1/sqrt(CL)'
             MachString = 'fixed / ~ 1/sqrt(CL)'
 
-        InfoMsg("writing polar to file %s..." %fileName)
-
-        # open file
-        fileHandle = open(fileName, 'w+')
+        fileHandle = StringIO()
 
         # write header
         fileHandle.write("Xoptfoil-JX\n\n")
@@ -2622,33 +2597,41 @@ class polarData:
         fileHandle.write("  alpha     CL        CD       CDp       Cm    Top Xtr Bot Xtr \n")
         fileHandle.write(" ------- -------- --------- --------- -------- ------- ------- \n")
 
-        # more local variables
-        alpha = self.alpha
-        CL = self.CL
-        CD = self.CD
-        CDp = self.CDp
-        Cm = self.Cm
-        Top_Xtr = self.Top_Xtr
-        Bot_Xtr = self.Bot_Xtr
+        # write data, all columns except CL_CD. The parts of a merged polar
+        # are written one after another, so there is no need to copy them
+        fileColumns = [polarColumns.index(name) for name in polar_file.fileColumns]
+        for part in self.get_dataParts():
+            np.savetxt(fileHandle, part[fileColumns].T,
+                       fmt=" %7.3f %8.4f %9.5f %9.5f %8.4f %7.4f %7.4f")
 
-        # write data
-        for i in range(len(alpha)):
-            fileHandle.write(" %7.3f %8.4f %9.5f %9.5f %8.4f %7.4f %7.4f\n"\
-            % (alpha[i], CL[i], CD[i], CDp[i], Cm[i], Top_Xtr[i], Bot_Xtr[i]))
+        return fileHandle.getvalue()
+
+
+    # write polar to file with a given filename (and -path)
+    def write_ToFile(self, fileName):
+        InfoMsg("writing polar to file %s..." %fileName)
 
-        fileHandle.close()
+        with open(fileName, 'w+') as fileHandle:
+            fileHandle.write(self.get_FileText())
 
 
     # analyses a polar
     def analyze(self, params):
-        InfoMsg("analysing polar \'%s\'..." % self.polarName)
+        analyze_polars([self], params)
+
+
+    # returns all values that were determined by analyze() as a dictionary
+    def get_analysis(self):
+        analysis = {}
+        for name in self.analysisValues:
+            analysis[name] = getattr(self, name)
+        return analysis
+
 
-        maxGlideIdx = self.determine_MaxGlide()
-        self.determine_MaxSpeed(maxGlideIdx)
-        self.determine_CLmin(params)
-        self.determine_preMaxSpeed(params)
-        self.determine_MaxLift(params)
-        self.determine_alpha_CL0(params)
+    # restores all values that were determined by analyze() from a dictionary
+    def set_analysis(self, analysis):
+        for name in self.analysisValues:
+            setattr(self, name, analysis[name])
 
 
     # this function must be called after reading a merged polar from file
@@ -2657,15 +2640,17 @@ class polarData:
         self.maxRe = maxRe
         self.polarName = 'merged_polar_%s' % get_ReString(self.Re)
 
-        for idx in range(len(self.CL)):
-            if (self.CL[idx] <= CL_merge):
-                self.T2_T1_switchIdx = idx
+        self.T2_T1_switchIdx = get_switchIdx(self.CL, CL_merge)
 
     # merge two polars at a certain CL-value, return a merged-polar
     # mergePolar_1 will be the "lower" part of the merged-polar from
     # minimum CL up to the CL-value where the merge happens.
-    # "self" will be the upper part of the merged-polar
-    def merge(self, mergePolar_1, CL_merge, maxRe):
+    # "self" will be the upper part of the merged-polar.
+    # If 'copy' is False, the merged polar keeps views on the data of both
+    # polars, the data will be copied when it is accessed for the first time.
+    # If 'keepSources' is True, the merged polar keeps both polars, so it can
+    # be merged again at a different CL-value with remerge().
+    def merge(self, mergePolar_1, CL_merge, maxRe, copy=True, keepSources=False):
         # create a new, empty polar
         mergedPolar = polarData()
 
@@ -2674,329 +2659,534 @@ class polarData:
         mergedPolar.polarType = 12
         mergedPolar.Re = self.Re
         mergedPolar.NCrit = 1.0
-        mergedPolar.CL_merge = CL_merge
         mergedPolar.maxRe = maxRe
         mergedPolar.polarName = 'merged_polar_%s' % get_ReString(self.Re)
 
-        # merge first polar from start Cl to CL_merge
-        for idx in range(len(mergePolar_1.CL)):
-            if (mergePolar_1.CL[idx] <= CL_merge):
-                mergedPolar.alpha.append(mergePolar_1.alpha[idx])
-                mergedPolar.CL.append(mergePolar_1.CL[idx])
-                mergedPolar.CD.append(mergePolar_1.CD[idx])
-                mergedPolar.CL_CD.append(mergePolar_1.CL_CD[idx])
-                mergedPolar.CDp.append(mergePolar_1.CDp[idx])
-                mergedPolar.Cm.append(mergePolar_1.Cm[idx])
-                mergedPolar.Top_Xtr.append(mergePolar_1.Top_Xtr[idx])
-                mergedPolar.Bot_Xtr.append(mergePolar_1.Bot_Xtr[idx])
-                mergedPolar.T2_T1_switchIdx = idx
+        mergedPolar.set_mergeSources(mergePolar_1, self)
+        mergedPolar.remerge(CL_merge, copy)
 
-        # merge second polar from switching_Cl to end Cl
-        for idx in range(len(self.CL)):
-            if (self.CL[idx] > CL_merge):
-                mergedPolar.alpha.append(self.alpha[idx])
-                mergedPolar.CL.append(self.CL[idx])
-                mergedPolar.CD.append(self.CD[idx])
-                mergedPolar.CL_CD.append(self.CL_CD[idx])
-                mergedPolar.CDp.append(self.CDp[idx])
-                mergedPolar.Cm.append(self.Cm[idx])
-                mergedPolar.Top_Xtr.append(self.Top_Xtr[idx])
-                mergedPolar.Bot_Xtr.append(self.Bot_Xtr[idx])
+        if not keepSources:
+            mergedPolar.release_mergeSources()
 
         DoneMsg()
         return mergedPolar
 
 
-    def set_alphaResolution(self, newResolution):
-        # create empty lists
-        new_alpha =[]
-        new_CL = []
-        new_CD = []
-        new_CL_CD = []
-        new_CDp = []
-        new_Cm = []
-        new_Top_Xtr = []
-        new_Bot_Xtr = []
-
-        # determine actual resoultion of alpha
-        actualResolution = round((self.alpha[1] - self.alpha[0]), 10)
-        if (actualResolution < 0.0):
-            ErrorMsg("set_alphaResolution: negative value was determinded for actual resolution")
-            return
+    # sets the polars a merged polar is merged from, e.g. when it was imported
+    # from file and shall be merged again
+    def set_mergeSources(self, polar_T1, polar_T2):
+        self.mergeSources = (polar_T1, polar_T2)
+
 
-        # number of increments must be an integer
-        num_increments = int(round(actualResolution / newResolution, 0))
+    # releases the polars a merged polar was merged from. Views on their
+    # data are kept until the data is copied.
+    def release_mergeSources(self):
+        self.mergeSources = None
 
-        # check number of increments, must be > 1
-        if (num_increments <= 1):
-            # Error-message and return
-            NoteMsg("set_alphaResolution: newResolution is less than or equal actual resolution")
-            NoteMsg("actual resolution: %f, new resolution: %f" % (actualResolution, newResolution) )
+
+    # merges the source polars of a merged polar again at a new CL-value
+    def remerge(self, CL_merge, copy=True):
+        if self.mergeSources == None:
+            ErrorMsg("remerge: polar %s has no source polars" % self.polarName)
             return
 
-        # determine size of an increment
-        increment = actualResolution / float(num_increments)
-
-        # loop over all list elements
-        num_values = len(self.alpha)
-        for i in range(num_values - 1):
-            alpha_left = self.alpha[i]
-            alpha_right = self.alpha[i+1]
-
-            for n in range(num_increments):
-                # calculate new values using linear interpolation
-                alpha = round((alpha_left + n*increment), 10)
-                CL = interpolate(alpha_left, alpha_right, self.CL[i], self.CL[i+1], alpha)
-                CD = interpolate(alpha_left, alpha_right, self.CD[i], self.CD[i+1], alpha)
-                CL_CD = interpolate(alpha_left, alpha_right, self.CL_CD[i], self.CL_CD[i+1], alpha)
-                CDp = interpolate(alpha_left, alpha_right, self.CDp[i], self.CDp[i+1], alpha)
-                Cm = interpolate(alpha_left, alpha_right, self.Cm[i], self.Cm[i+1], alpha)
-                Top_Xtr = interpolate(alpha_left, alpha_right, self.Top_Xtr[i], self.Top_Xtr[i+1], alpha)
-                Bot_Xtr = interpolate(alpha_left, alpha_right, self.Bot_Xtr[i], self.Bot_Xtr[i+1], alpha)
-
-                new_alpha.append(alpha)
-                new_CL.append(CL)
-                new_CD.append(CD)
-                new_CL_CD.append(CL_CD)
-                new_CDp.append(CDp)
-                new_Cm.append(Cm)
-                new_Top_Xtr.append(Top_Xtr)
-                new_Bot_Xtr.append(Bot_Xtr)
-
-        # append last values
-        new_alpha.append(self.alpha[num_values-1])
-        new_CL.append(self.CL[num_values-1])
-        new_CD.append(self.CD[num_values-1])
-        new_CL_CD.append(self.CL_CD[num_values-1])
-        new_CDp.append(self.CDp[num_values-1])
-        new_Cm.append(self.Cm[num_values-1])
-        new_Top_Xtr.append(self.Top_Xtr[num_values-1])
-        new_Bot_Xtr.append(self.Bot_Xtr[num_values-1])
-
-        # now set new values/ overwrite old values
-        self.alpha = new_alpha
-        self.CL = new_CL
-        self.CD = new_CD
-        self.CL_CD = new_CL_CD
-        self.CDp = new_CDp
-        self.Cm = new_Cm
-        self.Top_Xtr = new_Top_Xtr
-        self.Bot_Xtr = new_Bot_Xtr
-
-        # correct the switching-idx between T1 / T2-polar
-        self.T2_T1_switchIdx = self.find_index_From_CL(self.CL_merge)
-        #my_print("Ready")#Debug
-
-
-    # determines the first minimum CD-value of a given polar, starting at
-    # the point of highest lift coefficent, descending
-    def determine_MaxSpeed(self, startIdx):
-        # initialize minimum
-        minimum = self.CD[startIdx]
-        num = startIdx-1
-
-        # find the first minimum CD starting from the highest lift coefficient
-        for idx in reversed(range(num)):
-            value = self.CD[idx]
-            if (value < minimum):
-                # found new minimum
-                minimum = value
-            elif (value > minimum):
-                # CD starts incresing again, so we have found the first minimum
-                break
-
-        self.CD_maxSpeed = minimum
-        self.maxSpeed_idx = idx
-        self.CL_maxSpeed = self.CL[self.maxSpeed_idx]
-        self.alpha_maxSpeed = self.alpha[self.maxSpeed_idx]
-        self.CL_CD_maxSpeed = self.CL_maxSpeed / self.CD_maxSpeed
-        return self.maxSpeed_idx
-
-        #my_print("max Speed, CD = %f @ CL = %f" %\
-        #                         (self.CD_maxSpeed, self.CL_maxSpeed))
-
-
-    def determine_preMaxSpeed(self, params):
-        self.CL_preMaxSpeed = params.CL_preMaxSpeed
-        self.preMaxSpeed_idx = self.find_index_From_CL(self.CL_preMaxSpeed)
-        self.CD_preMaxSpeed = self.CD[self.preMaxSpeed_idx]
-        self.alpha_preMaxSpeed = self.alpha[self.preMaxSpeed_idx]
-        self.CL_CD_preMaxSpeed = self.CL_preMaxSpeed / self.CD_preMaxSpeed
-        return self.preMaxSpeed_idx
-
-
-    # determines the overall max-value for Cl/Cd (max glide) of a given polar
-    # and some corresponding values
-    def determine_MaxGlide(self):
-        self.CL_CD_maxGlide = max(self.CL_CD)
-        self.maxGlide_idx = self.find_index_From_CL_CD(self.CL_CD_maxGlide)
-        self.CL_maxGlide = self.CL[self.maxGlide_idx]
-        self.CD_maxGlide = self.CD[self.maxGlide_idx]
-        self.alpha_maxGlide = self.alpha[self.maxGlide_idx]
-        return self.maxGlide_idx
-
-        #my_print("max Glide, CL/CD = %f @ CL = %f" %
-        #                          (self.CL_CD_maxGlide, self.CL_maxGlide))
-
-    def determine_CLmin(self, params):
-        self.CL_min = params.CL_min
-        self.min_idx = self.find_index_From_CL(params.CL_min)
-        self.CD_min = self.CD[self.min_idx]#self.find_CD_From_CL(params.CL_min)
-        self.alpha_min = self.alpha[self.min_idx]
-        return self.min_idx
-
-
-    # determines the max-value for Cl (max lift) of a given polar and some
-    # corresponding values
-    def determine_MaxLift(self, params):
-        self.CL_maxLift = max(self.CL)
-        self.maxLift_idx = self.find_index_From_CL(self.CL_maxLift)
-        self.CD_maxLift = self.CD[self.maxLift_idx]
-        self.alpha_maxLift = self.alpha[self.maxLift_idx]
+        (polar_T1, polar_T2) = self.mergeSources
+        self.CL_merge = CL_merge
 
-        # also calculate opPoint before maxLift that can be reached by the
-        # optimizer
-        self.CL_pre_maxLift = self.CL_maxLift - params.maxLiftDistance
-        self.pre_maxLift_idx = self.find_index_From_CL(self.CL_pre_maxLift)
-        self.CD_pre_maxLift = self.CD[self.pre_maxLift_idx]
-        self.alpha_pre_maxLift = self.alpha[self.pre_maxLift_idx]
-        return self.maxLift_idx
-
-        #my_print("max Lift, CL = %f @ alpha = %f" %
-        #                          (self.CL_maxLift, self.alpha_maxLift))
-        #my_print("last op-point before max Lift will be set to CL = %f @ alpha"\
-        #      " = %f, keeping a CL-distance of %f" %\
-        #  (self.CL_pre_maxLift, self.alpha_pre_maxLift, params.maxLiftDistance))
-
-    # determines alpha @ CL = 0
-    def determine_alpha_CL0(self, params):
-        num = len(self.alpha)
-
-        for idx in range(num-1):
-            # find CL-values left and right from CL = 0
-            if (self.CL[idx]<=0 and self.CL[idx+1]>=0):
-                # interpolate between CL-values, calculate alpha @CL = 0
-                self.alpha_CL0 = interpolate(self.CL[idx], self.CL[idx+1],\
-                                      self.alpha[idx], self.alpha[idx+1], 0)
-
-        # also determine CD @ CL = 0
-        self.CD_CL0 = self.find_CD_From_CL(0.0)
-
-        #my_print("alpha_CL0 = %f" % self.alpha_CL0)
-
-    # local helper-functions
+        # merge first polar from start Cl to CL_merge
+        T1_indices = np.flatnonzero(polar_T1.CL <= CL_merge)
+
+        # merge second polar from switching_Cl to end Cl
+        T2_indices = np.flatnonzero(polar_T2.CL > CL_merge)
+
+        mergeParts = (get_dataView(polar_T1.data, T1_indices),
+                      get_dataView(polar_T2.data, T2_indices))
+
+        # only the CL-rows of both parts are needed to find the switching-idx
+        CL_idx = polarColumns.index('CL')
+        self.T2_T1_switchIdx = get_switchIdx(np.concatenate((mergeParts[0][CL_idx],
+                                             mergeParts[1][CL_idx])), CL_merge)
+
+        if copy:
+            self.set_data(np.concatenate(mergeParts, axis=1))
+        else:
+            self.mergeParts = mergeParts
+            self.lookupIndex = {}
+
+
+    # reconstructs a dense polar with the given alpha step from a polar that
+    # was calculated with a coarse alpha step, using shape-preserving
+    # piecewise cubic interpolation
+    def reconstruct(self, alphaStep):
+        # alpha of the switching-idx between T1 / T2-polar
+        if self.get_numDataPoints() > 0:
+            switchAlpha = self.alpha[self.T2_T1_switchIdx]
+
+        newData = polar_reconstruction.reconstruct_polar(self.data, alphaStep)
+        newData[polarColumns.index('CL_CD')] = newData[1] / newData[2]
+        self.set_data(newData)
+
+        # carry the switching-idx over to the first new datapoint at or
+        # above the same alpha
+        if self.get_numDataPoints() > 0:
+            self.T2_T1_switchIdx = min(int(np.searchsorted(self.alpha, switchAlpha)),
+                                       self.get_numDataPoints() - 1)
+
+
+    # returns the lookup-index of a column: the running maximum of the column
+    # values. It is monotonic, so it can be searched with a binary search.
+    # The first datapoint where the running maximum is >= a value is also the
+    # first datapoint where the column itself is >= this value, so the
+    # "first crossing" semantics of a linear search are kept, also on the
+    # post-stall branch of a polar.
+    # The lookup-index is built once and discarded whenever the data changes.
+    def get_lookupIndex(self, columnIdx):
+        if columnIdx not in self.lookupIndex:
+            self.lookupIndex[columnIdx] =\
+                  np.maximum.accumulate(self.data[columnIdx])
+        return self.lookupIndex[columnIdx]
+
+
+    # returns the indices of the first datapoints where the values of a column
+    # are >= the given values. 'values' can be a single value or an array.
+    # Returns -1 for every value that was not found.
+    def search_firstIndex(self, columnIdx, values):
+        num = self.get_numDataPoints()
+        if num == 0:
+            return np.full(np.shape(values), -1)
+
+        indices = np.searchsorted(self.get_lookupIndex(columnIdx), values)
+        return np.where(indices < num, indices, -1)
+
+
+    # returns the indices of the first intervals of a column that contain the
+    # given values, i.e. column[idx] <= value <= column[idx+1].
+    # Returns -1 for every value that was not found.
+    def search_firstInterval(self, columnIdx, values):
+        column = self.data[columnIdx]
+        values = np.asarray(values, dtype=np.float64)
+
+        # the first datapoint >= value ends the first interval, if there is
+        # a datapoint left from it
+        indices = np.array(self.search_firstIndex(columnIdx, values) - 1)
+        indices[indices == -2] = -1
+
+        # the first datapoint is already >= value. The first interval can
+        # only start here if it is equal to the value, so search the
+        # remaining column for an interval the slow way
+        if len(column) > 1:
+            for i in np.flatnonzero(values <= column[0]):
+                value = values.flat[i]
+                found = np.flatnonzero((column[:-1] <= value) &
+                                       (column[1:] >= value))
+                if len(found) > 0:
+                    indices.flat[i] = found[0]
+
+        return indices
+
+
+    # returns the indices of the first datapoints where a column is >= the
+    # given values. Single value: returns index or None, array of values:
+    # returns array of indices, -1 if not found
+    def find_indices(self, columnIdx, values):
+        indices = self.search_firstIndex(columnIdx, values)
+
+        for value in np.asarray(values)[indices < 0]:
+            ErrorMsg("index not found, %s was %f" %
+                     (polarColumns[columnIdx], value))
+
+        if np.ndim(values) == 0:
+            return None if indices < 0 else int(indices)
+        return indices
+
+
+    # returns the linear interpolated values of column 'yColumnIdx' where
+    # column 'xColumnIdx' reaches the given values for the first time.
+    # Single value: returns value or None, array of values: returns array of
+    # values, NaN if not found
+    def interpolate_values(self, xColumnIdx, yColumnIdx, values):
+        x = self.data[xColumnIdx]
+        y = self.data[yColumnIdx]
+        values = np.asarray(values, dtype=np.float64)
+        indices = self.search_firstInterval(xColumnIdx, values)
+
+        result = np.full(values.shape, np.nan)
+        found = indices >= 0
+        idx = indices[found]
+        (x1, x2, y1, y2) = (x[idx], x[idx+1], y[idx], y[idx+1])
+
+        # same as interpolate(): intervals of zero width result in 0.0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            interpolated = ((y2-y1)/(x2-x1)) * (values[found]-x1) + y1
+        interpolated[x2 == x1] = 0.0
+        result[found] = interpolated
+
+        for (x1, x2) in zip(x1[x2 == x1], x2[x2 == x1]):
+            ErrorMsg("Division by zero, x1:%f, x2:%f" % (x1, x2))
+
+        for value in values[~found]:
+            ErrorMsg("%s not found, %s was %f" %
+              (polarColumns[yColumnIdx], polarColumns[xColumnIdx], value))
+
+        if values.ndim == 0:
+            return float(result) if found else None
+        return result
+
+
+    # local helper-functions, all of them accept a single value or an array
+    # of values
     def find_index_From_CL(self, CL):
-        for i in range(len(self.CL)):
-            if (self.CL[i] >= CL):
-                return i
-        ErrorMsg("index not found, CL was %f" % CL)
-        return None
+        return self.find_indices(polarColumns.index('CL'), CL)
 
     def find_index_From_CD(self, CD):
-        for i in range(len(self.CD)):
-            if (self.CD[i] == CD):
-                return i
+        for i in np.flatnonzero(self.CD == CD)[:1]:
+            return int(i)
         ErrorMsg("index not found, CD was %f" % CD)
         return None
 
     def find_index_From_CL_CD(self, CL_CD):
-        for i in range(len(self.CL_CD)):
-            if (self.CL_CD[i] >= CL_CD):
-                return i
-        ErrorMsg("index not found, CL_CD was %f" % CL_CD)
-        return None
+        return self.find_indices(polarColumns.index('CL_CD'), CL_CD)
 
     def find_CD_From_CL(self, CL):
-        num = len(self.CL)
-        for idx in range(num-1):
-            # find CL-values left and right from CL
-            if (self.CL[idx]<=CL and self.CL[idx+1]>=CL):
-                # interpolate between CL-values
-                CD = interpolate(self.CL[idx], self.CL[idx+1],\
-                                      self.CD[idx], self.CD[idx+1], CL)
-                return CD
-
-        ErrorMsg("CD not found, CL was %f" % CL)
-        return None
+        return self.interpolate_values(polarColumns.index('CL'),
+                                       polarColumns.index('CD'), CL)
 
     def find_CL_From_alpha(self, alpha):
-        num = len(self.alpha)
-        for idx in range(num-1):
-            # find CL-values left and right from CL
-            if (self.alpha[idx]<=alpha and self.alpha[idx+1]>=alpha):
-                # interpolate between alpha-values
-                CL = interpolate(self.alpha[idx], self.alpha[idx+1],\
-                                      self.CL[idx], self.CL[idx+1], alpha)
-                return CL
-
-        ErrorMsg("CL not found, alpha was %f" % alpha)
-        return None
+        return self.interpolate_values(polarColumns.index('alpha'),
+                                       polarColumns.index('CL'), alpha)
 
     def find_CD_From_alpha(self, alpha):
-        num = len(self.alpha)
-        for idx in range(num-1):
-            # find CL-values left and right from CL
-            if (self.alpha[idx]<=alpha and self.alpha[idx+1]>=alpha):
-                # interpolate between alpha-values
-                CD = interpolate(self.alpha[idx], self.alpha[idx+1],\
-                                      self.CD[idx], self.CD[idx+1], alpha)
-                return CD
-
-        ErrorMsg("CD not found, alpha was %f" % alpha)
-        return None
+        return self.interpolate_values(polarColumns.index('alpha'),
+                                       polarColumns.index('CD'), alpha)
 
     def find_alpha_From_CL(self, CL):
-        num = len(self.CL)
-        for idx in range(num-1):
-            # find CL-values left and right from CL
-            if (self.CL[idx]<=CL and self.CL[idx+1]>=CL):
-                # interpolate between CL-values
-                alpha = interpolate(self.CL[idx], self.CL[idx+1],\
-                                      self.alpha[idx], self.alpha[idx+1], CL)
-                return alpha
-##
-##        for i in range(len(self.CL)):
-##            if (self.CL[i] >= CL):
-##                return self.alpha[i]
-        ErrorMsg("alpha not found, CL was %f" % CL)
-        return None
+        return self.interpolate_values(polarColumns.index('CL'),
+                                       polarColumns.index('alpha'), CL)
 
 
 ################################################################################
-# function that generates commandlines to create and merge polars
-def generate_polarCreationCommandLines(commandlines, params, strakFoilName, ReT1, ReT2):
-    airfoilName = remove_suffix(strakFoilName, '.dat')
-    polarDir = airfoilName + '_polars'
+#
+# vectorized analysis of polars
+#
+# All polars are stacked into 2D-arrays, one row per polar, padded with NaN
+# up to the length of the longest polar.
+#
+################################################################################
+
+# returns the indices of the first datapoints of each row of 'x' that are
+# >= 'limits', -1 if there is no such datapoint.
+# 'limits' contains one column of limits for each row of 'x'
+def find_firstIndices(x, limits):
+    reached = x[:, :, np.newaxis] >= limits[:, np.newaxis, :]
+    return np.where(reached.any(axis=1), reached.argmax(axis=1), -1)
+
+
+# returns the linear interpolated values of 'y' where each row of 'x' crosses
+# 'limits', i.e. x[idx] <= limit <= x[idx+1]. Uses the first crossing, or the
+# last one if 'last' is True. Returns NaN if there is no crossing.
+# 'limits' contains one column of limits for each row of 'x'
+def interpolate_crossings(x, y, limits, last=False):
+    limits = limits[:, np.newaxis, :]
+    crossing = ((x[:, :-1, np.newaxis] <= limits) &
+                (x[:, 1:, np.newaxis] >= limits))
+
+    if last:
+        indices = crossing.shape[1] - 1 - crossing[:, ::-1].argmax(axis=1)
+    else:
+        indices = crossing.argmax(axis=1)
+
+    rows = np.arange(x.shape[0])[:, np.newaxis]
+    (x1, x2) = (x[rows, indices], x[rows, indices+1])
+    (y1, y2) = (y[rows, indices], y[rows, indices+1])
+
+    # same as interpolate(): intervals of zero width result in 0.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = ((y2-y1)/(x2-x1)) * (limits[:, 0, :]-x1) + y1
+    values[x2 == x1] = 0.0
+    values[~crossing.any(axis=1)] = np.nan
+    return values
+
+
+# returns the data of all polars as one 3D-array: one 2D-array for each
+# column, with one row per polar
+def stack_polars(polars):
+    numDataPoints = [polar.get_numDataPoints() for polar in polars]
+    stack = np.full((len(polarColumns), len(polars), max(numDataPoints)), np.nan)
+
+    for (idx, polar) in enumerate(polars):
+        stack[:, idx, :numDataPoints[idx]] = polar.data
+
+    return stack
+
+
+# converts a result of the analysis to a python value, None if not found
+def get_analysisValue(value, name, polar):
+    if np.isnan(value):
+        ErrorMsg("%s not found for polar \'%s\'" % (name, polar.polarName))
+        return None
+    return float(value)
+
+
+def get_analysisIdx(idx, name, polar):
+    if idx < 0:
+        ErrorMsg("%s not found for polar \'%s\'" % (name, polar.polarName))
+        return None
+    return int(idx)
+
+
+# analyses a list of polars in one step and stores the characteristic
+# op-points (maxGlide, maxSpeed, CL_min, preMaxSpeed, maxLift, pre_maxLift,
+# alpha @ CL = 0) in each polar
+def analyze_polars(polars, params):
+    for polar in polars:
+        InfoMsg("analysing polar \'%s\'..." % polar.polarName)
+
+    if len(polars) == 0:
+        return
+
+    numDataPoints = [polar.get_numDataPoints() for polar in polars]
+    if min(numDataPoints) < 2:
+        ErrorMsg("analyze_polars: a polar needs at least two datapoints")
+        return
+
+    # stack all polars, one row per polar for each column
+    stack = stack_polars(polars)
+    length = stack.shape[2]
+
+    (alpha, CL, CD, CL_CD) = stack[0:4]
+    rows = np.arange(len(polars))
+    indices = np.arange(length)
+
+    # max glide and max lift, first datapoint of the overall maximum
+    maxGlide_idx = np.nanargmax(CL_CD, axis=1)
+    maxLift_idx = np.nanargmax(CL, axis=1)
+    CL_maxLift = CL[rows, maxLift_idx]
+
+    # max speed: first minimum of CD, descending from max glide. Search the
+    # last datapoint below max glide, where CD is rising again
+    rising = ((CD[:, :-1] > CD[:, 1:]) &
+              (indices[:-1] < maxGlide_idx[:, np.newaxis]))
+    minimum_idx = np.where(rising.any(axis=1),
+                           length - 1 - rising[:, ::-1].argmax(axis=1), 0)
+    CD_maxSpeed = CD[rows, minimum_idx]
+
+    # the minimum may be a plateau of equal values, take the first datapoint
+    # of the plateau when descending from max glide
+    plateau = ((CD == CD_maxSpeed[:, np.newaxis]) &
+               (indices >= minimum_idx[:, np.newaxis]) &
+               (indices <= maxGlide_idx[:, np.newaxis]))
+    maxSpeed_idx = length - 1 - plateau[:, ::-1].argmax(axis=1)
+
+    # CL_min, preMaxSpeed and pre_maxLift, interpolated at the first crossing
+    # of the CL-values
+    CL_limits = np.column_stack((np.full(len(polars), params.CL_min),
+                                 np.full(len(polars), params.CL_preMaxSpeed),
+                                 CL_maxLift - params.maxLiftDistance))
+    CL_indices = find_firstIndices(CL, CL_limits)
+    CD_values = interpolate_crossings(CL, CD, CL_limits)
+    alpha_values = interpolate_crossings(CL, alpha, CL_limits)
+
+    # alpha @ CL = 0 (last crossing) and CD @ CL = 0 (first crossing)
+    zero = np.zeros((len(polars), 1))
+    alpha_CL0 = interpolate_crossings(CL, alpha, zero, last=True)[:, 0]
+    CD_CL0 = interpolate_crossings(CL, CD, zero)[:, 0]
+
+    # store results in each polar
+    for (idx, polar) in enumerate(polars):
+        polar.maxGlide_idx = int(maxGlide_idx[idx])
+        polar.CL_CD_maxGlide = float(CL_CD[idx, maxGlide_idx[idx]])
+        polar.CL_maxGlide = float(CL[idx, maxGlide_idx[idx]])
+        polar.CD_maxGlide = float(CD[idx, maxGlide_idx[idx]])
+        polar.alpha_maxGlide = float(alpha[idx, maxGlide_idx[idx]])
+
+        polar.maxSpeed_idx = int(maxSpeed_idx[idx])
+        polar.CD_maxSpeed = float(CD_maxSpeed[idx])
+        polar.CL_maxSpeed = float(CL[idx, maxSpeed_idx[idx]])
+        polar.alpha_maxSpeed = float(alpha[idx, maxSpeed_idx[idx]])
+        polar.CL_CD_maxSpeed = polar.CL_maxSpeed / polar.CD_maxSpeed
+
+        polar.CL_min = params.CL_min
+        polar.min_idx = get_analysisIdx(CL_indices[idx, 0], "CL_min", polar)
+        polar.CD_min = get_analysisValue(CD_values[idx, 0], "CL_min", polar)
+        polar.alpha_min = get_analysisValue(alpha_values[idx, 0], "CL_min", polar)
+
+        polar.CL_preMaxSpeed = params.CL_preMaxSpeed
+        polar.preMaxSpeed_idx = get_analysisIdx(CL_indices[idx, 1], "CL_preMaxSpeed", polar)
+        polar.CD_preMaxSpeed = get_analysisValue(CD_values[idx, 1], "CL_preMaxSpeed", polar)
+        polar.alpha_preMaxSpeed = get_analysisValue(alpha_values[idx, 1], "CL_preMaxSpeed", polar)
+        if polar.CD_preMaxSpeed != None:
+            polar.CL_CD_preMaxSpeed = polar.CL_preMaxSpeed / polar.CD_preMaxSpeed
+
+        polar.maxLift_idx = int(maxLift_idx[idx])
+        polar.CL_maxLift = float(CL_maxLift[idx])
+        polar.CD_maxLift = float(CD[idx, maxLift_idx[idx]])
+        polar.alpha_maxLift = float(alpha[idx, maxLift_idx[idx]])
+
+        # also calculate opPoint before maxLift that can be reached by the
+        # optimizer
+        polar.CL_pre_maxLift = float(CL_limits[idx, 2])
+        polar.pre_maxLift_idx = get_analysisIdx(CL_indices[idx, 2], "CL_pre_maxLift", polar)
+        polar.CD_pre_maxLift = get_analysisValue(CD_values[idx, 2], "CL_pre_maxLift", polar)
+        polar.alpha_pre_maxLift = get_analysisValue(alpha_values[idx, 2], "CL_pre_maxLift", polar)
+
+        # keep previous value of alpha_CL0, if CL = 0 was not crossed
+        if not np.isnan(alpha_CL0[idx]):
+            polar.alpha_CL0 = float(alpha_CL0[idx])
+        polar.CD_CL0 = get_analysisValue(CD_CL0[idx], "CD @ CL = 0", polar)
+
+
+# calculates the target values of the main op-points for a list of polars in
+# one step. The target-CL and -alpha values are taken from the root polar,
+# the CD values from each polar at the same CL / alpha. CL_preMaxSpeed and
+# maxLiftDistance are taken from params, so the targets can be calculated
+# again after changing them, without analysing the polars again.
+def calculate_targetValues(rootPolar, polars, params):
+    targets = targetTable(len(polars))
+    if len(polars) == 0:
+        return targets
+
+    (alpha, CL, CD) = stack_polars(polars)[0:3]
+    ones = np.ones(len(polars))
+
+    # CD of each polar at the alpha values of the root polar
+    # (CL_min, maxGlide, CL0)
+    alpha_targets = np.outer(ones, (rootPolar.alpha_min,
+                    rootPolar.alpha_maxGlide, rootPolar.alpha_CL0))
+    CD_atAlpha = interpolate_crossings(alpha, CD, alpha_targets)
+
+    # CD and alpha of each polar at CL values (maxSpeed and preMaxSpeed of
+    # the root polar, pre_maxLift of each polar)
+    CL_pre_maxLift = np.nanmax(CL, axis=1) - params.maxLiftDistance
+    CL_targets = np.column_stack((ones * rootPolar.CL_maxSpeed,
+                                  ones * params.CL_preMaxSpeed, CL_pre_maxLift))
+    CD_atCL = interpolate_crossings(CL, CD, CL_targets)
+    alpha_atCL = interpolate_crossings(CL, alpha, CL_targets)
+
+    # CL_min-targets
+    targets["CL_min"] = rootPolar.CL_min
+    targets["CD_min"] = CD_atAlpha[:, 0]
+    targets["alpha_min"] = rootPolar.alpha_min
+
+    # maxSpeed-targets
+    targets["CL_maxSpeed"] = rootPolar.CL_maxSpeed
+    targets["CD_maxSpeed"] = CD_atCL[:, 0]
+    targets["alpha_maxSpeed"] = alpha_atCL[:, 0]
+
+    # preMaxSpeed-targets, alpha is taken from the root polar
+    targets["CL_preMaxSpeed"] = params.CL_preMaxSpeed
+    targets["CD_preMaxSpeed"] = CD_atCL[:, 1]
+    targets["alpha_preMaxSpeed"] = alpha_atCL[0, 1]
+
+    # maxGlide-targets
+    targets["CL_maxGlide"] = rootPolar.CL_maxGlide
+    targets["CD_maxGlide"] = CD_atAlpha[:, 1]
+    targets["CL_CD_maxGlide"] = rootPolar.CL_maxGlide / CD_atAlpha[:, 1]
+    targets["alpha_maxGlide"] = rootPolar.alpha_maxGlide
+
+    # maxLift-targets
+    targets["CL_pre_maxLift"] = CL_pre_maxLift
+    targets["CD_pre_maxLift"] = CD_atCL[:, 2]
+    targets["alpha_pre_maxLift"] = alpha_atCL[:, 2]
+
+    # CL0-targets
+    targets["CL0"] = 0.0001
+    targets["CD0"] = CD_atAlpha[:, 2]
+    targets["alpha0"] = rootPolar.alpha_CL0
+
+    # report missing values
+    for (idx, columnIdx) in np.argwhere(np.isnan(targets.data)):
+        ErrorMsg("%s not found for polar \'%s\'" %
+                 (targetColumns[columnIdx], polars[idx].polarName))
+
+    return targets
+
+
+################################################################################
+# functions that return the commandlines of the single steps of the strak,
+# without line break
+def get_xoptfoilCommandline(xoptfoilCall, inputFileName, Re, seedfoilName,
+                            outputName):
+    return xoptfoilCall + " -i %s -r %d -a %s -o %s" %\
+                (inputFileName, Re, seedfoilName, outputName)
+
+
+def get_smoothCommandline(xfoilWorkerCall, smoothFileName, airfoilFileName,
+                          outputName):
+    return xfoilWorkerCall + " -w smooth -i %s -a %s -o %s" % \
+                       (smoothFileName, airfoilFileName, outputName)
+
+
+def get_comparisonCommandline(params, airfoilName, numCompetitors):
+    return params.airfoilComparisonCall + " -a %s -n %d" %\
+               (airfoilName, numCompetitors)
+
+
+def get_copyCommandline(strakFoilName):
+    return ("copy %s %s" + bs +"%s") % (strakFoilName , airfoilPath, strakFoilName)
+
+
+# returns the filename and path of the target polar of an airfoil
+def get_targetPolarFileName(params, airfoilIdx):
+    polarDir = params.buildDir + bs + params.airfoilNames[0] + '_polars'
+    return polarDir + bs + ('target_polar_%s.txt' %\
+                              get_ReString(params.ReNumbers[airfoilIdx]))
+
+
+# copies a strak-airfoil to the airfoil-folder, same as get_copyCommandline()
+def copy_strakAirfoil(strakFoilName):
+    copyfile(strakFoilName, airfoilPath + bs + strakFoilName)
+
+
+# returns the commandlines to create T1 and T2 polars and to merge them
+def get_polarCreationCommandLines(params, xfoilWorkerCall, strakFoilName,
+                                  ReT1, ReT2):
+    airfoilName = remove_suffix(strakFoilName, '.dat')
+    polarDir = airfoilName + '_polars'
     T1_fileName = 'iPolars_T1_%s.txt' % airfoilName
     T2_fileName = 'iPolars_T2_%s.txt' % airfoilName
     num = len(ReT1)
 
     # worker call T1-polar (multiple polars with one call)
-    commandline = params.xfoilWorkerCall +  " -i \"%s\" -w polar -a \"%s\"\n" %\
+    T1_commandline = xfoilWorkerCall +  " -i \"%s\" -w polar -a \"%s\"" %\
                                   (T1_fileName, airfoilName+'.dat')
-    commandlines.append(commandline)
 
     # worker call T2-polar (multiple polars with one call)
-    commandline = params.xfoilWorkerCall +  " -i \"%s\" -w polar -a \"%s\"\n" %\
+    T2_commandline = xfoilWorkerCall +  " -i \"%s\" -w polar -a \"%s\"" %\
                                   (T2_fileName, airfoilName+'.dat')
-    commandlines.append(commandline)
 
-    # merge command (only one merged polar with one call)
+    # merge command (all merged polars of the airfoil with one call)
+    polarFileNames_T1 = ''
+    polarFileNames_T2 = ''
+    mergedPolarFileNames = ''
     for i in range(num):
         polarFileName_T1 = compose_Polarfilename_T1(ReT1[i], params.NCrit)
-        polarFileNameAndPath_T1 = polarDir + bs + polarFileName_T1
+        polarFileNames_T1 += " \"%s\"" % (polarDir + bs + polarFileName_T1)
 
         polarFileName_T2 = compose_Polarfilename_T2(ReT2[i], params.NCrit)
-        polarFileNameAndPath_T2 = polarDir + bs + polarFileName_T2
+        polarFileNames_T2 += " \"%s\"" % (polarDir + bs + polarFileName_T2)
+
+        mergedPolarFileNames += " \"%s\"" % (polarDir + bs +\
+                 ('merged_polar_%s.txt' % get_ReString(ReT2[i])))
 
-        mergedPolarFileName =  polarDir + bs +\
-                 ('merged_polar_%s.txt' % get_ReString(ReT2[i]))
+    commandline = params.strakMachineCall + " -w merge -p1%s -p2%s -m%s -c %f" %\
+              (polarFileNames_T1, polarFileNames_T2, mergedPolarFileNames,
+               params.CL_merge)
 
-        commandline = params.strakMachineCall + " -w merge -p1 \"%s\"  -p2 \"%s\""\
-                 " -m \"%s\" -c %f\n" %\
-              (polarFileNameAndPath_T1, polarFileNameAndPath_T2,
-               mergedPolarFileName, params.CL_merge)
-        commandlines.append(commandline)
+    # reconstruct dense polars from coarse polars before merging, with the
+    # alpha step of the templates, the same as import_polars does
+    if params.polarReconstruction:
+        commandline += " -r %f %f" % (get_templateAlphaStep('T1'),
+                                      get_templateAlphaStep('T2'))
+
+    return (T1_commandline, T2_commandline, commandline)
+
+
+################################################################################
+# function that generates commandlines to create and merge polars
+def generate_polarCreationCommandLines(commandlines, params, strakFoilName, ReT1, ReT2):
+    for commandline in get_polarCreationCommandLines(params,
+                          params.xfoilWorkerCall, strakFoilName, ReT1, ReT2):
+        commandlines.append(commandline + "\n")
 
 
 def delete_progressFile(commandLines, filename):
@@ -3185,20 +3375,18 @@ def generate_Commandlines(params):
                     xoptfoilCall = params.xoptfoilCall
 
                 # generate commandline for competitor-intermediate strak-airfoil
-                commandline = xoptfoilCall + " -i %s -r %d -a %s -o %s\n" %\
-                (iFile, ReList[i], seedfoilName, competitorName)
-                commandLines.append(commandline)
+                commandline = get_xoptfoilCommandline(xoptfoilCall, iFile,
+                                  ReList[i], seedfoilName, competitorName)
+                commandLines.append(commandline + "\n")
 
                 # check wheather the strak-airfoils shall be smoothed after their
                 # creation
                 if (params.smoothStrakFoils):
-                    # smooth the airfoil
-                    smoothFileName = get_PresetInputFileName(smoothInputFile)
-
                     # compose commandline for smoothing the airfoil
-                    commandline = params.xfoilWorkerCall + " -w smooth -i %s -a %s -o %s\n" % \
-                       (smoothFileName, competitorName + '.dat', competitorName)
-                    commandLines.append(commandline)
+                    commandline = get_smoothCommandline(params.xfoilWorkerCall,
+                                       get_PresetInputFileName(smoothInputFile),
+                                       competitorName + '.dat', competitorName)
+                    commandLines.append(commandline + "\n")
 
                 # set timestamp and progress
                 progress = calculate_SubTaskProgress(params, n, c)
@@ -3206,9 +3394,9 @@ def generate_Commandlines(params):
 
             # generate commandline for selecting the best airfoil among all
             # competitors
-            commandline = params.airfoilComparisonCall + " -a %s -n %d\n" %\
-               (remove_suffix(intermediateFoilName, '.dat') , num)
-            commandLines.append(commandline)
+            commandline = get_comparisonCommandline(params,
+                               remove_suffix(intermediateFoilName, '.dat'), num)
+            commandLines.append(commandline + "\n")
 
             # the output-airfoil is the new seedfoil
             seedfoilName = intermediateFoilName
@@ -3224,21 +3412,19 @@ def generate_Commandlines(params):
         insert_airfoilName(commandLines, progressFileName, remove_suffix(strakFoilName, '.dat'))
 
         iFile = params.inputFileNames[iFileIndex]
-        commandline = params.xoptfoilCall + " -i %s -r %d -a %s -o %s\n" %\
-                    (iFile, ReList[i], seedfoilName,
-                      remove_suffix(strakFoilName, '.dat'))
-        commandLines.append(commandline)
+        commandline = get_xoptfoilCommandline(params.xoptfoilCall, iFile,
+                ReList[i], seedfoilName, remove_suffix(strakFoilName, '.dat'))
+        commandLines.append(commandline + "\n")
 
         # check wheather the strak-airfoils shall be smoothed after their
         # creation
         if (params.smoothStrakFoils):
-            # smooth the airfoil
-            inputFilename = get_PresetInputFileName(smoothInputFile)
-
             # compose commandline for smoothing the airfoil
-            commandline = params.xfoilWorkerCall + " -w smooth -i %s -a %s -o %s\n" % \
-                       (inputFilename, strakFoilName, remove_suffix(strakFoilName, '.dat'))
-            commandLines.append(commandline)
+            commandline = get_smoothCommandline(params.xfoilWorkerCall,
+                                        get_PresetInputFileName(smoothInputFile),
+                                        strakFoilName,
+                                        remove_suffix(strakFoilName, '.dat'))
+            commandLines.append(commandline + "\n")
 
         # set timestamp and progress
         insert_SubTaskProgress(commandLines, progressFileName, 100.0)
@@ -3269,9 +3455,7 @@ def generate_Commandlines(params):
         insert_calculate_polars_finished(commandLines, progressFileName)
 
         # copy strak-airfoil to airfoil-folder
-        commandline = ("copy %s %s" + bs +"%s\n\n") % \
-            (strakFoilName , airfoilPath, strakFoilName)
-        commandLines.append(commandline)
+        commandLines.append(get_copyCommandline(strakFoilName) + "\n\n")
 
         # insert end of sub-task
         insert_SubTaskEnd(commandLines, progressFileName)
@@ -3295,6 +3479,155 @@ def generate_Commandlines(params):
     return commandLines
 
 
+# returns the working directory of a job of the job graph
+def get_jobDir(jobName):
+    return '..' + bs + buildPath + bs + 'job_' + jobName.replace(' ', '_')
+
+
+# Xoptfoil and the XFOIL-worker write files with fixed names into their
+# working directory, e.g. the run_control file, so each of their jobs runs
+# in its own working directory inside the build-dir, see job_graph.job. The
+# jobs run without user interaction, so Xoptfoil is always called with the
+# automatic 'yes'-answer.
+def add_xoptfoilJob(graph, params, iFile, Re, seedfoilName, outputName,
+                    dependencies, airfoilName, targetPolarFileName):
+    name = "xoptfoil %s" % outputName
+    commandline = get_xoptfoilCommandline(params.xoptfoilJobCall, iFile, Re,
+                                          seedfoilName, outputName)
+
+    # the '_temp' folder contains the performance summary for best_airfoil
+    # and the design data for the visualizer
+    return graph.add_command(name, commandline, dependencies, airfoilName,
+                             [iFile, targetPolarFileName], outputName + '.dat',
+                             get_jobDir(name),
+                             [iFile, seedfoilName, targetPolarFileName],
+                             [outputName + '.dat', outputName + '_temp'])
+
+
+def add_smoothJob(graph, params, smoothFileName, outputName, dependencies,
+                  airfoilName):
+    name = "smooth %s" % outputName
+    commandline = get_smoothCommandline(params.xfoilWorkerJobCall,
+                                        path.basename(smoothFileName),
+                                        outputName + '.dat', outputName)
+
+    return graph.add_command(name, commandline, dependencies, airfoilName,
+                             workingDir=get_jobDir(name),
+                             copyFiles=[smoothFileName, outputName + '.dat'],
+                             resultFiles=[outputName + '.dat'])
+
+
+# the XFOIL-worker writes the polars to the polar directory of the airfoil,
+# relative to its working directory
+def add_polarJob(graph, polarType, commandline, airfoilName, dependencies):
+    name = "%s polars %s" % (polarType, airfoilName)
+    polarInputFileName = 'iPolars_%s_%s.txt' % (polarType, airfoilName)
+
+    return graph.add_command(name, commandline, dependencies, airfoilName,
+                             workingDir=get_jobDir(name),
+                             copyFiles=[polarInputFileName, airfoilName + '.dat'],
+                             resultFiles=[airfoilName + '_polars'])
+
+
+################################################################################
+# function that generates the graph of all jobs to run Xoptfoil, create and
+# merge polars etc. It contains the same steps as generate_Commandlines(), but
+# each step only waits for the steps it really depends on, so steps of
+# different airfoils can run at the same time, as many as the workerPool
+# allows. The jobs of Xoptfoil and the XFOIL-worker run in their own working
+# directories, see add_xoptfoilJob().
+# The Xoptfoil-jobs know their input file and target polar, so after a
+# change of the target values only the affected airfoils are created again.
+def generate_JobGraph(params):
+    NoteMsg("Generating job graph...")
+    graph = job_graph.jobGraph()
+    smoothFileName = get_PresetInputFileName(smoothInputFile)
+
+    numFoils = len(params.ReNumbers)
+    ReList = params.get_ReList()
+    maxReList = params.get_maxReList()
+
+    # skip the root airfoil (as it was already copied)
+    for i in range (1, numFoils):
+        airfoilName = params.airfoilNames[i]
+        strakFoilName = airfoilName + ".dat"
+
+        # the seedfoils already exist, so the first pass can start at once
+        seedfoilName = 'seed_%s.dat' % get_ReString(params.ReNumbers[i])
+        seedfoilJobs = []
+        targetPolarFileName = get_targetPolarFileName(params, i)
+
+        # multi-pass-optimization: jobs for intermediate airfoils
+        for n in range(0, params.optimizationPasses-1):
+            iFile = params.inputFileNames[i*(params.optimizationPasses) + n]
+            intermediateFoilName = airfoilName + ("_%d" % (n+1))
+            num = params.numberOfCompetitors[n]
+            competitorJobs = []
+
+            for c in range(num):
+                competitorName = intermediateFoilName + ("_%d" % (c+1))
+
+                job = add_xoptfoilJob(graph, params, iFile, ReList[i],
+                                      seedfoilName, competitorName,
+                                      seedfoilJobs, airfoilName,
+                                      targetPolarFileName)
+
+                if (params.smoothStrakFoils):
+                    job = add_smoothJob(graph, params, smoothFileName,
+                                        competitorName, [job], airfoilName)
+
+                competitorJobs.append(job)
+
+            # select the best airfoil among all competitors, this is the new
+            # seedfoil
+            commandline = get_comparisonCommandline(params, intermediateFoilName,
+                                                    num)
+            job = graph.add_command("best_airfoil %s" % intermediateFoilName,
+                                    commandline, competitorJobs, airfoilName,
+                                    outputFile=intermediateFoilName + '.dat')
+            seedfoilJobs = [job]
+            seedfoilName = intermediateFoilName + '.dat'
+
+        # final strak-airfoil
+        iFile = params.inputFileNames[(i+1)*(params.optimizationPasses) - 1]
+        airfoilJob = add_xoptfoilJob(graph, params, iFile, ReList[i],
+                                     seedfoilName, airfoilName, seedfoilJobs,
+                                     airfoilName, targetPolarFileName)
+
+        if (params.smoothStrakFoils):
+            airfoilJob = add_smoothJob(graph, params, smoothFileName,
+                                       airfoilName, [airfoilJob], airfoilName)
+
+        # polars for the Re-numbers of this and the next strak-airfoil, see
+        # generate_Commandlines()
+        if (i<(numFoils-1)):
+            ReT1 = [maxReList[i], maxReList[i+1]]
+            ReT2 = [ReList[i], ReList[i+1]]
+        else:
+            ReT1 = [maxReList[i]]
+            ReT2 = [ReList[i]]
+
+        (T1_commandline, T2_commandline, mergeCommandline) =\
+          get_polarCreationCommandLines(params, params.xfoilWorkerJobCall,
+                                        strakFoilName, ReT1, ReT2)
+        T1_job = add_polarJob(graph, 'T1', T1_commandline, airfoilName,
+                              [airfoilJob])
+        T2_job = add_polarJob(graph, 'T2', T2_commandline, airfoilName,
+                              [airfoilJob])
+
+        # merging only reads and writes files with the name of the airfoil,
+        # so it runs in the build-dir
+        graph.add_command("merge polars %s" % airfoilName, mergeCommandline,
+                          [T1_job, T2_job], airfoilName)
+
+        # copy strak-airfoil to airfoil-folder
+        graph.add_function("copy %s" % airfoilName, copy_strakAirfoil,
+                           (strakFoilName,), [airfoilJob], airfoilName)
+
+    DoneMsg()
+    return graph
+
+
 ################################################################################
 # function that generates a Xoptfoil-batchfile
 def generate_Batchfile(batchFileName, commandlines):
@@ -3401,24 +3734,24 @@ def get_workerAction(args):
         return None
 
 ################################################################################
-# function that gets the filenname of the first polar to merge
-def get_firstMergePolarFileName(args):
+# function that gets the filennames of the first polars to merge
+def get_firstMergePolarFileNames(args):
     if args.p1:
         return args.p1
     else:
         return None
 
 ################################################################################
-# function that gets the filename of the second polar to merge
-def get_secondMergePolarFileName(args):
+# function that gets the filenames of the second polars to merge
+def get_secondMergePolarFileNames(args):
     if args.p2:
         return args.p2
     else:
         return None
 
 ################################################################################
-# function that gets the filenname of the first polar to merge
-def get_mergedPolarFileName(args):
+# function that gets the filennames of the merged polars
+def get_mergedPolarFileNames(args):
     if args.m:
         return args.m
     else:
@@ -3432,6 +3765,16 @@ def get_mergeCL(args):
     else:
         return None
 
+################################################################################
+# function that gets the alpha steps for reconstruction of the first and
+# second polars to merge. One value is used for both polars.
+def get_reconstructionSteps(args):
+    if args.r:
+        steps = [float(step) for step in args.r]
+        return (steps[0], steps[-1])
+    else:
+        return None
+
 ################################################################################
 # function that gets arguments from the commandline
 def get_Arguments():
@@ -3442,30 +3785,36 @@ def get_Arguments():
     helptext = "filename of strak-machine input-file (e.g. strak_data)"
     parser.add_argument("-input", "-i", help = helptext)
 
-    helptext = "worker action, e.g. -w merge (to merge two polars)"
+    helptext = "worker action, e.g. -w merge (to merge two polars) or "\
+               "-w strak (to create all strak-airfoils)"
     parser.add_argument("-work", "-w", help = helptext)
 
-    helptext = "filename of first polar to merge)"
-    parser.add_argument("-p1", help = helptext)
+    helptext = "filename(s) of first polar(s) to merge"
+    parser.add_argument("-p1", nargs = '+', help = helptext)
 
-    helptext = "filename of second polar to merge)"
-    parser.add_argument("-p2", help = helptext)
+    helptext = "filename(s) of second polar(s) to merge"
+    parser.add_argument("-p2", nargs = '+', help = helptext)
 
-    helptext = "filename of merged polar"
-    parser.add_argument("-m", help = helptext)
+    helptext = "filename(s) of merged polar(s)"
+    parser.add_argument("-m", nargs = '+', help = helptext)
 
     helptext = "CL-value at which to merge the two polars"
     parser.add_argument("-c", help = helptext)
 
+    helptext = "alpha step(s) for reconstruction of coarse polars before "\
+               "merging, one value for both or one for first and second polar(s)"
+    parser.add_argument("-r", nargs = '+', help = helptext)
+
     # read arguments from the command line
     args = parser.parse_args()
 
     return (get_InFileName(args),
             get_workerAction(args),
-            get_firstMergePolarFileName(args),
-            get_secondMergePolarFileName(args),
-            get_mergedPolarFileName(args),
-            get_mergeCL(args))
+            get_firstMergePolarFileNames(args),
+            get_secondMergePolarFileNames(args),
+            get_mergedPolarFileNames(args),
+            get_mergeCL(args),
+            get_reconstructionSteps(args))
 
 
 
@@ -3532,66 +3881,44 @@ def set_PolarDataFromInputFile(polarData, rootPolar, inputFile,
     polarData.Re = Re
     polarData.NCrit = 0.0
 
-    # get operating-conditions from inputfile
-    operatingConditions = inputFile.get_OperatingConditions()
+    # get op-points from inputfile
+    opPoints = inputFile.opPoints
+    op_modes = opPoints.get_column('op_mode')
 
-    target_values = operatingConditions["target_value"]
-    op_points = operatingConditions["op_point"]
-    op_modes =  operatingConditions["op_mode"]
-    #names = operatingConditions["name"] #FIXME is this neccessary any more ?
+    # append only 'spec-cl'-data # TODO append all data
+    # as op_mode is 'spec-cl', get alpha from root-polar, as we have no
+    # alpha-information for this oppoint in the input-file. Look up all
+    # op-points at once.
+    spec_cl = (op_modes == 'spec-cl')
+    CL = opPoints.get_column('op_point')[spec_cl]
+    CD = opPoints.get_column('target_value')[spec_cl]
+    alpha = rootPolar.find_alpha_From_CL(CL)
 
-    # get the number of op-points
-    numOpPoints = len(op_points)
+    # op-mode 'spec-al' needs another interpretation of values
+    #CD = polarData.find_CD_From_CL(CL) #TODO does not work, needs complete target-polar
 
-    for i in range(numOpPoints):
-        # check if the op-mode is 'spec-cl'
-        op_mode = op_modes[i]
-        op_point = op_points[i]
-        target_value = target_values[i]
+    invalid = (CD == 0.0) | np.isnan(CD)
+    for idx in np.flatnonzero(invalid):
+        ErrorMsg("CD is 0.0, division by zero!")
 
-        if (op_mode == 'spec-cl'):
-            # if op_mode is 'spec-cl', get alpha from root-polar, as we have no
-            # alpha-information for this oppoint in the input-file
-            alpha = rootPolar.find_alpha_From_CL(op_points[i])
-            # get CL, CD
-            CL = op_point
-            CD = target_value
-        else:
-            # op-mode is 'spec-al', another interpretation of values is needed
-            alpha = op_point
-            CL = target_value
-            #CD = polarData.find_CD_From_CL(CL) #TODO does not work, needs complete target-polar
-
-        # append only 'spec-cl'-data
-        if (op_mode == 'spec-cl'):# TODO append all data
-            # append values to polar
-            polarData.alpha.append(alpha)
-            polarData.CL.append(CL)
-            polarData.CD.append(CD)
-            try:
-                polarData.CL_CD.append(CL/CD)
-            except:
-                ErrorMsg("CD is 0.0, division by zero!")
-            polarData.CDp.append(0.0)
-            polarData.Cm.append(0.0)
-            polarData.Top_Xtr.append(0.0)
-            polarData.Bot_Xtr.append(0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        CL_CD = np.where(invalid, 0.0, CL / CD)
+
+    zeros = np.zeros(len(CL))
+    rows = list(zip(alpha, CL, CD, CL_CD, zeros, zeros, zeros, zeros))
 
     # Bugfix: The last line of the target-polar-file will not be shown in XFLR5,
     # add a dummy-line here
-    polarData.alpha.append(0.0)
-    polarData.CL.append(0.0)
-    polarData.CD.append(0.0)
-    polarData.CL_CD.append(0.0)
-    polarData.CDp.append(0.0)
-    polarData.Cm.append(0.0)
-    polarData.Top_Xtr.append(0.0)
-    polarData.Bot_Xtr.append(0.0)
+    rows.append((0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0))
+
+    # store all rows in polar
+    polarData.set_dataFromRows(rows)
 
 
 # merge two polar files, the merging-point will be specified as a CL-value.
 # generate a new file containing the data of the merged polar
-def merge_Polars(polarFile_1, polarFile_2 , mergedPolarFile, mergeCL):
+def merge_Polars(polarFile_1, polarFile_2 , mergedPolarFile, mergeCL,
+                 reconstructionSteps=None):
     # import polars from file
     try:
         polar_1 = polarData()
@@ -3607,30 +3934,84 @@ def merge_Polars(polarFile_1, polarFile_2 , mergedPolarFile, mergeCL):
         ErrorMsg("polarfile \'%s\' could not be imported" % polarFile_2)
         sys.exit(-1)
 
+    # reconstruct dense polars from coarse polars
+    if reconstructionSteps != None:
+        polar_1.reconstruct(reconstructionSteps[0])
+        polar_2.reconstruct(reconstructionSteps[1])
+
     # merge polars and write to file.
     # lower part (CL_min..mergeCL) comes from polar_1.
     # upper part (mergeCL..CL_max) comes from polar_2.
     # the merged values will be stored in mergedPolar.
     try:
-        mergedPolar = polar_2.merge(polar_1, mergeCL, 0)
+        mergedPolar = polar_2.merge(polar_1, mergeCL, 0, copy=False)
         mergedPolar.write_ToFile(mergedPolarFile)
     except:
         ErrorMsg("polarfile \'%s\' could not be generated" % mergedPolarFile)
         sys.exit(-1)
 
 
+# merges lists of polar files in one step, e.g. all polars of an airfoil.
+# The polar files with the same index in all lists belong together
+def merge_PolarFiles(polarFiles_1, polarFiles_2, mergedPolarFiles, mergeCL,
+                     reconstructionSteps=None):
+    if None in (polarFiles_1, polarFiles_2, mergedPolarFiles, mergeCL):
+        ErrorMsg("polar files to merge and CL-value must be specified!")
+        sys.exit(-1)
+
+    if ((len(polarFiles_1) != len(polarFiles_2)) or
+        (len(polarFiles_1) != len(mergedPolarFiles))):
+        ErrorMsg("number of polar files to merge must be equal!")
+        sys.exit(-1)
+
+    for idx in range(len(polarFiles_1)):
+        merge_Polars(polarFiles_1[idx], polarFiles_2[idx],
+                     mergedPolarFiles[idx], mergeCL, reconstructionSteps)
+
+
+
+# returns the alpha step of the template for T1/T2 polar generation
+def get_templateAlphaStep(polarType):
+    if polarType == 'T1':
+        inputFilename = get_PresetInputFileName(T1_polarInputFile)
+    else:
+        inputFilename = get_PresetInputFileName(T2_polarInputFile)
+
+    fileContent = read_TemplateFile(inputFilename)
+    return fileContent['polar_generation']['op_point_range'][2]
+
+
+# checks if a file is older than one of the files it was derived from
+def is_outdated(fileName, sourceFileNames):
+    fileTime = path.getmtime(fileName)
+    for sourceFileName in sourceFileNames:
+        if exists(sourceFileName) and (path.getmtime(sourceFileName) > fileTime):
+            return True
+    return False
+
 
 class polar_worker:
     def __init__(self, params):
         self.params = params
         self.NCrit = params.NCrit
-        self.xfoilWorkerCall = params.xfoilWorkerCall
-        self.alpha_Resolution = params.alpha_Resolution
+        self.xfoilWorkerCall = params.xfoilWorkerJobCall
         self.alphaMin_T1 = params.alphaMin
         self.alphaMin_T2 = params.alphaMin
         self.alphaMax_T1 = params.alphaMax
         self.alphaMax_T2 = params.alphaMax
         self.CL_merge = params.CL_merge
+        self.initialAlphaRange = None
+
+        # cache of already calculated polars, shared by all projects
+        self.polarCache = polar_cache.polarCache(params.polarCacheDir,
+                                                 params.polarCacheSize)
+
+        # imported polars that still have to be analysed, together with the
+        # filename and Re_T1 for the cache file
+        self.unanalysedPolars = []
+
+        # calls of the XFOIL-worker, several polars can be generated at once
+        self.workerPool = worker_calls.workerPool(params.maxParallelWorkers)
 
 
     def set_alphaMinMax(self, alphaMin_T1, alphaMax_T1, alphaMin_T2, alphaMax_T2):
@@ -3648,7 +4029,7 @@ class polar_worker:
     # name
     def update_polarInputFile(self, inputFilename, alphaMin, alphaMax):
         # read template file
-        fileContent = f90nml.read(inputFilename)
+        fileContent = read_TemplateFile(inputFilename)
 
         # get polar generation options from dictionary
         polarGenerationOptions = fileContent['polar_generation']
@@ -3663,8 +4044,9 @@ class polar_worker:
         # writeback
         polarGenerationOptions['op_point_range'] = op_point_range
 
-        # write new file
+        # write new file, the template has to be parsed again
         f90nml.write(fileContent, inputFilename, True)
+        templateCache.pop(inputFilename, None)
 
 
     # performms an update of the input file for T1 polar generation
@@ -3684,8 +4066,13 @@ class polar_worker:
 ##                                   self.alphaMax_T2)
 
 
-    # generates an input file for T1/T2 polar generation
-    def generate_PolarCreationFile(self, fileName, polarType, ReList):
+    # returns the namelist for T1/T2 polar generation. If no alpha range
+    # (alphaMin, alphaMax, alphaStep) is given, the current alpha range and
+    # the alpha step of the template are used. If polars are reconstructed,
+    # the alpha step for reconstruction is used instead. In adaptive sampling
+    # mode this alpha step is coarsened, unless 'adaptive' is False.
+    def get_PolarCreationNamelist(self, polarType, ReList, alphaRange=None,
+                                  adaptive=True):
         if polarType == 'T1':
             inputFilename = get_PresetInputFileName(T1_polarInputFile)
             alphaMin = self.alphaMin_T1
@@ -3698,7 +4085,7 @@ class polar_worker:
             ErrorMsg("unknown polarType : %s" % polarType)
 
         # read template file
-        fileContent = f90nml.read(inputFilename)
+        fileContent = read_TemplateFile(inputFilename)
 
         # get polar generation options from dictionary
         polarGenerationOptions = fileContent['polar_generation']
@@ -3706,18 +4093,40 @@ class polar_worker:
         # get oppoint range, example: op_point_range = -4, 12, 0.1
         op_point_range = polarGenerationOptions['op_point_range']
 
-        # set alpha min/max
-        op_point_range[0] = alphaMin
-        op_point_range[1] = alphaMax
+        # set alpha min/max and alpha step
+        if alphaRange != None:
+            (op_point_range[0], op_point_range[1], op_point_range[2]) = alphaRange
+        else:
+            op_point_range[0] = alphaMin
+            op_point_range[1] = alphaMax
+            if self.params.polarReconstruction:
+                op_point_range[2] = self.params.reconstructionStep
+            if adaptive and self.params.adaptiveSampling:
+                op_point_range[2] = polar_sampling.get_coarseStep(op_point_range[2])
 
         # writeback
         polarGenerationOptions['op_point_range'] = op_point_range
 
         # add list of Re-numbers
         polarGenerationOptions['polar_reynolds'] = ReList
+        return fileContent
+
+
+    # returns the alpha step of polar generation without adaptive sampling
+    def get_fineAlphaStep(self, polarType):
+        if self.params.polarReconstruction:
+            return self.params.reconstructionStep
+        return get_templateAlphaStep(polarType)
+
+
+    # generates an input file for T1/T2 polar generation
+    def generate_PolarCreationFile(self, fileName, polarType, ReList,
+                                   alphaRange=None, adaptive=True):
+        fileContent = self.get_PolarCreationNamelist(polarType, ReList,
+                                                     alphaRange, adaptive)
 
         # write new file
-        f90nml.write(fileContent, fileName, True)
+        namelist_writer.write_namelistFile(fileContent, fileName)
 
 
     def get_polarfileName_T1(self, Re):
@@ -3737,9 +4146,20 @@ class polar_worker:
         return polarfileName_T2
 
 
+    def get_polarfileName(self, polarType, Re):
+        if polarType == 'T1':
+            return self.get_polarfileName_T1(Re)
+        else:
+            return self.get_polarfileName_T2(Re)
+
+
+    def get_polarDir(self, airfoilName):
+        return '..' + bs + buildPath + bs + airfoilName + '_polars'
+
+
     def get_missingPolars(self, airfoilName, ReList_T1, ReList_T2):
         # compose polar-dir
-        polarDir = '..' + bs + buildPath + bs + airfoilName + '_polars'
+        polarDir = self.get_polarDir(airfoilName)
         ReList_T1_missing = []
         ReList_T2_missing = []
 
@@ -3756,7 +4176,58 @@ class polar_worker:
         return (ReList_T1_missing, ReList_T2_missing)
 
 
-    def import_polars(self, airfoilName, ReList_T1, ReList_T2):
+    # returns all parameters the imported and analysed polars depend on
+    def get_cacheSettings(self, Re_T1):
+        return {"NCrit": self.NCrit,
+                "CL_merge": self.CL_merge,
+                "maxRe": Re_T1,
+                "CL_min": self.params.CL_min,
+                "CL_preMaxSpeed": self.params.CL_preMaxSpeed,
+                "maxLiftDistance": self.params.maxLiftDistance}
+
+
+    # tries to import an already analysed merged polar from the binary
+    # cache file, that was written next to the polar file
+    def import_cachedPolar(self, mergedPolarfileName, Re_T1):
+        settings = self.get_cacheSettings(Re_T1)
+        cache = polar_file.read_cacheFile(mergedPolarfileName, settings)
+        if cache == None:
+            return None
+
+        InfoMsg("importing polar %s from cache..." % mergedPolarfileName)
+        mergedPolar = polarData()
+        mergedPolar.airfoilname = str(cache["airfoilname"])
+        mergedPolar.Re = float(cache["Re"])
+        mergedPolar.set_data(cache["data"])
+        mergedPolar.restore_mergeData(self.CL_merge, Re_T1)
+
+        # restore results of analysis
+        analysis = {}
+        for name in mergedPolar.analysisValues:
+            analysis[name] = cache[name].item()
+        mergedPolar.set_analysis(analysis)
+        return mergedPolar
+
+
+    # writes the data of a merged polar and the results of the analysis to
+    # a binary cache file next to the polar file
+    def export_cachedPolar(self, mergedPolarfileName, Re_T1, mergedPolar):
+        settings = self.get_cacheSettings(Re_T1)
+        arrays = mergedPolar.get_analysis()
+        arrays["airfoilname"] = mergedPolar.airfoilname
+        arrays["Re"] = mergedPolar.Re
+        arrays["data"] = mergedPolar.data
+
+        try:
+            polar_file.write_cacheFile(mergedPolarfileName, settings, arrays)
+        except (IOError, OSError):
+            WarningMsg("unable to write cache file for polar %s" % mergedPolarfileName)
+
+
+    # imports the merged polars of an airfoil. If 'analyze' is False, the
+    # analysis of the polars is deferred until analyze_importedPolars() is
+    # called, so the polars of several airfoils can be analysed at once
+    def import_polars(self, airfoilName, ReList_T1, ReList_T2, analyze=True):
         # import polars of airfoil
         NoteMsg("importing polars for airfoil %s..." % airfoilName)
 
@@ -3773,8 +4244,21 @@ class polar_worker:
             Re_T2 = ReList_T2[idx]
 
             # get filename of merged polar
-            mergedPolarfileName = polarDir + bs + ('merged_polar_%3s.txt' %\
-                                      get_ReString(Re_T2))
+            mergedPolarfileName = self.get_mergedPolarfileName(airfoilName, Re_T2)
+            fileName_T1 = polarDir + bs + self.get_polarfileName_T1(Re_T1)
+            fileName_T2 = polarDir + bs + self.get_polarfileName_T2(Re_T2)
+
+            # merged polar has to be merged again, if T1 or T2 polar changed
+            if (exists(mergedPolarfileName) and
+                is_outdated(mergedPolarfileName, [fileName_T1, fileName_T2])):
+                remove(mergedPolarfileName)
+
+            # check if merged polar was already imported and analysed
+            mergedPolar = self.import_cachedPolar(mergedPolarfileName, Re_T1)
+            if mergedPolar != None:
+                # add merged polar to list
+                merged_polars.append(mergedPolar)
+                continue
 
             # check if merged polar already exists as a file
             if exists(mergedPolarfileName):
@@ -3783,15 +4267,9 @@ class polar_worker:
                 mergedPolar.import_FromFile(mergedPolarfileName)
                 mergedPolar.restore_mergeData(self.CL_merge, Re_T1)
             else:
-                # does not exist. Read corresponding T1 polar from file
-                fileName = polarDir + bs + self.get_polarfileName_T1(Re_T1)
-                newPolar_T1 = polarData()
-                newPolar_T1.import_FromFile(fileName)
-
-                # read corresponding T2 polar from file
-                fileName = polarDir + bs + self.get_polarfileName_T2(Re_T2)
-                newPolar_T2 = polarData()
-                newPolar_T2.import_FromFile(fileName)
+                # does not exist. Read corresponding T1 / T2 polars from file
+                (newPolar_T1, newPolar_T2) =\
+                     self.import_sourcePolars(fileName_T1, fileName_T2)
 
                 # merge T1/T2 polars at Cl_merge
                 mergedPolar = newPolar_T2.merge(newPolar_T1,
@@ -3801,60 +4279,475 @@ class polar_worker:
                 # to save disk space)
                 mergedPolar.write_ToFile(mergedPolarfileName)
 
-            # change resolution of alpha for accurate conversion between CL /CD/ alpha
-            mergedPolar.set_alphaResolution(self.alpha_Resolution)
-
-            # analyze merged polar
-            mergedPolar.analyze(self.params)
+            # merged polar has to be analysed. The polar keeps the original
+            # alpha resolution, all conversions between CL / CD / alpha are
+            # done by linear interpolation on demand.
+            self.unanalysedPolars.append((mergedPolar, mergedPolarfileName, Re_T1))
 
             # add merged polar to list
             merged_polars.append(mergedPolar)
 
+        if analyze:
+            self.analyze_importedPolars()
+
         DoneMsg()
         return merged_polars
 
 
+    # imports the T1 / T2 polars a merged polar is merged from
+    def import_sourcePolars(self, fileName_T1, fileName_T2):
+        polar_T1 = polarData()
+        polar_T1.import_FromFile(fileName_T1)
+
+        polar_T2 = polarData()
+        polar_T2.import_FromFile(fileName_T2)
+
+        # reconstruct dense polars from coarse polars
+        if self.params.polarReconstruction:
+            polar_T1.reconstruct(get_templateAlphaStep('T1'))
+            polar_T2.reconstruct(get_templateAlphaStep('T2'))
+
+        return (polar_T1, polar_T2)
+
+
+    # returns the filename of a merged polar
+    def get_mergedPolarfileName(self, airfoilName, Re_T2):
+        polarDir = '..' + bs + buildPath + bs + airfoilName + '_polars'
+        return polarDir + bs + ('merged_polar_%3s.txt' % get_ReString(Re_T2))
+
+
+    # imports the source polars of the merged polars of an airfoil, that
+    # were not imported yet. Raises an exception if a polar could not be
+    # imported, the merged polars are not changed.
+    def import_mergeSources(self, airfoilName, ReList_T1, ReList_T2, polars):
+        polarDir = '..' + bs + buildPath + bs + airfoilName + '_polars'
+        sources = []
+
+        for (Re_T1, Re_T2, polar) in zip(ReList_T1, ReList_T2, polars):
+            if polar.mergeSources == None:
+                fileName_T1 = polarDir + bs + self.get_polarfileName_T1(Re_T1)
+                fileName_T2 = polarDir + bs + self.get_polarfileName_T2(Re_T2)
+                sources.append((polar, self.import_sourcePolars(fileName_T1,
+                                                                fileName_T2)))
+
+        for (polar, (polar_T1, polar_T2)) in sources:
+            polar.set_mergeSources(polar_T1, polar_T2)
+
+
+    # merges the imported polars of an airfoil again at a new CL-value, e.g.
+    # when CL_merge is tuned in the GUI. The source polars are imported with
+    # the first call and kept, so all further calls only take microseconds.
+    # The polars are not analysed, see analyze_polars().
+    def remerge_polars(self, airfoilName, ReList_T1, ReList_T2, polars, CL_merge):
+        self.import_mergeSources(airfoilName, ReList_T1, ReList_T2, polars)
+        self.CL_merge = CL_merge
+
+        for polar in polars:
+            polar.remerge(CL_merge)
+
+
+    # writes merged and analysed polars of an airfoil to their files and
+    # cache files, e.g. after they were merged again at a new CL-value
+    def export_mergedPolars(self, airfoilName, ReList_T1, ReList_T2, polars):
+        for (Re_T1, Re_T2, polar) in zip(ReList_T1, ReList_T2, polars):
+            fileName = self.get_mergedPolarfileName(airfoilName, Re_T2)
+            polar.write_ToFile(fileName)
+            self.export_cachedPolar(fileName, Re_T1, polar)
+
+
+    # analyses all imported polars that were not analysed yet in one step
+    # and stores data and results of analysis for the next start
+    def analyze_importedPolars(self):
+        polars = [polar for (polar, fileName, Re_T1) in self.unanalysedPolars]
+        analyze_polars(polars, self.params)
+
+        for (polar, fileName, Re_T1) in self.unanalysedPolars:
+            self.export_cachedPolar(fileName, Re_T1, polar)
+
+        self.unanalysedPolars = []
+
+
+    # generates the polars of a copy of an airfoil with the current alpha
+    # range. Returns the name of the copy.
     def generate_initialPolar(self, airfoilName, Re_T1, Re_T2):
         initial_airfoilName = 'initial_' + airfoilName
 
-        # create a dummy airfoil, which is a copy of the root-airfoil
-        # just to have the polars in a different folder
+        # create a copy of the airfoil just to have the polars in a different
+        # folder
         change_airfoilname.change_airfoilName(airfoilName + '.dat',
                                           initial_airfoilName + '.dat')
 
+        # remember the alpha range of the initial polars
+        self.initialAlphaRange = {'T1': self.get_alphaRange('T1'),
+                                  'T2': self.get_alphaRange('T2')}
+
         # generate missing polars now
-        generate_polars(self, initial_airfoilName, [Re_T1], [Re_T2])
+        self.generate_polars(initial_airfoilName, [Re_T1], [Re_T2])
+        return initial_airfoilName
+
+
+    # creates the polars of an airfoil from the polars of its initial copy,
+    # so they do not have to be calculated by the XFOIL-worker again. This is
+    # only possible if both airfoils have the same geometry and the alpha
+    # range of the initial polar contains the current alpha range. The polars
+    # are clipped to the current alpha range.
+    def reuse_initialPolars(self, airfoilName, Re_T1, Re_T2):
+        initial_airfoilName = 'initial_' + airfoilName
+        if self.initialAlphaRange == None:
+            return
+
+        try:
+            if (polar_cache.get_geometryHash(airfoilName + '.dat') !=
+                polar_cache.get_geometryHash(initial_airfoilName + '.dat')):
+                return
+        except IOError:
+            return
+
+        polarDir = self.get_polarDir(airfoilName)
+        initialPolarDir = self.get_polarDir(initial_airfoilName)
+
+        for (polarType, Re) in (('T1', Re_T1), ('T2', Re_T2)):
+            (alphaMin, alphaMax) = self.get_alphaRange(polarType)
+            (initialAlphaMin, initialAlphaMax) = self.initialAlphaRange[polarType]
+            fileName = polarDir + bs + self.get_polarfileName(polarType, Re)
+            initialFileName = initialPolarDir + bs + self.get_polarfileName(polarType, Re)
+
+            if (exists(fileName) or (not exists(initialFileName)) or
+                (alphaMin < initialAlphaMin) or (alphaMax > initialAlphaMax)):
+                continue
+
+            try:
+                makedirs(polarDir, exist_ok=True)
+                polar_file.write_clippedPolarFile(initialFileName, fileName,
+                                                  alphaMin, alphaMax, airfoilName)
+                self.write_alphaRange(airfoilName, polarType, Re)
+                InfoMsg("reused initial %s polar for %s" % (polarType, fileName))
+            except (IOError, ValueError):
+                WarningMsg("unable to reuse initial polar %s" % initialFileName)
 
 
     def generate_polars(self, airfoilName, ReList_T1, ReList_T2):
+        # bring existing polars to the current alpha range
+        self.update_existingPolars(airfoilName, 'T1', ReList_T1)
+        self.update_existingPolars(airfoilName, 'T2', ReList_T2)
+
         # get list of T1 polars that have to be generated
         (ReList_T1_missing, ReList_T2_missing) =\
              self.get_missingPolars(airfoilName, ReList_T1, ReList_T2)
 
-        if (len(ReList_T1_missing) > 0):
-            InfoMsg("generating missing T1 polars for airfoil %s..." % airfoilName)
-            # create inputfile for worker
-            T1_fileName = 'iPolars_T1_%s.txt' % airfoilName
-            self.generate_PolarCreationFile(T1_fileName, 'T1', ReList_T1_missing)
+        self.generate_missingPolars(airfoilName, 'T1', ReList_T1_missing)
+        self.generate_missingPolars(airfoilName, 'T2', ReList_T2_missing)
+        self.report_workerFailures()
 
-            # compose string for system-call of XFOIL-worker for T1-polar generation
-            systemString = self.xfoilWorkerCall + " -i \"%s\" -w polar -a \"%s\"" %\
-                                  (T1_fileName, airfoilName+'.dat')
-            system(systemString)
-            DoneMsg()
 
+    # generates the polars of several airfoils at once. 'airfoils' is a list
+    # of (airfoilName, ReList_T1, ReList_T2). Each polar is generated by a
+    # separate job, the jobs run concurrently, limited by the number of
+    # parallel workers.
+    def generate_polarsParallel(self, airfoils):
+        jobs = []
+        names = []
 
-        if (len(ReList_T2_missing) > 0):
-            InfoMsg("generating missing T2 polars for airfoil %s..." % airfoilName)
-            # create inputfile for worker
-            T2_fileName = 'iPolars_T2_%s.txt' % airfoilName
-            self.generate_PolarCreationFile(T2_fileName, 'T2', ReList_T2_missing)
+        for (airfoilName, ReList_T1, ReList_T2) in airfoils:
+            for Re in ReList_T1:
+                jobs.append((self.generate_polarsOfType, (airfoilName, 'T1', Re)))
+                names.append(airfoilName)
+            for Re in ReList_T2:
+                jobs.append((self.generate_polarsOfType, (airfoilName, 'T2', Re)))
+                names.append(airfoilName)
 
-            # compose string for system-call of XFOIL-worker for T1-polar generation
-            systemString = self.xfoilWorkerCall + " -i \"%s\" -w polar -a \"%s\"" %\
-                                  (T2_fileName, airfoilName+'.dat')
-            system(systemString)
-            DoneMsg()
+        NoteMsg("generating polars with up to %d parallel workers" %
+                self.workerPool.maxWorkers)
+        self.workerPool.run_jobs(jobs, names)
+        self.report_workerFailures()
+
+
+    # generates a single T1 or T2 polar, if it does not exist
+    def generate_polarsOfType(self, airfoilName, polarType, Re):
+        self.update_existingPolars(airfoilName, polarType, [Re])
+
+        fileName = self.get_polarDir(airfoilName) + bs +\
+                   self.get_polarfileName(polarType, Re)
+        if not exists(fileName):
+            self.generate_missingPolars(airfoilName, polarType, [Re])
+
+
+    # reports all failed calls of the XFOIL-worker, grouped by airfoil
+    def report_workerFailures(self):
+        failures = self.workerPool.pop_failures()
+
+        for airfoilName in failures:
+            ErrorMsg("polar generation failed for airfoil %s" % airfoilName)
+            for message in failures[airfoilName]:
+                InfoMsg(message)
+
+
+    # returns the key of a polar in the polar cache, None if the airfoil
+    # could not be read. Without alpha range, the key describes all settings
+    # a polar can be extended with.
+    def get_polarKey(self, airfoilName, polarType, Re, withAlphaRange=True):
+        namelist = self.get_PolarCreationNamelist(polarType, [Re])
+
+        if not withAlphaRange:
+            options = namelist['polar_generation']
+            options['op_point_range'] = options['op_point_range'][2:]
+
+        # adaptively sampled polars differ from uniformly sampled ones
+        if self.params.adaptiveSampling:
+            namelist = {'namelist': namelist,
+                        'adaptive_sampling': self.params.polarPointBudget}
+        try:
+            return polar_cache.get_polarKey(airfoilName + '.dat', namelist)
+        except IOError:
+            return None
+
+
+    # generates missing T1 or T2 polars. Polars that were already calculated
+    # for the same geometry and settings are taken from the polar cache, all
+    # other polars are generated by the XFOIL-worker and stored in the cache
+    def generate_missingPolars(self, airfoilName, polarType, ReList):
+        polarDir = self.get_polarDir(airfoilName)
+        polarKeys = {}
+        ReList_missing = []
+
+        for Re in ReList:
+            key = self.get_polarKey(airfoilName, polarType, Re)
+            fileName = polarDir + bs + self.get_polarfileName(polarType, Re)
+            makedirs(polarDir, exist_ok=True)
+
+            if (key != None) and self.polarCache.fetch(key, fileName, airfoilName):
+                InfoMsg("took %s polar %s from polar cache" % (polarType, fileName))
+                self.write_alphaRange(airfoilName, polarType, Re)
+            else:
+                polarKeys[Re] = key
+                ReList_missing.append(Re)
+
+        if (len(ReList_missing) == 0):
+            return
+
+        InfoMsg("generating missing %s polars for airfoil %s..." % (polarType, airfoilName))
+        self.run_xfoilWorker(airfoilName, polarType, ReList_missing)
+
+        # calculate regions of high curvature again with the fine alpha step
+        if self.params.adaptiveSampling:
+            for Re in ReList_missing:
+                self.refine_polar(airfoilName, polarType, Re)
+
+        # store generated polars in the polar cache
+        for Re in ReList_missing:
+            fileName = polarDir + bs + self.get_polarfileName(polarType, Re)
+            if (polarKeys[Re] != None) and exists(fileName):
+                self.polarCache.store(polarKeys[Re], fileName)
+
+            if exists(fileName):
+                self.write_alphaRange(airfoilName, polarType, Re)
+
+        DoneMsg()
+
+
+    # returns the working directory of the XFOIL-worker that generates the
+    # polars of an airfoil, starting with the given Re-number
+    def get_workerDir(self, airfoilName, polarType, Re):
+        return '..' + bs + buildPath + bs + 'worker_%s_%s_%s' % (polarType,
+                                               airfoilName, get_ReString(Re))
+
+
+    # runs the XFOIL-worker for polar generation. Several XFOIL-workers may
+    # run at the same time, so each of them runs in its own working
+    # directory with a copy of the airfoil. Temporary files of concurrent
+    # workers can not collide, the generated polars are moved to the polar
+    # directory of the airfoil afterwards.
+    def run_xfoilWorker(self, airfoilName, polarType, ReList, alphaRange=None):
+        workerDir = self.get_workerDir(airfoilName, polarType, ReList[0])
+        makedirs(workerDir, exist_ok=True)
+
+        # create inputfile for worker
+        inputFileName = 'iPolars_%s_%s_%s.txt' % (polarType, airfoilName,
+                                                  get_ReString(ReList[0]))
+        self.generate_PolarCreationFile(workerDir + bs + inputFileName,
+                                        polarType, ReList, alphaRange)
+        copyfile(airfoilName + '.dat', workerDir + bs + airfoilName + '.dat')
+
+        # compose string for system-call of XFOIL-worker for polar generation
+        systemString = self.xfoilWorkerCall + " -i \"%s\" -w polar -a \"%s\"" %\
+                              (inputFileName, airfoilName+'.dat')
+        self.workerPool.call(airfoilName, systemString, workerDir)
+
+        # the XFOIL-worker writes the polars to the polar directory of the
+        # airfoil, relative to its working directory
+        polarDir = self.get_polarDir(airfoilName)
+        makedirs(polarDir, exist_ok=True)
+
+        for Re in ReList:
+            polarFileName = self.get_polarfileName(polarType, Re)
+            workerFileName = (workerDir + bs + airfoilName + '_polars' + bs +
+                              polarFileName)
+            if exists(workerFileName):
+                replace(workerFileName, polarDir + bs + polarFileName)
+
+        rmtree(workerDir, ignore_errors=True)
+
+
+    # adds datapoints to an existing polar. Each alpha range
+    # (alphaStart, alphaEnd, alphaStep) is calculated by a separate call of
+    # the XFOIL-worker, all parts are spliced into the existing polar file.
+    # Returns True if the XFOIL-worker generated a part for each alpha range.
+    def add_polarSegments(self, airfoilName, polarType, Re, alphaRanges):
+        polarDir = self.get_polarDir(airfoilName)
+        fileName = polarDir + bs + self.get_polarfileName(polarType, Re)
+
+        # the XFOIL-worker always writes to the same file, so move each part
+        # out of the way before the next call
+        partFileNames = [fileName + '.part0']
+        replace(fileName, partFileNames[0])
+        complete = True
+
+        for alphaRange in alphaRanges:
+            self.run_xfoilWorker(airfoilName, polarType, [Re], alphaRange)
+
+            if exists(fileName):
+                partFileName = fileName + '.part%d' % len(partFileNames)
+                replace(fileName, partFileName)
+                partFileNames.append(partFileName)
+            else:
+                WarningMsg("XFOIL-worker did not generate alpha range "\
+                           "%.2f..%.2f of polar %s" % (alphaRange[0],
+                           alphaRange[1], fileName))
+                complete = False
+
+        polar_file.write_splicedPolarFile(partFileNames, fileName)
+
+        for partFileName in partFileNames:
+            remove(partFileName)
+
+        return complete
+
+    # refines a polar that was generated with the coarse alpha step. Regions
+    # of high curvature are calculated again with the fine alpha step by
+    # follow-up calls of the XFOIL-worker. All parts are spliced into one
+    # polar file.
+    def refine_polar(self, airfoilName, polarType, Re):
+        polarDir = self.get_polarDir(airfoilName)
+        fileName = polarDir + bs + self.get_polarfileName(polarType, Re)
+        fineStep = self.get_fineAlphaStep(polarType)
+
+        try:
+            (header, data) = polar_file.read_polarFile(fileName)
+        except (IOError, ValueError):
+            WarningMsg("unable to refine polar %s" % fileName)
+            return
+
+        regions = polar_sampling.find_denseRegions(data[:,0], data[:,1],
+                          data[:,2], fineStep, self.params.polarPointBudget)
+
+        if len(regions) == 0:
+            return
+
+        alphaRanges = [(alphaStart, alphaEnd, fineStep)
+                       for (alphaStart, alphaEnd) in regions]
+        self.add_polarSegments(airfoilName, polarType, Re, alphaRanges)
+
+        InfoMsg("refined %s polar %s in %d regions" % (polarType, fileName,
+                                                       len(regions)))
+
+
+    # returns the current alpha range of T1 or T2 polars
+    def get_alphaRange(self, polarType):
+        if polarType == 'T1':
+            return (self.alphaMin_T1, self.alphaMax_T1)
+        else:
+            return (self.alphaMin_T2, self.alphaMax_T2)
+
+
+    # records the current alpha range, or the given alpha range, and the
+    # settings of a polar next to the polar file
+    def write_alphaRange(self, airfoilName, polarType, Re, alphaRange=None):
+        polarDir = self.get_polarDir(airfoilName)
+        fileName = polarDir + bs + self.get_polarfileName(polarType, Re)
+        if alphaRange == None:
+            alphaRange = self.get_alphaRange(polarType)
+        (alphaMin, alphaMax) = alphaRange
+        settingsKey = self.get_polarKey(airfoilName, polarType, Re, False)
+        polar_file.write_rangeFile(fileName, alphaMin, alphaMax, settingsKey)
+
+
+    # brings existing T1 or T2 polars to the current alpha range. Missing
+    # alpha segments are calculated by the XFOIL-worker and added to the
+    # polar, datapoints outside the alpha range are removed. Polars that were
+    # generated with different settings are removed, so they will be
+    # generated again.
+    def update_existingPolars(self, airfoilName, polarType, ReList):
+        polarDir = self.get_polarDir(airfoilName)
+        (alphaMin, alphaMax) = self.get_alphaRange(polarType)
+        alphaStep = self.get_fineAlphaStep(polarType)
+
+        # tolerance for alpha-values that were written with 3 decimals
+        tolerance = 0.0005
+
+        for Re in ReList:
+            fileName = polarDir + bs + self.get_polarfileName(polarType, Re)
+            if not exists(fileName):
+                continue
+
+            settingsKey = self.get_polarKey(airfoilName, polarType, Re, False)
+            alphaRange = polar_file.read_rangeFile(fileName)
+
+            if alphaRange == None:
+                # polar without recorded alpha range, take the alpha range
+                # from the datapoints
+                try:
+                    (header, data) = polar_file.read_polarFile(fileName)
+                    (recordedMin, recordedMax) = (data[0,0], data[-1,0])
+                except (IOError, ValueError, IndexError):
+                    remove(fileName)
+                    continue
+            elif alphaRange["settings"] != settingsKey:
+                InfoMsg("settings of polar %s have changed, polar will be "\
+                        "generated again" % fileName)
+                remove(fileName)
+                continue
+            else:
+                recordedMin = alphaRange["alphaMin"]
+                recordedMax = alphaRange["alphaMax"]
+
+            if ((abs(alphaMin - recordedMin) < tolerance) and
+                (abs(alphaMax - recordedMax) < tolerance)):
+                continue
+
+            # calculate missing alpha segments
+            alphaRanges = []
+            if alphaMin < (recordedMin - alphaStep + tolerance):
+                alphaRanges.append((alphaMin, round(recordedMin - alphaStep, 3),
+                                    alphaStep))
+            if alphaMax > (recordedMax + alphaStep - tolerance):
+                alphaRanges.append((round(recordedMax + alphaStep, 3), alphaMax,
+                                    alphaStep))
+
+            complete = True
+            if len(alphaRanges) > 0:
+                InfoMsg("extending %s polar %s to alpha range %.1f..%.1f" %
+                        (polarType, fileName, alphaMin, alphaMax))
+                complete = self.add_polarSegments(airfoilName, polarType, Re,
+                                                  alphaRanges)
+
+            # remove datapoints outside the alpha range
+            polar_file.write_clippedPolarFile(fileName, fileName, alphaMin,
+                                              alphaMax)
+
+            if complete:
+                self.write_alphaRange(airfoilName, polarType, Re)
+                continue
+
+            # record only the alpha range that is covered by the datapoints,
+            # so the missing segment is calculated again with the next start
+            try:
+                (header, data) = polar_file.read_polarFile(fileName)
+                coveredRange = (data[0,0], data[-1,0])
+            except (IOError, ValueError, IndexError):
+                remove(fileName)
+                continue
+
+            self.write_alphaRange(airfoilName, polarType, Re, coveredRange)
 
 
     def import_strakPolars(self):
@@ -3936,6 +4829,13 @@ class strak_machine:
         # get strak-machine-parameters from file
         self.params = strak_machineParams(parameterFileName)
 
+        # writes generated files, if their content has changed
+        self.emitter = file_emitter.fileEmitter(self.params.maxParallelWorkers)
+
+        # files that were written since the last successful run of the job
+        # graph. None means that all jobs have to run, see run_strak()
+        self.changedFiles = None
+
         # get current working dir
         self.params.workingDir = getcwd()
 
@@ -3989,20 +4889,11 @@ class strak_machine:
         # generate target polars and write to file
         self.generate_targetPolars()
 
-        # generate Xoptfoil command-lines
-        commandlines = generate_Commandlines(self.params)
+        # generate the steps of the strak as graph of jobs, see run_strak()
+        self.jobGraph = generate_JobGraph(self.params)
 
-        # change working-directory
-        chdir(".." + bs)
-
-        if (self.params.generateBatch == True):
-            NoteMsg('Generating batchfiles')
-            generate_Batchfile(self.params.batchfileName, commandlines)
-            generate_StrakBatchfiles(self.params, commandlines)
-            DoneMsg()
-
-        # change working-directory to output-directory
-        chdir(self.params.workingDir + bs + buildPath)
+        # generate Xoptfoil-batchfiles with the same steps
+        self.generate_batchfiles()
 
         # create an instance of polar graph
         self.graph = polarGraph()
@@ -4071,6 +4962,7 @@ class strak_machine:
                 # could not read inputfile, create new one
                 self.generate_InputFile(idx, True)
 
+        self.emit_files()
         DoneMsg()
 
 
@@ -4078,13 +4970,28 @@ class strak_machine:
         num = len(self.params.ReNumbers)
         self.params.seedfoilNames = []
 
+        missingSeedfoils = []
+
         for idx in range(1, num):
-            Re = self.params.ReNumbers[idx]
-            seedfoilName = 'seed_%s' % get_ReString(Re)
-            self.params.seedfoilNames.append(seedfoilName)
+            (seedfoilName, geoParams) = self.get_seedfoilParams(idx)
+            self.params.seedfoilNames.append(remove_suffix(seedfoilName, '.dat'))
 
-            if (not exists(seedfoilName + '.dat')):
-                self.generate_seedfoil(idx)
+            if (not exists(seedfoilName)):
+                if self.params.inProcessSeedfoils:
+                    missingSeedfoils.append((seedfoilName, geoParams))
+                else:
+                    self.generate_seedfoil(idx)
+
+        # generate all missing seedfoils from the root airfoil in one step
+        if len(missingSeedfoils) > 0:
+            rootfoilName = self.params.airfoilNames[0] + '.dat'
+            try:
+                airfoil_geometry.generate_modifiedAirfoils(rootfoilName,
+                                                           missingSeedfoils)
+                NoteMsg("%d seedfoils were successfully generated" %
+                        len(missingSeedfoils))
+            except (IOError, ValueError):
+                ErrorMsg("seedfoils could not be generated")
 
 
     # this function will initialize the polar worker, create and import the
@@ -4096,21 +5003,16 @@ class strak_machine:
 
         # some local variables
         rootfoilName = self.params.airfoilNames[0]
-        dummy_airfoilName = 'dummy'
         Re_T1 = [self.params.maxReNumbers[0]]
         Re_T2 = [self.params.ReNumbers[0]]
 
-        # create a dummy airfoil, which is a copy of the root-airfoil with
-        # another name, just to have the polars in a different folder
-        change_airfoilname.change_airfoilName(rootfoilName + '.dat',
-                                              dummy_airfoilName + '.dat')
-
-        # generate missing polars for this airfoil now
-        self.polarWorker.generate_polars(dummy_airfoilName, Re_T1, Re_T2)
+        # generate missing polars for a copy of the root airfoil now
+        initial_airfoilName =\
+            self.polarWorker.generate_initialPolar(rootfoilName, Re_T1[0], Re_T2[0])
 
         # import polar and analyse (caution, return value is a list!)
         polarList =\
-            self.polarWorker.import_polars(dummy_airfoilName, Re_T1, Re_T2)
+            self.polarWorker.import_polars(initial_airfoilName, Re_T1, Re_T2)
 
         # get polar from list
         initialPolar = polarList[0]
@@ -4133,11 +5035,15 @@ class strak_machine:
         self.polarWorker.set_alphaMinMax(alphaMin_T1, alphaMax_T1,
                                          alphaMin_T2, alphaMax_T2)
 
+        # the polars of the root airfoil at the first Re-number do not have
+        # to be calculated again, take them from the initial polars
+        self.polarWorker.reuse_initialPolars(rootfoilName, Re_T1[0], Re_T2[0])
+
 
     def check_andGeneratePolars(self):
         # create further necessary polars of root airfoil
-        self.polarWorker.generate_polars(self.params.airfoilNames[0],
-                          self.params.maxReNumbers, self.params.ReNumbers)
+        airfoils = [(self.params.airfoilNames[0], self.params.maxReNumbers,
+                     self.params.ReNumbers)]
 
         # generate polars of seedfoils
         num = len(self.params.ReNumbers)
@@ -4145,9 +5051,10 @@ class strak_machine:
         for idx in range(1, num):
             Re_T1 = [self.params.maxReNumbers[idx]]
             Re_T2 = [self.params.ReNumbers[idx]]
+            airfoils.append((self.params.seedfoilNames[idx-1], Re_T1, Re_T2))
 
-            self.polarWorker.generate_polars(self.params.seedfoilNames[idx-1],
-                                             Re_T1, Re_T2)
+        # all polars are independent of each other, generate them at once
+        self.polarWorker.generate_polarsParallel(airfoils)
 
         # generate polar-creation files of strakfoils that will be used
         # later in the commandlines
@@ -4166,15 +5073,20 @@ class strak_machine:
                 Re_T1 = [self.params.maxReNumbers[i]]
                 Re_T2 = [self.params.ReNumbers[i]]
 
-            self.polarWorker.generate_PolarCreationFile(T1_fileName, 'T1', Re_T1)
-            self.polarWorker.generate_PolarCreationFile(T2_fileName, 'T2', Re_T2)
+            # polars of strakfoils are generated by the batch file, that can
+            # not refine them, so adaptive sampling is not possible
+            self.polarWorker.generate_PolarCreationFile(T1_fileName, 'T1',
+                                                   Re_T1, adaptive=False)
+            self.polarWorker.generate_PolarCreationFile(T2_fileName, 'T2',
+                                                   Re_T2, adaptive=False)
 
 
     def import_polars(self):
         # import polars of root airfoil
         self.params.merged_polars =\
              self.polarWorker.import_polars(self.params.airfoilNames[0],
-                             self.params.maxReNumbers, self.params.ReNumbers)
+                             self.params.maxReNumbers, self.params.ReNumbers,
+                             analyze=False)
 
         # import polars of seedfoils
         num = len(self.params.ReNumbers)
@@ -4186,10 +5098,13 @@ class strak_machine:
 
             merged_polars =\
                 self.polarWorker.import_polars(self.params.seedfoilNames[idx-1],
-                                               Re_T1, Re_T2)
+                                               Re_T1, Re_T2, analyze=False)
             # worker call will return list, containing only one element
             self.params.seedfoil_polars.append(merged_polars[0])
 
+        # analyse polars of root airfoil and seedfoils in one step
+        self.polarWorker.analyze_importedPolars()
+
         # import polars of strak-airfoils, if they exist
         self.params.strak_polars = self.polarWorker.import_strakPolars()
 
@@ -4233,8 +5148,8 @@ class strak_machine:
 
             if writeToDisk:
                 #NCrit = inputFile.get_Ncrit()#FIXME Debug
-                # physically create the file
-                inputFile.write_ToFile(iFile)
+                # physically create the file with the next call of emit_files()
+                self.emitter.add(iFile, inputFile.get_FileText())
 
             # reduce initial perturb for the next pass
             initialPerturb = initialPerturb*0.5
@@ -4252,9 +5167,29 @@ class strak_machine:
                 ErrorMsg("failed to generate target polar!")
                 pass
 
+        self.emit_files()
         DoneMsg()
 
 
+    # writes all generated files, whose content has changed. Returns 0 if
+    # all files could be written, -1 otherwise
+    def emit_files(self):
+        (written, unchanged, failed) = self.emitter.emit()
+
+        for fileName in written:
+            InfoMsg("written file %s" % fileName)
+
+        for (fileName, message) in failed.items():
+            ErrorMsg("Unable to write file %s, %s" % (fileName, message))
+
+        NoteMsg("%d file(s) written, %d file(s) unchanged" % (len(written),
+                                                            len(unchanged)))
+
+        if len(failed) > 0:
+            return -1
+        return 0
+
+
     def generate_targetPolar(self, airfoilIdx):
         # local variables
         i = airfoilIdx
@@ -4271,6 +5206,7 @@ class strak_machine:
 
         # compose polar-dir
         polarDir = self.params.buildDir + bs + airfoilName + '_polars'
+        polarFileNameAndPath = get_targetPolarFileName(self.params, i)
 
          # check if output-folder exists. If not, create folder.
         if not path.exists(polarDir):
@@ -4288,12 +5224,8 @@ class strak_machine:
         set_PolarDataFromInputFile(targetPolar, rootPolar, inputFile,
                                       airfoilName, Re[i], i)
 
-        # compose filename and path
-        polarFileNameAndPath = polarDir + bs + ('target_polar_%s.txt' %\
-                                   get_ReString(Re[i]))
-
-        # write polar to file
-        targetPolar.write_ToFile(polarFileNameAndPath)
+        # write polar to file with the next call of emit_files()
+        self.emitter.add(polarFileNameAndPath, targetPolar.get_FileText())
 
 
     def create_new_inputFile(self, i):
@@ -4407,44 +5339,132 @@ class strak_machine:
 
         return rootfoilName
 
-    def generate_seedfoil(self, airfoilIdx):
-        rootfoilName = self.params.airfoilNames[0] + '.dat'
+    # returns filename and geo parameters of the seedfoil of an airfoil
+    def get_seedfoilParams(self, airfoilIdx):
         # determine name of seedfoil according to Re-number
-        seedfoilPrefix = 'seed_%s' % get_ReString(self.params.ReNumbers[airfoilIdx])
-        seedfoilName = seedfoilPrefix + '.dat'
+        seedfoilName = 'seed_%s.dat' % get_ReString(self.params.ReNumbers[airfoilIdx])
+
         # get geoParams for the airfoil
         geoParams = self.params.get_geoParamsOfAirfoil(airfoilIdx, self.params.geoParams)
+        return (seedfoilName, geoParams)
+
+
+    # generates the seedfoil of an airfoil from the root airfoil. By default
+    # the XFOIL-worker sets thickness, camber and their positions one after
+    # another. With 'inProcessSeedfoils', all of them are set in one step by
+    # airfoil_geometry, see tests/test_airfoil_geometry.py for the parity
+    # check against the XFOIL-worker.
+    def generate_seedfoil(self, airfoilIdx):
+        rootfoilName = self.params.airfoilNames[0] + '.dat'
+        (seedfoilName, geoParams) = self.get_seedfoilParams(airfoilIdx)
+        seedfoilPrefix = remove_suffix(seedfoilName, '.dat')
 
         # unpack tuple
         (thick, thickPos, camb, cambPos) = geoParams
 
-        # worker commands are:
-        # t=yy Set thickness to xx%
-        # xt=xx Set location of maximum thickness to xx% of chord
-        # c=yy Set camber to xx%
-        # xc=xx
+        if not self.params.inProcessSeedfoils:
+            # worker commands are:
+            # t=yy Set thickness to xx%
+            # xt=xx Set location of maximum thickness to xx% of chord
+            # c=yy Set camber to xx%
+            # xc=xx
 
-        # set thickness position
-        systemString = ("%s -w set xt=%.2f -a %s -o %s\n\n" %\
-        (self.params.xfoilWorkerCall, thickPos, rootfoilName, seedfoilPrefix))
-        system(systemString)
+            # set thickness position
+            systemString = ("%s -w set xt=%.2f -a %s -o %s\n\n" %\
+            (self.params.xfoilWorkerCall, thickPos, rootfoilName, seedfoilPrefix))
+            system(systemString)
 
-        # set camber
-        systemString = ("%s -w set c=%.2f -a %s -o %s\n\n" %\
-        (self.params.xfoilWorkerCall, camb, seedfoilName, seedfoilPrefix))
-        system(systemString)
+            # set camber
+            systemString = ("%s -w set c=%.2f -a %s -o %s\n\n" %\
+            (self.params.xfoilWorkerCall, camb, seedfoilName, seedfoilPrefix))
+            system(systemString)
 
-        # set camber position
-        systemString = ("%s -w set xc=%.2f -a %s -o %s\n\n" %\
-        (self.params.xfoilWorkerCall, cambPos, seedfoilName, seedfoilPrefix))
-        system(systemString)
+            # set camber position
+            systemString = ("%s -w set xc=%.2f -a %s -o %s\n\n" %\
+            (self.params.xfoilWorkerCall, cambPos, seedfoilName, seedfoilPrefix))
+            system(systemString)
 
-        # set thickness
-        systemString = ("%s -w set t=%.2f -a %s -o %s\n\n" %\
-        (self.params.xfoilWorkerCall, thick, seedfoilName, seedfoilPrefix))
-        system(systemString)
+            # set thickness
+            systemString = ("%s -w set t=%.2f -a %s -o %s\n\n" %\
+            (self.params.xfoilWorkerCall, thick, seedfoilName, seedfoilPrefix))
+            system(systemString)
+
+            NoteMsg("seedfoil %s was successfully generated" % seedfoilName)
+            return 0
+
+        try:
+            airfoil_geometry.generate_modifiedAirfoil(rootfoilName, seedfoilName,
+                                             thick, thickPos, camb, cambPos)
+        except (IOError, ValueError):
+            ErrorMsg("seedfoil %s could not be generated" % seedfoilName)
+            return -1
 
         NoteMsg("seedfoil %s was successfully generated" % seedfoilName)
+        return 0
+
+
+    # writes a progress event of the job graph to the console and to the
+    # progress-file
+    def report_jobEvent(self, event):
+        timeString = datetime.now().strftime("%H:%M:%S.%f")[:-4]
+        line = "%s   %s: %s" % (timeString, event.kind, event.job.name)
+
+        if (event.kind == 'failed'):
+            ErrorMsg(line)
+        elif (event.kind == 'skipped'):
+            WarningMsg(line)
+        else:
+            InfoMsg(line)
+
+        with open(progressFileName, 'a') as progressFile:
+            progressFile.write(line + "\n")
+            if (event.kind != 'started'):
+                progressFile.write("main-task progress: %.1f\n" %
+                                   event.get_progress())
+
+
+    # creates all strak-airfoils and their polars by running the job graph.
+    # Independent jobs run at the same time, limited by maxParallelWorkers.
+    # Returns 0 if all jobs were successful, -1 otherwise.
+    def run_strak(self):
+        global print_disabled
+        print_disabled = False
+
+        pool = worker_calls.workerPool(self.params.maxParallelWorkers)
+        NoteMsg("Running %d jobs with up to %d parallel workers" %
+                (self.jobGraph.get_numJobs(), pool.maxWorkers))
+
+        # start with an empty progress-file
+        if exists(progressFileName):
+            remove(progressFileName)
+
+        # after a successful run only the jobs whose input files were written
+        # since then have to run again, and all jobs that depend on them
+        writtenFiles = self.emitter.pop_writtenFiles()
+        if self.changedFiles != None:
+            self.changedFiles |= writtenFiles
+
+        states = self.jobGraph.run(pool, self.report_jobEvent, self.changedFiles)
+
+        # report all failures, grouped by airfoil
+        failures = pool.pop_failures()
+        for airfoilName in failures:
+            ErrorMsg("strak failed for airfoil %s" % airfoilName)
+            for message in failures[airfoilName]:
+                InfoMsg(message)
+
+        numUpToDate = list(states.values()).count('upToDate')
+        numFinished = list(states.values()).count('finished') + numUpToDate
+        if (numFinished < len(states)):
+            ErrorMsg("%d of %d jobs were finished" % (numFinished, len(states)))
+            return self.exit_action(-1)
+
+        if (numUpToDate > 0):
+            InfoMsg("%d job(s) were up to date" % numUpToDate)
+
+        self.changedFiles = set()
+        DoneMsg()
+        return self.exit_action(0)
 
 
     def exit_action(self, value):
@@ -4531,11 +5551,11 @@ class strak_machine:
             self.exit_action(-1)
 
         # copy the target values
-        for idx in range(num):
-            target = targetValues[idx]
-            values = (target["type"], target["oppoint"], target["target"],
-                      target["weighting"])
-            inputFile.set_oppointValues(idx, values)
+        inputFile.set_allOppointValues(
+                    [target["type"] for target in targetValues],
+                    [target["oppoint"] for target in targetValues],
+                    [target["target"] for target in targetValues],
+                    [target["weighting"] for target in targetValues])
 
         return self.exit_action(0)
 
@@ -4592,6 +5612,103 @@ class strak_machine:
             ErrorMsg("Unable to generate target polars")
 
 
+    def get_CL_merge(self):
+        return self.params.CL_merge
+
+
+    # returns airfoil name, Re-numbers and merged polars of the root airfoil
+    # and of all seedfoils
+    def get_mergedPolarSets(self):
+        params = self.params
+        num = len(params.ReNumbers)
+        polarSets = [(params.airfoilNames[0], params.maxReNumbers,
+                      params.ReNumbers, params.merged_polars)]
+
+        for idx in range(1, num):
+            polarSets.append((params.seedfoilNames[idx-1],
+                              [params.maxReNumbers[idx]], [params.ReNumbers[idx]],
+                              [params.seedfoil_polars[idx-1]]))
+        return polarSets
+
+
+    # merges the polars of the root airfoil and the seedfoils again at a new
+    # CL-value, analyses them and recalculates the target values, target
+    # polars, input files and jobs, e.g. when CL_merge is tuned in the GUI.
+    # The new CL-value is written to the parameter file by save().
+    def set_CL_merge(self, CL_merge):
+        self.entry_action(0)
+        params = self.params
+        polarSets = self.get_mergedPolarSets()
+
+        # import all source polars first, so either all polars or no polar
+        # is merged at the new CL-value
+        try:
+            for polarSet in polarSets:
+                self.polarWorker.import_mergeSources(*polarSet)
+        except:
+            ErrorMsg("Unable to merge polars at CL_merge %f" % CL_merge)
+            return self.exit_action(-1)
+
+        for polarSet in polarSets:
+            self.polarWorker.remerge_polars(*polarSet, CL_merge)
+
+        params.CL_merge = CL_merge
+        params.CL_mergeChanged = True
+
+        # analyse all polars in one step and update targets
+        analyze_polars(params.merged_polars + params.seedfoil_polars, params)
+        params.calculate_MainTargetValues()
+        self.generate_targetPolars()
+
+        # op-points below the new CL-value are "type1" op-points now
+        for idx in range(len(params.ReNumbers)):
+            params.inputFiles[idx].adapt_ReNumbers(params.merged_polars[idx])
+
+        # the merge-jobs use the new CL-value
+        self.jobGraph = generate_JobGraph(params)
+        return self.exit_action(0)
+
+
+    # writes a CL_merge that was tuned in the GUI to the parameter file, the
+    # merged polars to their files and generates the batchfiles again
+    def save_CL_merge(self):
+        NoteMsg("Saving CL_merge %f" % self.params.CL_merge)
+
+        try:
+            for polarSet in self.get_mergedPolarSets():
+                self.polarWorker.export_mergedPolars(*polarSet)
+        except (IOError, OSError):
+            ErrorMsg("Unable to write merged polars")
+            return -1
+
+        result = self.params.write_CL_mergeToFile()
+        if result != 0:
+            return result
+
+        self.generate_batchfiles()
+        self.params.CL_mergeChanged = False
+        DoneMsg()
+        return 0
+
+
+    # generates the batchfiles, if enabled. Must be called from the
+    # build-dir.
+    def generate_batchfiles(self):
+        if (self.params.generateBatch == True):
+            commandlines = generate_Commandlines(self.params)
+
+            # change working-directory
+            chdir(".." + bs)
+
+            NoteMsg('Generating batchfiles')
+            generate_Batchfile(self.params.batchfileName, commandlines)
+            generate_StrakBatchfiles(self.params, commandlines)
+            DoneMsg()
+
+            # change working-directory to output-directory
+            chdir(self.params.workingDir + bs + buildPath)
+
+
     def get_inputfileName(self, airfoilIdx):
         idx = ((airfoilIdx + 1) * self.params.optimizationPasses) - 1
         fileName = self.params.inputFileNames[idx]
@@ -4629,6 +5746,15 @@ class strak_machine:
         # write target polar to file
         self.generate_targetPolar(airfoilIdx)
 
+        # write all changed files
+        if self.emit_files() != 0:
+            return self.exit_action(-1)
+
+        # write a tuned CL_merge, all airfoils depend on it
+        if self.params.CL_mergeChanged:
+            if self.save_CL_merge() != 0:
+                return self.exit_action(-1)
+
         # write geometry params of the airfoil to parameterfile
         result = self.params.write_geoParamsToFile(airfoilIdx)
 
@@ -4658,13 +5784,19 @@ if __name__ == "__main__":
     init()
 
     # get command-line-arguments or user-input
-    (strakDataFileName, workerAction, polarFile_1, polarFile_2,
-      mergedPolarFile, mergeCL) = get_Arguments()
+    (strakDataFileName, workerAction, polarFiles_1, polarFiles_2,
+      mergedPolarFiles, mergeCL, reconstructionSteps) = get_Arguments()
 
     # decide what action to perform.
     if (workerAction == 'merge'):
-        # do nothing else but merging the polars
-        merge_Polars(polarFile_1, polarFile_2 , mergedPolarFile, mergeCL)
+        # do nothing else but merging the polars, all pairs of polars in one
+        # process
+        merge_PolarFiles(polarFiles_1, polarFiles_2, mergedPolarFiles, mergeCL,
+                         reconstructionSteps)
         exit(0)
+    elif (workerAction == 'strak'):
+        # create all strak-airfoils without batchfile
+        machine = strak_machine(strakDataFileName)
+        exit(machine.run_strak())
 
 
@@ -103,6 +103,9 @@ class control_frame():
         self.add_referencePolarsCheckbox(self.frame_top)
 
         self.nextRow = 0
+        # add CL_merge-entry to lower frame (scrollable)
+        self.add_CL_mergeEntry(self.frame_bottom)
+
         # add geo-entries to lower frame (scrollable)
         self.add_geoEntries(self.frame_bottom)
 
@@ -228,6 +231,45 @@ class control_frame():
     def get_unsavedChangesFlags(self):
         return (self.unsavedChangesFlags)
 
+    def add_CL_mergeEntry(self, frame):
+        # create text-Var to interact with entry
+        self.CL_merge_txt = tk.StringVar(frame,
+                  value=round(self.strak_machine.get_CL_merge(), CL_decimals))
+
+        # create entry
+        self.CL_mergeEntry = customtkinter.CTkEntry(frame, show=None,
+             textvariable = self.CL_merge_txt, text_font=('Roboto Medium', 11),
+             width=55, height=16)
+
+        # bind entry to "Enter"-Message
+        self.CL_mergeEntry.bind('<Return>', self.update_CL_merge)
+
+        # add label
+        self.CL_merge_label = customtkinter.CTkLabel(master=frame,
+                text="CL merge", text_font=("Roboto Medium", 11), anchor="e")
+
+        # place widgets inside frame
+        self.place_3_widgets(self.CL_merge_label, self.CL_mergeEntry, None)
+
+
+    def update_CL_merge(self, command):
+        # convert string to float
+        CL_merge = round(float(self.CL_mergeEntry.get()), CL_decimals)
+
+        # merge the polars again, this will also update the target polars
+        if self.strak_machine.set_CL_merge(CL_merge) != 0:
+            CL_merge = self.strak_machine.get_CL_merge()
+        else:
+            # the input files of all strak airfoils depend on CL_merge
+            for airfoilIdx in range(1, len(self.unsavedChangesFlags) + 1):
+                self.set_unsavedChangesFlag(airfoilIdx)
+
+        self.CL_merge_txt.set(round(CL_merge, CL_decimals))
+
+        # notify the diagram frame about the change
+        self.master.set_updateNeeded()
+
+
     def add_geoEntries(self, frame):
         # get initial geo parameters
         self.geoParameters = self.strak_machine.get_geoParams(self.master.airfoilIdx)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+#  This file is part of "The Strak Machine".
+
+#  "The Strak Machine" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+
+#  "The Strak Machine" is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+#  You should have received a copy of the GNU General Public License
+#  along with "The Strak Machine".  If not, see <http://www.gnu.org/licenses/>.
+
+#  Copyright (C) 2020-2022 Matthias Boese
+
+import subprocess
+import threading
+from os import cpu_count
+from concurrent.futures import ThreadPoolExecutor
+
+# number of lines of the output of a failed worker call that are reported
+numReportedLines = 5
+
+
+################################################################################
+#
+# workerResult class
+#
+# result of a single call of an external worker, e.g. the XFOIL-worker
+#
+################################################################################
+class workerResult:
+    def __init__(self, name, commandLine, returnCode, stdout, stderr):
+        self.name = name
+        self.commandLine = commandLine
+        self.returnCode = returnCode
+        self.stdout = stdout
+        self.stderr = stderr
+
+
+    def is_ok(self):
+        return (self.returnCode == 0)
+
+
+    # returns the exit code and the last lines of the error output. If there
+    # is no error output, the last lines of the normal output are taken.
+    def get_message(self):
+        output = self.stderr.strip()
+        if output == '':
+            output = self.stdout.strip()
+
+        lines = output.splitlines()[-numReportedLines:]
+        message = "\"%s\" failed with exit code %d" % (self.commandLine,
+                                                       self.returnCode)
+        return "\n".join([message] + lines)
+
+
+################################################################################
+#
+# workerPool class
+#
+# Runs jobs concurrently in threads, at most 'maxWorkers' jobs at a time. A
+# job is a python function that calls external workers via call(). The
+# results of all failed calls are collected under the name of the call, e.g.
+# the name of the airfoil.
+#
+################################################################################
+class workerPool:
+    def __init__(self, maxWorkers=None):
+        # default is one worker for each CPU
+        if (maxWorkers == None) or (maxWorkers < 1):
+            maxWorkers = cpu_count() or 1
+
+        self.maxWorkers = maxWorkers
+        self.failures = {}
+        self.lock = threading.Lock()
+
+
+    # calls an external worker and waits until it has finished. The output
+    # of the worker is captured, so the output of concurrent workers is not
+    # mixed up. 'workingDir' is the working directory of the worker, default
+    # is the current working directory.
+    def call(self, name, commandLine, workingDir=None):
+        process = subprocess.run(commandLine, shell=True, cwd=workingDir,
+                                 stdout=subprocess.PIPE,
+                                 stderr=subprocess.PIPE,
+                                 universal_newlines=True, errors='replace')
+
+        result = workerResult(name, commandLine, process.returncode,
+                              process.stdout, process.stderr)
+
+        if not result.is_ok():
+            self.add_failure(name, result.get_message())
+
+        return result
+
+
+    # records a failure under the given name
+    def add_failure(self, name, message):
+        with self.lock:
+            self.failures.setdefault(name, []).append(message)
+
+
+    # runs all jobs and waits until all of them have finished. 'jobs' is a
+    # list of (function, args). Exceptions of a job are recorded as failure
+    # under the name 'names[idx]' of the job.
+    def run_jobs(self, jobs, names):
+        with ThreadPoolExecutor(max_workers=self.maxWorkers) as executor:
+            futures = [executor.submit(function, *args)
+                       for (function, args) in jobs]
+
+        for (future, name) in zip(futures, names):
+            exception = future.exception()
+            if exception != None:
+                self.add_failure(name, "%s: %s" % (type(exception).__name__,
+                                                   exception))
+
+
+    # returns all recorded failures as a dictionary of names and lists of
+    # messages and clears them
+    def pop_failures(self):
+        with self.lock:
+            failures = self.failures
+            self.failures = {}
+        return failures
@@ -25,6 +25,7 @@ from math import log10, floor, sqrt
 from sys import version_info
 import time
 import os
+import polar_file
 
 # Directory where all the Xoptfoil-FX data files coming from 
 
@@ -460,70 +461,30 @@ def read_full_polar(filename, designcounter):
   xtrb = []
   re = 0.
 
-  # Try to open the file
+  # Try to read the file, datapoints will be sorted by alpha
   try:
-    f = open(filename)
+    header, data = polar_file.read_polarFile(filename)
   except IOError:
     ioerror = 1
     return alpha, cl, cd, cm, xtrt, xtrb, re, ioerror
-
-  # Read first line - check designcounter -return if its not the desired one '
-  textline = f.readline()
-  line = textline.split()
-  if ((len (line) != 3) or (int(line[2]) != designcounter)):
+  except ValueError:
+    # Error if zone has not been found in the file
     ioerror = 2
     return alpha, cl, cd, cm, xtrt, xtrb, re, ioerror
-  textline = f.readline()
-  textline = f.readline()
-  textline = f.readline()
-  textline = f.readline()
-  textline = f.readline()
-  textline = f.readline()
-  # now we got the line with Re number 
-  # Mach =   0.000     Re =     0.600 e 6     Ncrit =   7.000
-  textline = f.readline()
-  re =  float (textline.split('Re =')[1].split()[0]) * 1000000.0
-
-  # Read lines until we get to the correct zone
-  zonetitle = " -------"
-  zonefound = False
-  zonelen = len(zonetitle)
-  last_alpha = -1000.0              # dummy start value
-
-  for textline in f:
-    if (not zonefound):
-      # Check for the zone we are looking for
-      if (textline[0:zonelen] == zonetitle): 
-        zonefound = True
-    else:
-
-      # Otherwise read polars
-      line = textline.split()
-      current_alpha = float(line[0])
-
-      # op points could be mixed up in order 
-      if (current_alpha < last_alpha):
-        alpha.insert(0,float(line[0]))
-        cl.insert(0,float(line[1]))
-        cd.insert(0,float(line[2]))
-        cm.insert(0,float(line[4]))
-        xtrt.insert(0,float(line[5]))
-        xtrb.insert(0,float(line[6]))
-      else:
-        alpha.append(float(line[0]))
-        cl.append(float(line[1]))
-        cd.append(float(line[2]))
-        cm.append(float(line[4]))
-        xtrt.append(float(line[5]))
-        xtrb.append(float(line[6]))
 
-      last_alpha = current_alpha 
-
-  # Error if zone has not been found after reading the file
-  if (not zonefound):
+  # Check designcounter in first line - return if its not the desired one
+  line = header["title"].split()
+  if ((len (line) != 3) or (int(line[2]) != designcounter)):
     ioerror = 2
+    return alpha, cl, cd, cm, xtrt, xtrb, re, ioerror
 
-  f.close()
+  re = header["Re"]
+  alpha = data[:,0]
+  cl = data[:,1]
+  cd = data[:,2]
+  cm = data[:,4]
+  xtrt = data[:,5]
+  xtrb = data[:,6]
 
   return alpha, cl, cd, cm, xtrt, xtrb, re, ioerror
 
@@ -0,0 +1,72 @@
+#  This file is part of "The Strak Machine".
+
+#  "The Strak Machine" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+
+#  "The Strak Machine" is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+#  You should have received a copy of the GNU General Public License
+#  along with "The Strak Machine".  If not, see <http://www.gnu.org/licenses/>.
+
+#  Copyright (C) 2020-2022 Matthias Boese
+
+# Replaces the XFOIL-worker for polar generation in the tests:
+#   fake_xfoil_worker.py -i <inputfile> -w polar -a <airfoil>.dat
+# Like XFOIL, it writes a temporary file into its working directory and fails,
+# if a concurrent worker changes it. The polars are written to the polar
+# directory of the airfoil, relative to the working directory.
+# If the environment variable FAKE_WORKER_ALPHA_LIMIT is set, it fails without
+# writing polars for alpha ranges that start below this limit, like XFOIL
+# does if it does not converge.
+
+import sys
+import time
+from os import environ, makedirs, path
+
+import f90nml
+
+NCrit = 9.0
+
+args = sys.argv
+airfoilName = args[args.index('-a') + 1][:-len('.dat')]
+options = f90nml.read(args[args.index('-i') + 1])['polar_generation']
+ReList = options['polar_reynolds']
+if not isinstance(ReList, list):
+    ReList = [ReList]
+
+signature = "%s %s" % (airfoilName, ReList)
+with open('temp.txt', 'w') as fileHandle:
+    fileHandle.write(signature)
+time.sleep(0.2)
+with open('temp.txt') as fileHandle:
+    if fileHandle.read() != signature:
+        sys.exit("temporary file was changed by another worker")
+
+polarDir = airfoilName + '_polars'
+makedirs(polarDir, exist_ok=True)
+(alphaMin, alphaMax, alphaStep) = options['op_point_range']
+
+alphaLimit = environ.get('FAKE_WORKER_ALPHA_LIMIT')
+if (alphaLimit != None) and (alphaMin < float(alphaLimit)):
+    sys.exit("no convergence at alpha %.2f" % alphaMin)
+
+numPoints = int(round((alphaMax - alphaMin) / alphaStep)) + 1
+
+for Re in ReList:
+    Re = int(round(Re / 1000.0))
+    fileName = "T%d_Re%d.%03d_M0.00_N%.1f.txt" % (options['type_of_polar'],
+                                                  Re / 1000, Re % 1000, NCrit)
+
+    with open(path.join(polarDir, fileName), 'w') as fileHandle:
+        fileHandle.write(" Calculated polar for: %s\n\n" % airfoilName)
+        fileHandle.write("  alpha     CL        CD       CDp       Cm    Top Xtr Bot Xtr\n")
+        fileHandle.write(" ------- -------- --------- --------- -------- ------- -------\n")
+        for idx in range(numPoints):
+            alpha = alphaMin + idx * alphaStep
+            fileHandle.write("%8.3f %8.4f %9.5f %9.5f %8.4f %7.4f %7.4f\n" %
+                             (alpha, 0.1 * alpha + 0.2, 0.01, 0.005, -0.05, 0.5, 0.5))
@@ -0,0 +1,148 @@
+#  This file is part of "The Strak Machine".
+
+#  "The Strak Machine" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+
+#  "The Strak Machine" is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+#  You should have received a copy of the GNU General Public License
+#  along with "The Strak Machine".  If not, see <http://www.gnu.org/licenses/>.
+
+#  Copyright (C) 2020-2022 Matthias Boese
+
+# Tests of the in-process seedfoil generation and assessment. The parity
+# checks against the XFOIL-worker ('xfoil_worker -w set' as used by
+# generate_seedfoil, 'xfoil_worker -w check' as used by
+# assess_airfoilWithWorker) can only run where the worker executable can be
+# started, they are skipped otherwise.
+
+import subprocess
+import sys
+from os import path
+from shutil import copyfile
+
+import pytest
+
+import airfoil_geometry
+import strak_machine
+from conftest import scriptsDir
+
+rootDir = path.dirname(scriptsDir)
+xfoilWorker = path.join(rootDir, 'bin', 'xfoil_worker.exe')
+
+# bundled airfoils that are used as root airfoils
+airfoilFiles = [path.join(rootDir, 'airfoil_library', *parts) for parts in (
+                ('F3B_F3F', 'JX', 'JX-GS', 'JX-GS-06.dat'),
+                ('F3B_F3F', 'JX', 'JX-GS', 'JX-GS-04.dat'))]
+
+# changes of the geometry parameters of the root airfoil, in % of chord
+geoChanges = [(-1.0, 0.0, 0.0, 0.0), (-1.5, 2.0, -0.3, 5.0), (0.5, -2.0, 0.2, -5.0)]
+
+# tolerances of the parity check: geometry parameters in % of chord, maximum
+# deviation of the y-coordinates relative to the chord
+geoTolerance = 0.05
+positionTolerance = 1.0
+deviationTolerance = 0.001
+
+workerRunnable = (sys.platform == 'win32') and path.exists(xfoilWorker)
+
+
+# returns the geometry parameters of an airfoil file in % of chord
+def get_geoParams(fileName):
+    return tuple(value * 100.0 for value in
+                 airfoil_geometry.read_airfoil(fileName).get_geometry())
+
+
+def get_targetParams(fileName, changes):
+    return tuple(round(value + change, 2) for (value, change) in
+                 zip(get_geoParams(fileName), changes))
+
+
+# generates a seedfoil with the XFOIL-worker, like generate_seedfoil does
+def generate_workerSeedfoil(workDir, rootfoilName, seedfoilPrefix, geoParams):
+    (thick, thickPos, camb, cambPos) = geoParams
+    inputName = rootfoilName
+    for command in ('xt=%.2f' % thickPos, 'c=%.2f' % camb, 'xc=%.2f' % cambPos,
+                    't=%.2f' % thick):
+        subprocess.run([xfoilWorker, '-w', 'set', command, '-a', inputName,
+                        '-o', seedfoilPrefix], cwd=workDir, check=True,
+                       input='y\n', text=True, capture_output=True)
+        inputName = seedfoilPrefix + '.dat'
+
+
+@pytest.mark.parametrize('airfoilFile', airfoilFiles)
+@pytest.mark.parametrize('changes', geoChanges)
+def test_seedfoilHasRequestedGeometry(tmp_path, airfoilFile, changes):
+    targetParams = get_targetParams(airfoilFile, changes)
+    seedfoilName = str(tmp_path / 'seed.dat')
+    airfoil_geometry.generate_modifiedAirfoil(airfoilFile, seedfoilName, *targetParams)
+
+    (thick, thickPos, camb, cambPos) = get_geoParams(seedfoilName)
+    assert abs(thick - targetParams[0]) < geoTolerance
+    assert abs(thickPos - targetParams[1]) < positionTolerance
+    assert abs(camb - targetParams[2]) < geoTolerance
+    assert abs(cambPos - targetParams[3]) < positionTolerance
+
+
+@pytest.mark.skipif(not workerRunnable, reason="xfoil_worker can not be started")
+@pytest.mark.parametrize('airfoilFile', airfoilFiles)
+@pytest.mark.parametrize('changes', geoChanges)
+def test_parityWithXfoilWorker(tmp_path, airfoilFile, changes):
+    targetParams = get_targetParams(airfoilFile, changes)
+    copyfile(airfoilFile, str(tmp_path / 'root.dat'))
+
+    generate_workerSeedfoil(str(tmp_path), 'root.dat', 'worker_seed', targetParams)
+    airfoil_geometry.generate_modifiedAirfoil(str(tmp_path / 'root.dat'),
+                               str(tmp_path / 'seed.dat'), *targetParams)
+
+    workerParams = get_geoParams(str(tmp_path / 'worker_seed.dat'))
+    seedParams = get_geoParams(str(tmp_path / 'seed.dat'))
+    for (value, workerValue, tolerance) in zip(seedParams, workerParams,
+               (geoTolerance, positionTolerance, geoTolerance, positionTolerance)):
+        assert abs(value - workerValue) < tolerance
+
+    deviation = airfoil_geometry.get_maxDeviation(
+                    airfoil_geometry.read_airfoil(str(tmp_path / 'seed.dat')),
+                    airfoil_geometry.read_airfoil(str(tmp_path / 'worker_seed.dat')))
+    assert deviation < deviationTolerance
+
+
+# output of 'xfoil_worker -w check' for an airfoil that was smoothed, each
+# side is assessed before and after smoothing
+smoothedCheckLines = [
+    "   Top side:    Reversals  2   Curvature  0.31\n",
+    "   smoothed:    Reversals  0   Curvature  0.30\n",
+    "   Bottom side: Reversals  3   Curvature  0.12\n",
+    "   smoothed:    Reversals  1   Curvature  0.11\n"]
+
+
+def test_parseAssessmentResults():
+    assert strak_machine.parse_assessmentResults(smoothedCheckLines) == (0, 1, True)
+
+    lines = [smoothedCheckLines[0], smoothedCheckLines[2],
+             "   perfect surface quality\n"]
+    assert strak_machine.parse_assessmentResults(lines) == (2, 3, False)
+
+    assert strak_machine.parse_assessmentResults(smoothedCheckLines[:1]) ==\
+                                                           (None, None, True)
+
+
+@pytest.mark.skipif(not workerRunnable, reason="xfoil_worker can not be started")
+@pytest.mark.parametrize('airfoilFile', airfoilFiles)
+def test_assessmentParityWithXfoilWorker(tmp_path, airfoilFile):
+    copyfile(airfoilFile, str(tmp_path / 'root.dat'))
+    result = subprocess.run([xfoilWorker, '-w', 'check', '-v', '-a', 'root.dat'],
+                            cwd=str(tmp_path), check=True, input='y\n',
+                            text=True, capture_output=True)
+
+    assessment = airfoil_geometry.assess_airfoil(str(tmp_path / 'root.dat'))
+    workerAssessment = strak_machine.parse_assessmentResults(
+                                     result.stdout.splitlines())
+
+    assert (assessment["reversals_top"], assessment["reversals_bot"],
+            assessment["smoothingNecessary"]) == workerAssessment
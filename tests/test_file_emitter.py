@@ -0,0 +1,106 @@
+#  This file is part of "The Strak Machine".
+
+#  "The Strak Machine" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+
+#  "The Strak Machine" is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+#  You should have received a copy of the GNU General Public License
+#  along with "The Strak Machine".  If not, see <http://www.gnu.org/licenses/>.
+
+#  Copyright (C) 2020-2022 Matthias Boese
+
+# Tests of the file emitter, that only writes generated files whose content
+# has changed.
+
+import locale
+from os import listdir, stat, utime
+
+import file_emitter
+
+text = "&optimization_options\n    search_type = 'global_and_local'\n/\n"
+
+
+def emit(emitter, fileName, content):
+    emitter.add(fileName, content)
+    return emitter.emit()
+
+
+def test_writesLocaleEncoding(tmp_path):
+    fileName = str(tmp_path / 'iOpt.txt')
+    emitter = file_emitter.fileEmitter(1)
+    (written, unchanged, failed) = emit(emitter, fileName, text)
+    assert (written, unchanged, failed) == ([fileName], [], {})
+    assert emitter.pop_writtenFiles() == {fileName}
+    assert emitter.pop_writtenFiles() == set()
+
+    # the same bytes as a file written in text mode
+    textFileName = str(tmp_path / 'iOpt_text.txt')
+    with open(textFileName, 'w') as fileHandle:
+        fileHandle.write(text)
+    with open(textFileName, 'rb') as fileHandle:
+        expected = fileHandle.read()
+    with open(fileName, 'rb') as fileHandle:
+        assert fileHandle.read() == expected
+
+    encoding = locale.getpreferredencoding(False)
+    assert file_emitter.get_fileBytes("ä") == "ä".encode(encoding)
+
+
+def test_unchangedFileIsNotWritten(tmp_path):
+    fileName = str(tmp_path / 'iOpt.txt')
+    emitter = file_emitter.fileEmitter(2)
+    emit(emitter, fileName, text)
+    emitter.pop_writtenFiles()
+    mtime = stat(fileName).st_mtime_ns
+
+    (written, unchanged, failed) = emit(emitter, fileName, text)
+    assert (written, unchanged, failed) == ([], [fileName], {})
+    assert stat(fileName).st_mtime_ns == mtime
+    assert emitter.pop_writtenFiles() == set()
+
+    # a new emitter, e.g. after a restart, hashes the file
+    emitter = file_emitter.fileEmitter(2)
+    assert emit(emitter, fileName, text) == ([], [fileName], {})
+    assert stat(fileName).st_mtime_ns == mtime
+
+
+def test_fileChangedBySomeoneElseIsWrittenAgain(tmp_path):
+    fileName = str(tmp_path / 'iOpt.txt')
+    emitter = file_emitter.fileEmitter(2)
+    emit(emitter, fileName, text)
+    emitter.pop_writtenFiles()
+
+    # same size, but different content and modification time
+    with open(fileName, 'w') as fileHandle:
+        fileHandle.write(text.replace('global', 'GLOBAL'))
+    fileStat = stat(fileName)
+    utime(fileName, ns=(fileStat.st_atime_ns, fileStat.st_mtime_ns + 1000000))
+
+    (written, unchanged, failed) = emit(emitter, fileName, text)
+    assert (written, unchanged, failed) == ([fileName], [], {})
+    assert emitter.pop_writtenFiles() == {fileName}
+    with open(fileName) as fileHandle:
+        assert fileHandle.read() == text
+
+
+def test_unwritableFileFails(tmp_path):
+    # a directory can not be replaced by a file
+    fileName = str(tmp_path / 'iOpt.txt')
+    (tmp_path / 'iOpt.txt').mkdir()
+    otherFileName = str(tmp_path / 'iOpt_1.txt')
+
+    emitter = file_emitter.fileEmitter(2)
+    emitter.add(fileName, text)
+    emitter.add(otherFileName, text)
+    (written, unchanged, failed) = emitter.emit()
+
+    assert written == [otherFileName]
+    assert list(failed) == [fileName]
+    assert emitter.pop_writtenFiles() == {otherFileName}
+    assert sorted(listdir(str(tmp_path))) == ['iOpt.txt', 'iOpt_1.txt']
@@ -0,0 +1,61 @@
+#  This file is part of "The Strak Machine".
+
+#  "The Strak Machine" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+
+#  "The Strak Machine" is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+#  You should have received a copy of the GNU General Public License
+#  along with "The Strak Machine".  If not, see <http://www.gnu.org/licenses/>.
+
+#  Copyright (C) 2020-2022 Matthias Boese
+
+# Import-time budget of the worker entry points and the exporters, measured
+# with python -X importtime. numpy is needed by every code path and is not
+# counted, everything else that is imported has to fit into the budget.
+
+import subprocess
+import sys
+
+import pytest
+
+from conftest import scriptsDir
+
+# import time in ms, without numpy
+importTimeBudget = 150.0
+
+# modules that must only be imported by the code paths that need them
+heavyModules = ('matplotlib', 'scipy', 'xoptfoil_visualizer-jx')
+
+
+# returns a dictionary of all imported modules and their cumulative
+# import time in ms
+def measure_importTime(moduleName):
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                             'import %s' % moduleName], cwd=scriptsDir,
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        (selfTime, cumulative, name) = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative) / 1000.0
+    return times
+
+
+@pytest.mark.parametrize('moduleName', ['strak_machine', 'XFLR5_export',
+                         'FLZ_Vortex_export', 'Strakmachine_export'])
+def test_importTime(moduleName):
+    times = measure_importTime(moduleName)
+
+    for name in times:
+        assert name.split('.')[0] not in heavyModules
+
+    importTime = times[moduleName] - times.get('numpy', 0.0)
+    assert importTime < importTimeBudget, ("import of %s took %.1f ms" %
+                                           (moduleName, importTime))
@@ -0,0 +1,241 @@
+#  This file is part of "The Strak Machine".
+
+#  "The Strak Machine" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+
+#  "The Strak Machine" is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+#  You should have received a copy of the GNU General Public License
+#  along with "The Strak Machine".  If not, see <http://www.gnu.org/licenses/>.
+
+#  Copyright (C) 2020-2022 Matthias Boese
+
+# Tests of the job graph.
+
+import sys
+import threading
+import time
+from os import listdir
+
+import pytest
+
+import file_emitter
+import job_graph
+import worker_calls
+
+
+# records the start and the end of a job
+class jobRecorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.events = []
+
+
+    def run(self, name, fail=False):
+        with self.lock:
+            self.events.append(('start', name))
+        time.sleep(0.05)
+        with self.lock:
+            self.events.append(('end', name))
+        if fail:
+            raise RuntimeError("%s failed" % name)
+
+
+    def get_index(self, kind, name):
+        return self.events.index((kind, name))
+
+
+# creates the output file of a job
+def create_file(fileName):
+    with open(fileName, 'w') as fileHandle:
+        fileHandle.write("airfoil\n")
+
+
+# graph of a strak with two airfoils: each one is created by Xoptfoil from
+# its input file, then its polars are created
+def make_strakGraph(calls):
+    graph = job_graph.jobGraph()
+
+    for airfoilName in ('strak_1', 'strak_2'):
+        def optimize(name=airfoilName):
+            calls.append("xoptfoil %s" % name)
+            create_file(name + '.dat')
+
+        airfoilJob = graph.add_function("xoptfoil %s" % airfoilName, optimize,
+                         (), group=airfoilName,
+                         inputFiles=['iOpt_%s.txt' % airfoilName],
+                         outputFile=airfoilName + '.dat')
+        graph.add_function("polars %s" % airfoilName,
+                           lambda name=airfoilName: calls.append("polars %s" % name),
+                           (), [airfoilJob], airfoilName)
+
+    return graph
+
+
+def test_onlyChangedJobsRunAgain(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pool = worker_calls.workerPool(2)
+    calls = []
+    graph = make_strakGraph(calls)
+
+    # all jobs run without a record of changed files
+    states = graph.run(pool)
+    assert set(states.values()) == {'finished'}
+    assert len(calls) == 4
+
+    emitter = file_emitter.fileEmitter(2)
+    emitter.add('iOpt_strak_2.txt', "&optimization_options\n/\n")
+    emitter.emit()
+
+    del calls[:]
+    states = graph.run(pool, changedFiles=emitter.pop_writtenFiles())
+    assert sorted(calls) == ["polars strak_2", "xoptfoil strak_2"]
+    assert states["xoptfoil strak_1"] == 'upToDate'
+    assert states["polars strak_1"] == 'upToDate'
+    assert states["xoptfoil strak_2"] == 'finished'
+
+    # nothing was changed, but a missing airfoil is created again
+    (tmp_path / 'strak_1.dat').unlink()
+    del calls[:]
+    graph.run(pool, changedFiles=emitter.pop_writtenFiles())
+    assert sorted(calls) == ["polars strak_1", "xoptfoil strak_1"]
+
+
+def test_jobsStartAfterTheirDependencies():
+    recorder = jobRecorder()
+    graph = job_graph.jobGraph()
+    a = graph.add_function('a', recorder.run, ('a',))
+    b = graph.add_function('b', recorder.run, ('b',))
+    c = graph.add_function('c', recorder.run, ('c',), [a, b])
+    graph.add_function('d', recorder.run, ('d',), [c])
+
+    states = graph.run(worker_calls.workerPool(4))
+    assert states == {'a': 'finished', 'b': 'finished', 'c': 'finished',
+                      'd': 'finished'}
+
+    # independent jobs run at the same time
+    assert recorder.get_index('start', 'b') < recorder.get_index('end', 'a')
+    assert recorder.get_index('end', 'a') < recorder.get_index('start', 'c')
+    assert recorder.get_index('end', 'b') < recorder.get_index('start', 'c')
+    assert recorder.get_index('end', 'c') < recorder.get_index('start', 'd')
+
+
+def test_dependentsOfFailedJobAreSkipped():
+    recorder = jobRecorder()
+    pool = worker_calls.workerPool(2)
+    graph = job_graph.jobGraph()
+    a = graph.add_function('a', recorder.run, ('a', True), group='strak_1')
+    b = graph.add_function('b', recorder.run, ('b',), [a], 'strak_1')
+    graph.add_function('c', recorder.run, ('c',), [b], 'strak_1')
+    graph.add_function('d', recorder.run, ('d',), group='strak_2')
+
+    states = graph.run(pool)
+    assert states == {'a': 'failed', 'b': 'skipped', 'c': 'skipped',
+                      'd': 'finished'}
+    assert ('start', 'b') not in recorder.events
+
+    failures = pool.pop_failures()
+    assert list(failures) == ['strak_1']
+    assert "a failed" in failures['strak_1'][0]
+
+
+def test_failedCommandIsReported():
+    pool = worker_calls.workerPool(2)
+    graph = job_graph.jobGraph()
+    a = graph.add_command('a', 'exit 3', group='strak_1')
+    graph.add_command('b', 'exit 0', [a], 'strak_1')
+
+    assert graph.run(pool) == {'a': 'failed', 'b': 'skipped'}
+    assert "exit code 3" in pool.pop_failures()['strak_1'][0]
+
+
+def test_progressEvents():
+    recorder = jobRecorder()
+    graph = job_graph.jobGraph()
+    a = graph.add_function('a', recorder.run, ('a', True))
+    graph.add_function('b', recorder.run, ('b',), [a])
+    graph.add_function('c', recorder.run, ('c',))
+    events = []
+
+    graph.run(worker_calls.workerPool(1), events.append)
+
+    # each job either starts and ends, or is skipped
+    assert [(event.kind, event.job.name) for event in events] ==\
+           [('started', 'a'), ('started', 'c'), ('failed', 'a'),
+            ('skipped', 'b'), ('finished', 'c')]
+
+    progress = [event.get_progress() for event in events]
+    assert progress == pytest.approx([0.0, 0.0, 100.0/3, 200.0/3, 100.0])
+    assert all(event.numJobs == 3 for event in events)
+
+
+# a tool that writes a file with a fixed name into its working directory,
+# like Xoptfoil writes its run_control file. It fails if the file of another
+# call is already there.
+fakeToolScript = """
+import sys, time
+from os import makedirs, path
+name = sys.argv[1]
+if path.exists('run_control'):
+    sys.exit(1)
+open('run_control', 'w').write(name)
+seedfoil = open('seed.dat').read()
+time.sleep(0.5)
+open(name + '.dat', 'w').write(seedfoil + name)
+makedirs(name + '_polars', exist_ok=True)
+open(path.join(name + '_polars', 'polar.txt'), 'w').write(name)
+"""
+
+
+def test_commandsRunInTheirOwnWorkingDir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'fake_tool.py').write_text(fakeToolScript)
+    (tmp_path / 'seed.dat').write_text("seed ")
+    (tmp_path / 'strak_1_polars').mkdir()
+    (tmp_path / 'strak_1_polars' / 'other_polar.txt').write_text("other")
+
+    graph = job_graph.jobGraph()
+    for name in ('strak_1', 'strak_2'):
+        commandLine = '"%s" "%s" %s' % (sys.executable,
+                                        str(tmp_path / 'fake_tool.py'), name)
+        graph.add_command("tool %s" % name, commandLine, group=name,
+                          workingDir='job_%s' % name,
+                          copyFiles=[str(tmp_path / 'seed.dat')],
+                          resultFiles=[name + '.dat', name + '_polars'])
+
+    pool = worker_calls.workerPool(2)
+    start = time.time()
+    states = graph.run(pool)
+    assert pool.pop_failures() == {}
+    assert set(states.values()) == {'finished'}
+
+    # both calls ran at the same time
+    assert time.time() - start < 0.9
+
+    # the results were moved back, existing polars were kept, the working
+    # directories were removed
+    assert (tmp_path / 'strak_1.dat').read_text() == "seed strak_1"
+    assert (tmp_path / 'strak_2.dat').read_text() == "seed strak_2"
+    assert sorted(listdir(str(tmp_path / 'strak_1_polars'))) ==\
+           ['other_polar.txt', 'polar.txt']
+    assert (tmp_path / 'strak_2_polars' / 'polar.txt').read_text() == "strak_2"
+    assert sorted(listdir(str(tmp_path))) ==\
+           ['fake_tool.py', 'seed.dat', 'strak_1.dat', 'strak_1_polars',
+            'strak_2.dat', 'strak_2_polars']
+
+
+def test_workingDirIsRemovedIfCommandFails(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pool = worker_calls.workerPool(1)
+    graph = job_graph.jobGraph()
+    graph.add_command('a', 'exit 2', group='strak_1', workingDir='job_a',
+                      resultFiles=['strak_1.dat'])
+
+    assert graph.run(pool) == {'a': 'failed'}
+    assert "exit code 2" in pool.pop_failures()['strak_1'][0]
+    assert listdir(str(tmp_path)) == []
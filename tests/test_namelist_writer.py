@@ -0,0 +1,101 @@
+#  This file is part of "The Strak Machine".
+
+#  "The Strak Machine" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+
+#  "The Strak Machine" is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+#  You should have received a copy of the GNU General Public License
+#  along with "The Strak Machine".  If not, see <http://www.gnu.org/licenses/>.
+
+#  Copyright (C) 2020-2022 Matthias Boese
+
+# Round-trip tests of the namelist writer through f90nml.
+
+from copy import deepcopy
+from os import path
+
+import f90nml
+import pytest
+
+import namelist_writer
+import strak_machine
+from conftest import scriptsDir
+
+ressourcesDir = path.join(path.dirname(scriptsDir), 'ressources')
+templateFiles = ['iOpt.txt', 'iPolars_T1.txt', 'iPolars_T2.txt', 'iSmooth.txt']
+
+
+# returns the text f90nml writes for a namelist
+def get_f90nmlText(namelist, tmp_path):
+    fileName = str(tmp_path / 'f90nml.txt')
+    f90nml.write(namelist, fileName)
+    with open(fileName) as fileHandle:
+        return fileHandle.read()
+
+
+@pytest.mark.parametrize('templateFile', templateFiles)
+def test_templateRoundTrip(tmp_path, templateFile):
+    namelist = f90nml.read(path.join(ressourcesDir, templateFile))
+    text = namelist_writer.get_namelistFileText(namelist)
+
+    assert f90nml.reads(text) == namelist
+
+    # the templates are written in one pass, in the same format as f90nml
+    assert namelist_writer.get_namelistText(namelist) == text
+    assert text == get_f90nmlText(namelist, tmp_path)
+
+
+@pytest.mark.parametrize('templateFile', templateFiles)
+def test_checkRoundTrip(tmp_path, templateFile):
+    assert namelist_writer.check_roundTrip(path.join(ressourcesDir, templateFile),
+                                           str(tmp_path / templateFile))
+
+
+class inputFileParams:
+    xoptfoilTemplate = 'iOpt.txt'
+
+
+def test_inputFileWithoutOpPointNames(tmp_path, monkeypatch):
+    monkeypatch.setattr(strak_machine, 'get_PresetInputFileName',
+                        lambda fileName: path.join(ressourcesDir, fileName))
+    inputFile = strak_machine.inputFile(inputFileParams())
+    text = inputFile.get_FileText()
+
+    expected = deepcopy(inputFile.values)
+    expected["operating_conditions"].pop("name")
+    assert "name" in inputFile.values["operating_conditions"]
+    assert f90nml.reads(text) == expected
+    assert text == get_f90nmlText(expected, tmp_path)
+
+    # the op-points are read back unchanged
+    fileName = str(tmp_path / 'iOpt.txt')
+    with open(fileName, 'w') as fileHandle:
+        fileHandle.write(text)
+    inputFile.read_FromFile(fileName)
+    assert inputFile.get_FileText() == text
+
+
+def test_longListsAreWrapped(tmp_path):
+    namelist = f90nml.Namelist({'operating_conditions': f90nml.Namelist(
+                   {'op_point': [round(0.05 * idx, 2) for idx in range(60)],
+                    'op_mode': ['spec-cl'] * 60})})
+    text = namelist_writer.get_namelistFileText(namelist)
+
+    assert len(text.splitlines()) > 4
+    assert f90nml.reads(text) == namelist
+    assert text == get_f90nmlText(namelist, tmp_path)
+
+
+def test_unsupportedValuesAreWrittenByF90nml():
+    namelist = f90nml.reads("&matrix\n    values(1:2, 1:2) = 1, 2, 3, 4\n    name = 'a'\n/\n")
+    text = namelist_writer.get_namelistFileText(namelist, {'matrix': ('name',)})
+
+    expected = deepcopy(namelist)
+    expected['matrix'].pop('name')
+    assert f90nml.reads(text) == expected
@@ -0,0 +1,64 @@
+#  This file is part of "The Strak Machine".
+
+#  "The Strak Machine" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+
+#  "The Strak Machine" is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+#  You should have received a copy of the GNU General Public License
+#  along with "The Strak Machine".  If not, see <http://www.gnu.org/licenses/>.
+
+#  Copyright (C) 2020-2022 Matthias Boese
+
+import numpy as np
+
+import polar_cache
+import polar_file
+
+from test_polar_data import make_polar
+
+
+# writes a polar file that was calculated for 'airfoilName'
+def write_polar(fileName, airfoilName):
+    polar = make_polar()
+    polar.airfoilname = airfoilName
+    polar.write_ToFile(str(fileName))
+
+
+def test_fetchedPolarGetsNameOfAirfoil(tmp_path):
+    cache = polar_cache.polarCache(str(tmp_path / 'cache'), 1.0)
+    write_polar(tmp_path / 'other.txt', 'other-airfoil')
+    assert cache.store('key', str(tmp_path / 'other.txt'))
+
+    fileName = str(tmp_path / 'fetched.txt')
+    assert cache.fetch('key', fileName, 'my-airfoil')
+
+    (header, data) = polar_file.read_polarFile(fileName)
+    (otherHeader, otherData) = polar_file.read_polarFile(str(tmp_path / 'other.txt'))
+    assert header["airfoilname"] == 'my-airfoil'
+    np.testing.assert_array_equal(data, otherData)
+
+    # without a name the polar is copied unchanged
+    assert cache.fetch('key', fileName)
+    assert polar_file.read_polarFile(fileName)[0]["airfoilname"] == 'other-airfoil'
+
+
+def test_fetchOfUnknownKey(tmp_path):
+    cache = polar_cache.polarCache(str(tmp_path / 'cache'), 1.0)
+    assert not cache.fetch('key', str(tmp_path / 'fetched.txt'), 'my-airfoil')
+
+
+def test_clippedPolarGetsNameOfAirfoil(tmp_path):
+    write_polar(tmp_path / 'initial.txt', 'initial_root')
+    fileName = str(tmp_path / 'clipped.txt')
+    polar_file.write_clippedPolarFile(str(tmp_path / 'initial.txt'), fileName,
+                                      -2.0, 8.0, 'root')
+
+    (header, data) = polar_file.read_polarFile(fileName)
+    assert header["airfoilname"] == 'root'
+    assert (data[0, 0] == -2.0) and (data[-1, 0] == 8.0)
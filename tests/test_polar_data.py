@@ -0,0 +1,176 @@
+#  This file is part of "The Strak Machine".
+
+#  "The Strak Machine" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+
+#  "The Strak Machine" is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+#  You should have received a copy of the GNU General Public License
+#  along with "The Strak Machine".  If not, see <http://www.gnu.org/licenses/>.
+
+#  Copyright (C) 2020-2022 Matthias Boese
+
+# Regression tests for the polar lookups. import_polars used to resample every
+# polar to alpha_Resolution = 0.001 with set_alphaResolution() and searched
+# the dense polar. The polars now keep their original datapoints and
+# interpolate on demand, the results must be the same as before.
+
+import numpy as np
+import pytest
+
+import strak_machine
+from strak_machine import polarData, polarColumns, interpolate
+
+strak_machine.print_disabled = True
+
+# alpha resolution that import_polars used for resampling
+alpha_Resolution = 0.001
+
+
+# returns a polar with a stall, so CL is not monotonic
+def make_polar(alphaStep=0.25, CL_offset=0.0):
+    alpha = np.round(np.arange(-4.0, 14.0 + alphaStep/2, alphaStep), 10)
+    CL = 0.1 * alpha + 0.25 - 0.004 * np.maximum(alpha - 9.0, 0.0)**2 + CL_offset
+    CD = 0.008 + 0.0004 * (alpha - 1.5)**2
+    data = np.vstack((alpha, CL, CD, CL/CD, 0.6*CD, -0.05 + 0.001*alpha,
+                      0.6 - 0.03*alpha, 1.0 - 0.01*alpha))
+    polar = polarData()
+    polar.set_data(data)
+    polar.Re = 150000
+    polar.polarName = 'test_polar'
+    return polar
+
+
+# the former set_alphaResolution(), reduced to its resampling loop.
+# Returns the dense columns as a list of lists.
+def resample_likeBefore(polar, newResolution):
+    columns = [list(polar.data[idx]) for idx in range(len(polarColumns))]
+    alpha = columns[0]
+    actualResolution = round((alpha[1] - alpha[0]), 10)
+    num_increments = int(round(actualResolution / newResolution, 0))
+    increment = actualResolution / float(num_increments)
+
+    dense = [[] for column in columns]
+    for i in range(len(alpha) - 1):
+        for n in range(num_increments):
+            newAlpha = round((alpha[i] + n*increment), 10)
+            dense[0].append(newAlpha)
+            for (column, newColumn) in zip(columns[1:], dense[1:]):
+                newColumn.append(interpolate(alpha[i], alpha[i+1],
+                                             column[i], column[i+1], newAlpha))
+
+    for (column, newColumn) in zip(columns, dense):
+        newColumn.append(column[-1])
+    return dense
+
+
+# the former find_*_From_CL(), linear search of the first interval
+def find_likeBefore(x, y, value):
+    for idx in range(len(x) - 1):
+        if (x[idx] <= value) and (x[idx+1] >= value):
+            return interpolate(x[idx], x[idx+1], y[idx], y[idx+1], value)
+    return None
+
+
+@pytest.fixture(scope='module')
+def polar():
+    return make_polar()
+
+
+@pytest.fixture(scope='module')
+def densePolar(polar):
+    return resample_likeBefore(polar, alpha_Resolution)
+
+
+def test_valuesOfDenseGridAreInterpolatedOnDemand(polar, densePolar):
+    denseAlpha = np.array(densePolar[0])
+
+    for columnIdx in range(1, len(polarColumns)):
+        values = polar.interpolate_values(0, columnIdx, denseAlpha)
+        np.testing.assert_allclose(values, densePolar[columnIdx],
+                                   rtol=1e-12, atol=1e-12,
+                                   err_msg=polarColumns[columnIdx])
+
+
+@pytest.mark.parametrize('CL', [-0.1, 0.0, 0.05, 0.2, 0.5, 0.8, 1.1])
+def test_lookupsFromCL(polar, densePolar, CL):
+    (denseAlpha, denseCL, denseCD) = densePolar[0:3]
+
+    np.testing.assert_allclose(polar.find_CD_From_CL(CL),
+                               find_likeBefore(denseCL, denseCD, CL), rtol=1e-9)
+    np.testing.assert_allclose(polar.find_alpha_From_CL(CL),
+                               find_likeBefore(denseCL, denseAlpha, CL), rtol=1e-9)
+
+
+def test_arrayLookupsMatchSingleLookups(polar):
+    CL = np.array([-0.1, 0.2, 0.8, 5.0])
+    values = polar.find_CD_From_CL(CL)
+
+    for (value, single) in zip(values[:-1], CL[:-1]):
+        assert value == polar.find_CD_From_CL(single)
+    assert np.isnan(values[-1])
+    assert polar.find_CD_From_CL(5.0) == None
+
+
+@pytest.mark.parametrize('CL_merge', [0.05, 0.2, 0.37])
+def test_switchIdxOfMergedPolar(CL_merge):
+    polar_T1 = make_polar()
+    polar_T2 = make_polar(CL_offset=0.02)
+
+    for copy in (True, False):
+        merged = polar_T2.merge(polar_T1, CL_merge, 300000, copy)
+        CL = merged.CL
+        switchIdx = merged.T2_T1_switchIdx
+
+        # first datapoint with CL >= CL_merge, as set_alphaResolution did
+        # on the dense polar
+        assert CL[switchIdx] >= CL_merge
+        assert CL[switchIdx-1] < CL_merge
+
+        # the switching point of the dense polar lies in the interval that
+        # ends at the switching-idx. Both source polars may have a datapoint
+        # at the same alpha, so the interval can have zero width.
+        dense = resample_likeBefore(merged, alpha_Resolution)
+        denseIdx = next(idx for (idx, value) in enumerate(dense[1])
+                        if value >= CL_merge)
+        assert merged.alpha[switchIdx-1] <= dense[0][denseIdx] <= merged.alpha[switchIdx]
+
+        # restoring a merged polar from file gives the same idx
+        merged.restore_mergeData(CL_merge, 300000)
+        assert merged.T2_T1_switchIdx == switchIdx
+
+
+def test_mergeReleasesSources():
+    merged = make_polar(CL_offset=0.02).merge(make_polar(), 0.2, 300000)
+    assert merged.mergeSources == None
+
+
+@pytest.mark.parametrize('copy', [True, False])
+def test_remergeGivesSameResultAsMerge(copy):
+    polar_T1 = make_polar()
+    polar_T2 = make_polar(CL_offset=0.02)
+    merged = polar_T2.merge(polar_T1, 0.2, 300000, copy, keepSources=True)
+
+    for CL_merge in (0.37, 0.05, 0.2):
+        merged.remerge(CL_merge, copy)
+        expected = polar_T2.merge(polar_T1, CL_merge, 300000)
+
+        np.testing.assert_array_equal(merged.data, expected.data)
+        assert merged.CL_merge == CL_merge
+        assert merged.T2_T1_switchIdx == expected.T2_T1_switchIdx
+
+
+def test_reconstructKeepsSwitchIdx():
+    polar = make_polar(alphaStep=0.5)
+    polar.T2_T1_switchIdx = 10
+    switchAlpha = polar.alpha[10]
+
+    polar.reconstruct(0.1)
+    switchIdx = polar.T2_T1_switchIdx
+    assert polar.alpha[switchIdx] >= switchAlpha
+    assert polar.alpha[switchIdx-1] < switchAlpha
@@ -0,0 +1,105 @@
+#  This file is part of "The Strak Machine".
+
+#  "The Strak Machine" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+
+#  "The Strak Machine" is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+#  You should have received a copy of the GNU General Public License
+#  along with "The Strak Machine".  If not, see <http://www.gnu.org/licenses/>.
+
+#  Copyright (C) 2020-2022 Matthias Boese
+
+# Tests of the selection of the alpha regions that are calculated with the
+# fine alpha step.
+
+import numpy as np
+
+import polar_sampling
+
+fineStep = 0.1
+coarseStep = polar_sampling.get_coarseStep(fineStep)
+
+# CL of the edges of the laminar bucket
+CL_bucket = (0.1, 0.6)
+
+
+# synthetic coarse polar: linear lift up to CLmax at alpha = 10, stall
+# above. CD is constant inside the laminar bucket and rises outside, with a
+# kink at the edges of the bucket.
+def make_coarsePolar():
+    alpha = np.round(np.arange(-4.0, 14.0 + coarseStep/2, coarseStep), 3)
+    CL = np.where(alpha <= 10.0, 0.1 * alpha, 1.0 - 0.08 * (alpha - 10.0))
+    excess = (np.maximum(CL_bucket[0] - CL, 0.0) +
+              np.maximum(CL - CL_bucket[1], 0.0))
+    CD = 0.008 + 0.01 * excess + 0.02 * excess**2
+    return (alpha, CL, CD)
+
+
+# number of datapoints of the coarse polar and all fine regions together
+def get_numDatapoints(alpha, regions):
+    allAlpha = set(np.round(alpha, 3))
+    for (alphaStart, alphaEnd) in regions:
+        num = int(round((alphaEnd - alphaStart) / fineStep)) + 1
+        allAlpha.update(np.round(alphaStart + np.arange(num) * fineStep, 3))
+    return len(allAlpha)
+
+
+def is_covered(regions, value):
+    return any(start < value < end for (start, end) in regions)
+
+
+def test_regionsCoverCLmaxAndBucketEdges():
+    (alpha, CL, CD) = make_coarsePolar()
+    pointBudget = len(alpha) + 24
+    regions = polar_sampling.find_denseRegions(alpha, CL, CD, fineStep,
+                                               pointBudget)
+
+    # CLmax and the alpha-values of the bucket edges (CL = 0.1 * alpha)
+    assert is_covered(regions, 10.0)
+    assert is_covered(regions, CL_bucket[0] / 0.1)
+    assert is_covered(regions, CL_bucket[1] / 0.1)
+
+    assert get_numDatapoints(alpha, regions) <= pointBudget
+
+    # sorted and not overlapping
+    for (first, second) in zip(regions[:-1], regions[1:]):
+        assert first[1] < second[0]
+
+
+def test_pointBudgetIsKept():
+    (alpha, CL, CD) = make_coarsePolar()
+
+    for extraPoints in range(0, 30):
+        pointBudget = len(alpha) + extraPoints
+        regions = polar_sampling.find_denseRegions(alpha, CL, CD, fineStep,
+                                                   pointBudget)
+        assert get_numDatapoints(alpha, regions) <= pointBudget
+
+
+def test_smallerRegionFitsAfterLargerOne():
+    # the kink at alpha = 4 with the highest score lies in a gap of the
+    # coarse polar, e.g. where XFOIL did not converge, so its region does
+    # not fit into the budget, but the region of the kink at alpha = 6.5
+    alpha = np.array([0.0, 0.5, 1.0, 1.5, 2.0, 4.0, 6.0, 6.5, 7.0, 7.5])
+    CL = np.where(alpha <= 4.0, 0.1 * alpha, 0.4 - 0.1 * (alpha - 4.0))
+    CL[alpha >= 7.0] -= 0.02 * (alpha[alpha >= 7.0] - 6.5)
+    CD = np.full(len(alpha), 0.01)
+
+    pointBudget = len(alpha) + 8
+    regions = polar_sampling.find_denseRegions(alpha, CL, CD, fineStep,
+                                               pointBudget)
+
+    assert not is_covered(regions, 4.0)
+    assert is_covered(regions, 6.5)
+    assert get_numDatapoints(alpha, regions) <= pointBudget
+
+
+def test_mergeRegions():
+    assert polar_sampling.merge_regions([(3.0, 4.0), (0.0, 1.0), (0.5, 2.0),
+                                         (2.0, 2.5)]) == [(0.0, 2.5), (3.0, 4.0)]
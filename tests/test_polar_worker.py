@@ -0,0 +1,200 @@
+#  This file is part of "The Strak Machine".
+
+#  "The Strak Machine" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+
+#  "The Strak Machine" is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+#  You should have received a copy of the GNU General Public License
+#  along with "The Strak Machine".  If not, see <http://www.gnu.org/licenses/>.
+
+#  Copyright (C) 2020-2022 Matthias Boese
+
+import sys
+from os import listdir, path
+
+import numpy as np
+import pytest
+
+import polar_file
+import strak_machine
+from strak_machine import polar_worker, analyze_polars, bs, buildPath
+
+from conftest import scriptsDir
+from test_polar_data import make_polar
+
+strak_machine.print_disabled = True
+
+
+class workerParams:
+    NCrit = 9.0
+    xfoilWorkerCall = 'xfoil_worker'
+    xfoilWorkerJobCall = 'xfoil_worker'
+    alphaMin = -4.0
+    alphaMax = 14.0
+    CL_merge = 0.2
+    polarCacheSize = 1.0
+    maxParallelWorkers = 2
+    polarReconstruction = False
+    CL_min = -0.1
+    CL_preMaxSpeed = 0.2
+    maxLiftDistance = 0.1
+    adaptiveSampling = False
+    polarPointBudget = 100
+
+
+@pytest.fixture
+def worker(tmp_path, monkeypatch):
+    # the worker expects to be started in the build folder
+    monkeypatch.chdir(tmp_path)
+    params = workerParams()
+    params.polarCacheDir = str(tmp_path / 'cache')
+    return polar_worker(params)
+
+
+# writes the T1 / T2 polars of an airfoil where the worker expects them
+def write_sourcePolars(worker, airfoilName, Re_T1, Re_T2):
+    polarDir = '..' + bs + buildPath + bs + airfoilName + '_polars'
+    polar_T1 = make_polar()
+    polar_T2 = make_polar(CL_offset=0.02)
+    polar_T1.write_ToFile(polarDir + bs + worker.get_polarfileName_T1(Re_T1))
+    polar_T2.write_ToFile(polarDir + bs + worker.get_polarfileName_T2(Re_T2))
+
+
+def test_remergePolars(worker):
+    write_sourcePolars(worker, 'foil', 300000, 150000)
+
+    merged = [make_polar()]
+    merged[0].restore_mergeData(0.2, 300000)
+
+    # sources are imported with the first call and kept
+    worker.remerge_polars('foil', [300000], [150000], merged, 0.37)
+    sources = merged[0].mergeSources
+    assert sources != None
+    assert worker.CL_merge == 0.37
+
+    worker.remerge_polars('foil', [300000], [150000], merged, 0.05)
+    assert merged[0].mergeSources is sources
+
+    # same result as a merge of the imported files
+    (polar_T1, polar_T2) = sources
+    expected = polar_T2.merge(polar_T1, 0.05, 300000)
+    np.testing.assert_array_equal(merged[0].data, expected.data)
+    assert merged[0].T2_T1_switchIdx == expected.T2_T1_switchIdx
+
+    # the analysis follows the merged data
+    analyze_polars(merged + [expected], workerParams())
+    assert merged[0].CD_min == expected.CD_min
+    assert merged[0].CL_CD_maxGlide == expected.CL_CD_maxGlide
+
+
+
+def test_failedImportKeepsMergedPolars(worker):
+    write_sourcePolars(worker, 'foil', 300000, 150000)
+
+    merged = [make_polar(), make_polar()]
+    for polar in merged:
+        polar.restore_mergeData(0.2, 300000)
+
+    # there are no source polars for the second Re-number
+    with pytest.raises(Exception):
+        worker.import_mergeSources('foil', [300000, 400000], [150000, 200000],
+                                   merged)
+    assert [polar.mergeSources for polar in merged] == [None, None]
+
+
+def test_exportedPolarsAreImportedAgain(worker):
+    write_sourcePolars(worker, 'foil', 300000, 150000)
+
+    merged = [make_polar()]
+    merged[0].restore_mergeData(0.2, 300000)
+    worker.remerge_polars('foil', [300000], [150000], merged, 0.37)
+    analyze_polars(merged, workerParams())
+    worker.export_mergedPolars('foil', [300000], [150000], merged)
+
+    # a new start with the saved CL_merge imports the remerged polar
+    params = workerParams()
+    params.CL_merge = 0.37
+    params.polarCacheDir = worker.params.polarCacheDir
+    imported = polar_worker(params).import_polars('foil', [300000], [150000])
+    np.testing.assert_allclose(imported[0].data, merged[0].data, atol=1e-5)
+    assert imported[0].CL_merge == 0.37
+    assert imported[0].T2_T1_switchIdx == merged[0].T2_T1_switchIdx
+    assert imported[0].CL_CD_maxGlide == merged[0].CL_CD_maxGlide
+
+
+def test_concurrentWorkersHaveOwnDirectory(tmp_path, monkeypatch):
+    # the polar worker composes windows paths, use the native separator
+    monkeypatch.setattr(strak_machine, 'bs', path.sep)
+    monkeypatch.setattr(strak_machine, 'get_PresetInputFileName',
+        lambda fileName: path.join(path.dirname(scriptsDir), 'ressources', fileName))
+
+    buildDir = tmp_path / buildPath
+    buildDir.mkdir()
+    monkeypatch.chdir(buildDir)
+
+    params = workerParams()
+    params.polarCacheDir = str(tmp_path / 'cache')
+    params.xfoilWorkerJobCall = '"%s" "%s"' % (sys.executable,
+                          path.join(path.dirname(__file__), 'fake_xfoil_worker.py'))
+    worker = polar_worker(params)
+
+    airfoils = []
+    for airfoilName in ('foil_a', 'foil_b'):
+        (buildDir / (airfoilName + '.dat')).write_text(airfoilName + '\n')
+        airfoils.append((airfoilName, [300000, 400000], [150000, 200000]))
+
+    worker.generate_polarsParallel(airfoils)
+
+    assert worker.workerPool.pop_failures() == {}
+    for (airfoilName, ReList_T1, ReList_T2) in airfoils:
+        polarDir = buildDir / (airfoilName + '_polars')
+        for Re in ReList_T1:
+            assert (polarDir / worker.get_polarfileName_T1(Re)).exists()
+        for Re in ReList_T2:
+            assert (polarDir / worker.get_polarfileName_T2(Re)).exists()
+
+    # working directories of the workers are removed
+    assert sorted(listdir(buildDir)) == ['foil_a.dat', 'foil_a_polars',
+                                         'foil_b.dat', 'foil_b_polars']
+
+
+def test_missingSegmentIsCalculatedAgain(tmp_path, monkeypatch):
+    monkeypatch.setattr(strak_machine, 'bs', path.sep)
+    monkeypatch.setattr(strak_machine, 'get_PresetInputFileName',
+        lambda fileName: path.join(path.dirname(scriptsDir), 'ressources', fileName))
+
+    buildDir = tmp_path / buildPath
+    buildDir.mkdir()
+    monkeypatch.chdir(buildDir)
+    (buildDir / 'foil.dat').write_text('foil\n')
+
+    params = workerParams()
+    params.polarCacheDir = str(tmp_path / 'cache')
+    params.xfoilWorkerJobCall = '"%s" "%s"' % (sys.executable,
+                          path.join(path.dirname(__file__), 'fake_xfoil_worker.py'))
+    worker = polar_worker(params)
+    worker.generate_missingPolars('foil', 'T1', [300000])
+
+    fileName = (worker.get_polarDir('foil') + path.sep +
+                worker.get_polarfileName('T1', 300000))
+    assert polar_file.read_rangeFile(fileName)["alphaMin"] == -4.0
+
+    # extending the alpha range fails, only the covered range is recorded
+    worker.alphaMin_T1 = -6.0
+    monkeypatch.setenv('FAKE_WORKER_ALPHA_LIMIT', '-5.0')
+    worker.update_existingPolars('foil', 'T1', [300000])
+    assert worker.workerPool.pop_failures() != {}
+    assert polar_file.read_rangeFile(fileName)["alphaMin"] == pytest.approx(-4.0)
+
+    # so the missing segment is calculated with the next start
+    monkeypatch.delenv('FAKE_WORKER_ALPHA_LIMIT')
+    worker.update_existingPolars('foil', 'T1', [300000])
+    assert polar_file.read_rangeFile(fileName)["alphaMin"] == -6.0
+    (header, data) = polar_file.read_polarFile(fileName)
+    assert data[0,0] == pytest.approx(-6.0)
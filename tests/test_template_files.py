@@ -0,0 +1,40 @@
+#  This file is part of "The Strak Machine".
+
+#  "The Strak Machine" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+
+#  "The Strak Machine" is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+#  You should have received a copy of the GNU General Public License
+#  along with "The Strak Machine".  If not, see <http://www.gnu.org/licenses/>.
+
+#  Copyright (C) 2020-2022 Matthias Boese
+
+# Tests of the cache of parsed template files.
+
+from os import path
+from shutil import copyfile
+
+import strak_machine
+from conftest import scriptsDir
+
+ressourcesDir = path.join(path.dirname(scriptsDir), 'ressources')
+
+
+def test_changedNCritIsReadBack(tmp_path, monkeypatch):
+    monkeypatch.setattr(strak_machine, 'bs', path.sep)
+    monkeypatch.setattr(strak_machine, 'ressourcesPath', str(tmp_path))
+    fileName = strak_machine.T1_polarInputFile
+    copyfile(path.join(ressourcesDir, fileName), str(tmp_path / fileName))
+    fileNameAndPath = str(tmp_path) + path.sep + fileName
+
+    for NCrit in (7.0, 9.0):
+        strak_machine.strak_machineParams.change_NCritInNamelistFile(None,
+                                                       NCrit, fileName)
+        namelist = strak_machine.read_TemplateFile(fileNameAndPath)
+        assert namelist["xfoil_run_options"]["ncrit"] == NCrit